@@ -0,0 +1,143 @@
+# -*- coding=UTF-8 -*-
+"""Field sign translation before and after compiled translation.
+
+Each query translates its sign arrays and filter once per page request.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import pytest
+
+from cgtwq import compat, core, filter
+from cgtwq._compat_service import CompatService
+from cgtwq._field_sign import FieldSign
+from cgtwq._filter import Filter
+from cgtwq._json_codec import new_codec
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, List, Callable, Iterator
+
+
+def _before_transform_field(level, s):
+    # type: (int, Text) -> Text
+    if level == CompatService.LEVEL_5_2:
+        return {
+            "task.entity": "task.task_name",
+            "shot.entity": "shot.shot",
+            "eps.entity": "eps.eps_name",
+            "shot.link_eps": "shot.eps_name",
+            "asset.entity": "asset.asset_name",
+            "project.entity": "project.code",
+            "account.entity": "account.account",
+            "asset_type.entity": "asset.type_name",
+            "entity": "entity_name",
+        }.get(s, s)
+    return s
+
+
+def _before_transform_filter(level, v):
+    # type: (int, Filter) -> Filter
+    ret = Filter(_before_transform_field(level, v.left), v.op, v.right)
+    if v.chain_to:
+        ret = ret.chain(v.chain_logic, _before_transform_filter(level, v.chain_to))
+    return ret
+
+
+def _before_api_level():
+    # type: () -> int
+    versionText = core.CONFIG["API_VERSION"]
+    if "5.0" <= versionText < "6.0":
+        return compat.API_LEVEL_5_2
+    return compat.API_LEVEL_6_1
+
+
+def _before_adapt_filters(filter_list):
+    # type: (Any) -> filter.FilterList
+    ret = []  # type: List[Any]
+    for i in filter_list:
+        if isinstance(i, (str, type(""))):
+            ret.append(i)
+        else:
+            left, operator, right = i
+            if _before_api_level() == compat.API_LEVEL_5_2:
+                left = _before_transform_field(CompatService.LEVEL_5_2, left)
+            ret.append(filter.Filter(left, right, operator))
+    return filter.FilterList(ret)
+
+
+_FIELDS = ["shot.entity", "task.entity", "task.id", "task.pipeline", "entity"]
+_FILTER_LENGTH = 200
+_PAGE_COUNT = 20
+
+
+def _filter():
+    # type: () -> Filter
+    f = FieldSign("shot.entity").equal("sc0000")
+    for i in range(1, _FILTER_LENGTH):
+        f = f.or_(FieldSign("shot.entity").equal("sc%04d" % i))
+    return f
+
+
+@pytest.mark.parametrize("level", [CompatService.LEVEL_5_2, CompatService.LEVEL_7_0])
+def bench_query_before(level, measure):
+    # type: (int, Callable[..., Any]) -> None
+    codec = new_codec("json")
+    f = _filter()
+
+    def _query():
+        return [
+            codec.encode(
+                {
+                    "sign_array": [_before_transform_field(level, i) for i in _FIELDS],
+                    "sign_filter_array": _before_transform_filter(level, f),
+                }
+            )
+            for _ in range(_PAGE_COUNT)
+        ]
+
+    assert len(measure(_query)) == _PAGE_COUNT
+
+
+@pytest.mark.parametrize("level", [CompatService.LEVEL_5_2, CompatService.LEVEL_7_0])
+def bench_query_after(level, measure):
+    # type: (int, Callable[..., Any]) -> None
+    codec = new_codec("json")
+    f = _filter()
+
+    def _query():
+        compat_service = CompatService(level)
+        return [
+            codec.encode(
+                {
+                    "sign_array": compat_service.transform_fields(_FIELDS),
+                    "sign_filter_array": compat_service.filter_payload(f),
+                }
+            )
+            for _ in range(_PAGE_COUNT)
+        ]
+
+    assert len(measure(_query)) == _PAGE_COUNT
+
+
+@pytest.fixture
+def legacy_5_2():
+    # type: () -> Iterator[filter.FilterList]
+    """Legacy filters with api version 5.2."""
+
+    api_version = core.CONFIG["API_VERSION"]
+    core.CONFIG["API_VERSION"] = "5.2"
+    yield filter.FilterList(
+        [filter.Field("shot.entity") == "sc%04d" % i for i in range(_FILTER_LENGTH)]
+    )
+    core.CONFIG["API_VERSION"] = api_version
+
+
+def bench_adapt_filters_before(legacy_5_2, measure):
+    # type: (filter.FilterList, Callable[..., Any]) -> None
+    assert len(measure(_before_adapt_filters, legacy_5_2)) == _FILTER_LENGTH
+
+
+def bench_adapt_filters_after(legacy_5_2, measure):
+    # type: (filter.FilterList, Callable[..., Any]) -> None
+    assert len(measure(compat.adapt_filters, legacy_5_2)) == _FILTER_LENGTH
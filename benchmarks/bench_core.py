@@ -0,0 +1,96 @@
+# -*- coding=UTF-8 -*-
+"""In-memory hot paths."""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+
+import pytest
+
+from cgtwq._compat_service import CompatService
+from cgtwq._field_sign import FieldSign
+from cgtwq._filter import Filter
+from cgtwq._flow_service_impl import _copy_to_dir  # type: ignore
+from cgtwq._row_id import RowID
+from cgtwq.filter import Field, FilterList
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable
+
+
+@pytest.mark.parametrize("length", [100, 1000, 10000])
+def bench_filter_chain(length, measure):
+    # type: (int, Callable[..., Any]) -> None
+    def _build():
+        f = FieldSign("task.id").equal("0")
+        for i in range(1, length):
+            f = f.or_(FieldSign("task.id").equal("%d" % i))
+        return f.as_payload()
+
+    assert len(measure(_build)) == length * 2 - 1
+
+
+@pytest.mark.parametrize("length", [1000, 10000])
+def bench_filter_any_of(length, measure):
+    # type: (int, Callable[..., Any]) -> None
+    def _build():
+        return Filter.any_of(
+            FieldSign("task.id").equal("%d" % i) for i in range(length)
+        ).as_payload()
+
+    assert len(measure(_build)) == length * 2 - 1
+
+
+@pytest.mark.parametrize("length", [1000, 10000])
+def bench_filter_list_any_of(length, measure):
+    # type: (int, Callable[..., Any]) -> None
+    def _build():
+        return FilterList.from_arbitrary_args(
+            FilterList.any_of(Field("task.id") == "%d" % i for i in range(length)),
+            Field("task.status") == "Wait",
+        )
+
+    assert len(measure(_build)) == length * 2 + 1
+
+
+@pytest.mark.parametrize("level", [CompatService.LEVEL_5_2, CompatService.LEVEL_7_0])
+def bench_filter_translation(level, measure):
+    # type: (int, Callable[..., Any]) -> None
+    f = FieldSign("shot.entity").equal("sc0000")
+    for i in range(1, 200):
+        f = f.or_(FieldSign("shot.entity").equal("sc%04d" % i))
+    compat = CompatService(level)
+
+    def _translate():
+        # same filter for each page request.
+        return [compat.filter_payload(f) for _ in range(20)]
+
+    assert len(measure(_translate)[-1]) == 399
+
+
+def bench_row_id_hash(measure):
+    # type: (Callable[..., Any]) -> None
+    ids = [RowID("proj_bench", "shot", "task", "%08d" % i) for i in range(100000)]
+
+    def _hash():
+        return len(set(ids))
+
+    assert measure(_hash) == len(ids)
+
+
+def bench_flow_submit_copy(tmpdir, measure):
+    # type: (Any, Callable[..., Any]) -> None
+    src = tmpdir.mkdir("src")
+    content = os.urandom(1 << 20)
+    filenames = []
+    for i in range(20):
+        f = src.join("frame.%04d.exr" % (i,))
+        f.write_binary(content)
+        filenames.append(str(f))
+    dst = str(tmpdir.join("submit"))
+
+    def _copy():
+        return list(_copy_to_dir(filenames, dst))
+
+    assert len(measure(_copy)) == len(filenames)
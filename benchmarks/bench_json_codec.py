@@ -0,0 +1,102 @@
+# -*- coding=UTF-8 -*-
+"""Json codecs on request payloads and response bodies."""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import uuid
+from collections import OrderedDict
+
+import pytest
+
+from cgtwq._field_sign import FieldSign
+from cgtwq._json_codec import CODECS, new_codec
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, List, Tuple, Callable
+
+
+def _payloads(id_count):
+    # type: (int) -> List[Tuple[Text, Any]]
+    ids = [str(uuid.uuid4()) for _ in range(id_count)]
+    return [
+        (
+            "set",
+            {
+                "app": "api",
+                "controller": "shot",
+                "method": "set",
+                "db": "proj_bench",
+                "module": "shot",
+                "module_type": "info",
+                "id_array": ids,
+                "sign_data_array": OrderedDict(
+                    (("shot.entity", "镜头"), ("shot.frame", 24))
+                ),
+                "exec_event_filter": True,
+            },
+        ),
+        (
+            "get_filter",
+            {
+                "app": "api",
+                "controller": "task",
+                "method": "get_filter",
+                "db": "proj_bench",
+                "module": "shot",
+                "module_type": "task",
+                "sign_array": ["task.id", "shot.entity", "task.artist"],
+                "sign_filter_array": FieldSign("task.id")
+                .in_(ids)
+                .and_(FieldSign("task.pipeline").equal("合成")),
+                "order_sign_array": ["task.id"],
+                "limit": "5000",
+                "start_num": "0",
+            },
+        ),
+    ]
+
+
+def _response(id_count):
+    # type: (int) -> bytes
+    rows = [
+        {
+            "task.id": str(uuid.uuid4()),
+            "shot.entity": "sc%04d" % i,
+            "task.artist": "艺术家",
+        }
+        for i in range(id_count)
+    ]
+    return (
+        new_codec("json")
+        .encode({"code": "1", "type": "json", "data": rows})
+        .encode("utf-8")
+    )
+
+
+_ID_COUNT = 10000
+
+
+def _codec(name):
+    # type: (Text) -> Any
+    try:
+        return new_codec(name)
+    except ImportError:
+        pytest.skip("%s not installed" % (name,))
+
+
+@pytest.mark.parametrize("payload", ["set", "get_filter"])
+@pytest.mark.parametrize("name", list(CODECS))
+def bench_encode(name, payload, measure):
+    # type: (Text, Text, Callable[..., Any]) -> None
+    codec = _codec(name)
+    data = dict(_payloads(_ID_COUNT))[payload]
+    assert measure(codec.encode, data)
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def bench_decode(name, measure):
+    # type: (Text, Callable[..., Any]) -> None
+    codec = _codec(name)
+    body = _response(_ID_COUNT)
+    assert len(measure(codec.decode, body)["data"]) == _ID_COUNT
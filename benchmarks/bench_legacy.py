@@ -0,0 +1,88 @@
+# -*- coding=UTF-8 -*-
+"""Legacy api hot paths."""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import json
+
+import cgtwq
+from cgtwq.message import Message
+from cgtwq.model import HistoryInfo
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable
+
+    from cgtwq._stand_in_server import StandInServer
+
+
+def _selection():
+    # type: () -> cgtwq.Selection
+    module = cgtwq.Database("proj_bench").module("shot")
+    ids = module.filter(cgtwq.Field("id").has("%"))
+    return module.select(*ids)
+
+
+def bench_selection_get_fields(legacy_server, measure):
+    # type: (StandInServer, Callable[..., Any]) -> None
+    selection = _selection()
+    result = measure(selection.get_fields, "id", "entity", "status")
+    assert len(result) == len(selection)
+
+
+def bench_result_set_column(legacy_server, measure):
+    # type: (StandInServer, Callable[..., Any]) -> None
+    result = _selection().get_fields("id", "entity", "status")
+    assert len(measure(result.column, "status")) == 5
+
+
+_MESSAGES = (
+    [
+        json.dumps(
+            [
+                {"type": "text", "content": "镜头 %d 需要修改" % i, "style": ""},
+                {
+                    "type": "image",
+                    "max": "max/%d.jpg" % i,
+                    "min": "min/%d.jpg" % i,
+                    "att_id": "%d" % i,
+                },
+            ]
+        )
+        for i in range(2000)
+    ]
+    + [json.dumps({"data": "message %d" % i, "image": []}) for i in range(2000)]
+    + ["plain text %d" % i for i in range(2000)]
+)
+
+
+def bench_message_load(measure):
+    # type: (Callable[..., Any]) -> None
+    def _load():
+        return [Message.load(i) for i in _MESSAGES]
+
+    assert len(measure(_load)) == len(_MESSAGES)
+
+
+_HISTORY_ROWS = [
+    [
+        "%d" % i,
+        "task-%d" % (i // 10),
+        "account-%d" % (i % 30),
+        "Compositing",
+        "Check",
+        "",
+        _MESSAGES[i % len(_MESSAGES)],
+        "artist%02d" % (i % 30),
+        "2021-12-15 10:%02d:%02d" % (i // 60 % 60, i % 60),
+    ]
+    for i in range(10000)
+]
+
+
+def bench_history_info(measure):
+    # type: (Callable[..., Any]) -> None
+    def _build():
+        return [HistoryInfo(*i) for i in _HISTORY_ROWS]
+
+    assert len(measure(_build)) == len(_HISTORY_ROWS)
@@ -0,0 +1,64 @@
+# -*- coding=UTF-8 -*-
+"""`ORMTableView` scans and `ClientImpl.set` against the stand-in server."""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import pytest
+
+from cgtwq._client_impl import ClientImpl
+from cgtwq._row_id import RowID
+
+from conftest import new_server
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterator, Tuple
+
+    from cgtwq._stand_in_server import StandInServer
+
+
+@pytest.fixture(scope="module", params=[1000, 10000, 100000], ids=lambda i: "%d" % i)
+def scan_client(request):
+    # type: (Any) -> Iterator[Tuple[ClientImpl, int]]
+    url = "http://scan-%d.stand-in" % (request.param,)
+    new_server(url, request.param)
+    client = ClientImpl(url, "7.0")
+    client._http.response_cache = None  # type: ignore
+    yield client, request.param
+
+
+def bench_scan(scan_client, measure):
+    # type: (Tuple[ClientImpl, int], Callable[..., Any]) -> None
+    client, row_count = scan_client
+
+    def _scan():
+        view = client.table("proj_bench", "shot", "task")
+        return list(view.rows("task.id", "task.entity", "task.status"))
+
+    assert len(measure(_scan)) == row_count
+
+
+def bench_scan_columns(scan_client, measure):
+    # type: (Tuple[ClientImpl, int], Callable[..., Any]) -> None
+    client, row_count = scan_client
+
+    def _scan():
+        view = client.table("proj_bench", "shot", "task")
+        return view.columns("task.id", "task.status", dictionary=["task.status"])
+
+    assert len(measure(_scan)["task.id"]) == row_count
+
+
+@pytest.mark.parametrize("id_count", [1000, 10000])
+def bench_set(id_count, measure):
+    # type: (int, Callable[..., Any]) -> None
+    url = "http://set-%d.stand-in" % (id_count,)
+    server = new_server(url, id_count)  # type: StandInServer
+    client = ClientImpl(url, "7.0")
+    ids = [
+        RowID("proj_bench", "shot", "task", i)
+        for i in client.table("proj_bench", "shot", "task").column("task.id")
+    ]
+    count = server.request_count
+    measure(client.set, ids, {"task.status": "Approve"})
+    assert server.request_count > count
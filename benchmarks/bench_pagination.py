@@ -0,0 +1,60 @@
+# -*- coding=UTF-8 -*-
+"""Offset and keyset pagination of `ORMTableView` against the stand-in server.
+
+Stand-in server is backed by sqlite, so `start_num` costs the same
+row skipping it does on the real database.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import uuid
+
+import pytest
+
+from cgtwq._client_impl import ClientImpl
+
+from conftest import new_server
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict
+
+
+@pytest.mark.parametrize("keyset", [False, True], ids=["offset", "keyset"])
+@pytest.mark.parametrize(
+    "insert_per_page", [0, 10], ids=lambda i: "insert_per_page=%d" % i
+)
+def bench_pagination(keyset, insert_per_page, measure, request):
+    # type: (bool, int, Callable[..., Any], Any) -> None
+    url = "http://pagination-%s-%d.stand-in" % (keyset, insert_per_page)
+    server = new_server(url, 100000)
+    call = server.call
+
+    def _call(data):
+        # type: (Dict[str, Any]) -> Any
+        # simulate other users editing while we scan.
+        if data.get("method") == "get_filter" and insert_per_page:
+            server.add_rows(
+                "proj_bench",
+                "shot",
+                "task",
+                (
+                    [str(uuid.uuid4()), "entity", "Layout", "artist00", "Wait"]
+                    for _ in range(insert_per_page)
+                ),
+            )
+        return call(data)
+
+    server.call = _call
+    client = ClientImpl(url, "7.0")
+    client._http.response_cache = None  # type: ignore
+
+    def _scan():
+        view = client.table("proj_bench", "shot", "task", keyset=keyset)
+        return list(view.column("task.id"))
+
+    ids = measure(_scan)
+    duplicated = len(ids) - len(set(ids))
+    request.node.user_properties.append(("duplicated", duplicated))
+    if keyset:
+        assert duplicated == 0
@@ -0,0 +1,90 @@
+# -*- coding=UTF-8 -*-
+"""Benchmark config.
+
+Run with pytest-benchmark, e.g. ``python -m pytest benchmarks --benchmark-autosave``,
+saved runs keep peak memory in ``extra_info`` for comparing releases.
+Without pytest-benchmark each benchmark runs once and prints its cost.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import sys
+import time
+import tracemalloc
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("CGTEAMWORK_COMPAT_CACHE_PATH", "")
+
+from cgtwq import core
+from cgtwq._stand_in_server import StandInServer
+from cgtwq._transport_impl import set_transport
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterator
+
+
+def _peak_memory(fn, *args, **kwargs):
+    # type: (Callable[..., Any], *Any, **Any) -> int
+    tracemalloc.start()
+    try:
+        fn(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture
+def measure(request):
+    # type: (Any) -> Callable[..., Any]
+    """Time function and record peak memory of it."""
+
+    try:
+        benchmark = request.getfixturevalue("benchmark")
+    except pytest.FixtureLookupError:
+        benchmark = None
+
+    def _measure(fn, *args, **kwargs):
+        # type: (Callable[..., Any], *Any, **Any) -> Any
+        peak = _peak_memory(fn, *args, **kwargs)
+        if benchmark is not None:
+            benchmark.extra_info["peak_memory"] = peak
+            return benchmark(fn, *args, **kwargs)
+        started_at = time.perf_counter()
+        ret = fn(*args, **kwargs)
+        cost = time.perf_counter() - started_at
+        request.node.user_properties.append(("time", cost))
+        request.node.user_properties.append(("peak_memory", peak))
+        print(
+            "%s: time=%.4fs peak_memory=%dKiB" % (request.node.name, cost, peak >> 10)
+        )
+        return ret
+
+    return _measure
+
+
+def new_server(url, row_count, **kwargs):
+    # type: (str, int, *Any) -> StandInServer
+    """Stand-in server with `proj_bench.shot` task table, served in process at `url`."""
+
+    server = StandInServer(**kwargs)
+    server.add_synthetic_table("proj_bench", "shot", "task", row_count)
+    set_transport(url, server.transport())
+    return server
+
+
+@pytest.fixture
+def legacy_server():
+    # type: () -> Iterator[StandInServer]
+    """Stand-in server for legacy api at `core.CONFIG["URL"]`."""
+
+    url = "http://legacy.stand-in"
+    config = dict(core.CONFIG)
+    core.CONFIG["URL"] = url
+    core.CONFIG["API_VERSION"] = "6.1"
+    core.CONFIG["DEFAULT_TOKEN"] = "bench"
+    yield new_server(url, 10000, server_header="nginx/1.15.9")
+    core.CONFIG.update(config)
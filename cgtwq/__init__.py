@@ -10,6 +10,21 @@ from ._field_sign import FieldSign as F, FieldSign
 from ._user_token import UserToken
 from ._message import Message as MessageV2
 from ._image import Image
+from ._sqlite_mirror import SQLiteMirror
+from ._filter_eval import compile_filter, filter_columns
+from ._transport_impl import SessionTransport, set_transport, set_transport_factory
+from ._rate_limiter import DEFAULT_RATE_LIMITER, RateLimiter
+from ._response_cache import DEFAULT_RESPONSE_CACHE, ResponseCache
+from ._singleflight import DEFAULT_SINGLEFLIGHT, SingleFlight
+from ._recording_transport import Recording, RecordingTransport, ReplayTransport
+from ._stand_in_server import StandInServer
+from ._instrumentation import (
+    CallRecord,
+    HistogramSink,
+    SlowCallSink,
+    add_sink,
+    remove_sink,
+)
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
@@ -30,6 +45,27 @@ if TYPE_CHECKING:
         "UserToken",
         "MessageV2",
         "Image",
+        "SQLiteMirror",
+        "compile_filter",
+        "filter_columns",
+        "SessionTransport",
+        "set_transport",
+        "set_transport_factory",
+        "RateLimiter",
+        "DEFAULT_RATE_LIMITER",
+        "CallRecord",
+        "HistogramSink",
+        "SlowCallSink",
+        "add_sink",
+        "remove_sink",
+        "ResponseCache",
+        "DEFAULT_RESPONSE_CACHE",
+        "SingleFlight",
+        "DEFAULT_SINGLEFLIGHT",
+        "Recording",
+        "RecordingTransport",
+        "ReplayTransport",
+        "StandInServer",
         # legacy export,
         "server",
         "get_account",
@@ -2,9 +2,9 @@
 # pyright: strict
 
 from __future__ import annotations
-from typing import Protocol, Any, Sequence
+from typing import Protocol, Any, Sequence, Mapping, ContextManager
 from ._filter import Filter
-from ._table_view import TableView
+from ._table_view import CountableTableView
 from ._pipeline_service import PipelineService
 from ._flow_service import FlowService
 from ._user_token import UserToken
@@ -18,7 +18,9 @@ class Client(Protocol):
     file_box: FileBoxService
     image: ImageService
 
-    def __init__(self, http_url: str = ..., version: str = ...) -> None: ...
+    def __init__(
+        self, http_url: str = ..., version: str = ..., lazy: bool | None = ...
+    ) -> None: ...
     @property
     def http_url(self) -> str: ...
     @property
@@ -33,10 +35,22 @@ class Client(Protocol):
         /,
         *,
         filter_by: Filter = ...,
-    ) -> TableView: ...
+        prefetch: int = ...,
+        keyset: bool = ...,
+        adaptive_page_size: bool = ...,
+        stream: bool = ...,
+        max_in_size: int = ...,
+    ) -> CountableTableView: ...
     def set(
         self,
         id: Sequence[RowID],
         data: dict[str, Any],
         /,
     ) -> None: ...
+    def set_many(
+        self,
+        data: Mapping[RowID, dict[str, Any]],
+        /,
+    ) -> list[tuple[list[RowID], Exception]]: ...
+    def batch(self) -> ContextManager[None]: ...
+    def flush(self) -> None: ...
@@ -5,47 +5,111 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from typing import Text, Any, Sequence
-    from ._table_view import TableView
+    from typing import (
+        Text,
+        Any,
+        Sequence,
+        Iterator,
+        Iterable,
+        Mapping,
+        Dict,
+        List,
+        Tuple,
+        Optional,
+        Union,
+        Callable,
+    )
+    from ._table_view import CountableTableView
     from ._client import Client
 
+    # database, module, module_type
+    _Group = Tuple[Text, Text, Text]
+
+import contextlib
+import json
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from ._compat_service import CompatService
 from ._filter import NULL_FILTER, Filter
 from ._flow_service_impl import new_flow_service
 from ._row_id import RowID
-from ._http_client import HTTPClient
+from ._http_client import HTTPClient, JSONEncoder
 from ._user_token import UserToken
 from ._orm_table_view import ORMTableView
 from ._pipeline_service_impl import new_pipeline_service
 from ._file_box_service_impl import new_file_box_service
 from ._image_service_impl import new_image_service
-from ._util import iteritems
+from ._lazy import Lazy
+from ._util import iteritems, parse_yes_no
 
 
 class ClientImpl(object):
     default_http_url = os.getenv("CGTEAMWORK_URL", "http://192.168.55.11")
     default_version = os.getenv("CGTEAMWORK_VERSION", "")
+    batch_max_workers = 8
+    default_lazy = parse_yes_no(os.getenv("CGTEAMWORK_LAZY_CLIENT") or "no")
 
-    def __init__(self, http_url="", version=""):
-        # type: (Text, Text) -> None
+    def __init__(self, http_url="", version="", lazy=None):
+        # type: (Union[Text, Lazy], Text, Optional[bool]) -> None
+        """
+        Args:
+            http_url (Union[Text, Lazy], optional): Server url,
+                defaults to `CGTEAMWORK_URL`.
+            version (Text, optional): Server version,
+                detected from server when not given.
+            lazy (Optional[bool], optional): Detect server version on first use
+                instead of in constructor, defaults to `CGTEAMWORK_LAZY_CLIENT`.
+        """
+        if lazy is None:
+            lazy = self.default_lazy
         http = HTTPClient(http_url or self.default_http_url)
-        compat = CompatService(
-            CompatService.level_from_version(version or self.default_version)
-            or CompatService.level_from_http(http),
-        )
+        self._http = http
+        level = self._probe(lambda: self._detect_level(version))
+        self._level = level
+        compat = CompatService(level)
         pipeline = new_pipeline_service(http, compat)
         flow = new_flow_service(http, compat)
         file_box = new_file_box_service(http, compat)
         image = new_image_service(http, compat)
 
-        self._http = http
         self._compat = compat
         self.file_box = file_box
         self.pipeline = pipeline
         self.flow = flow
         self.image = image
+        # batch only queues writes of the thread that entered it.
+        self._batch_local = threading.local()
+        if not lazy:
+            level.get()
+
+    def _detect_level(self, version):
+        # type: (Text) -> int
+        ret = CompatService.level_from_version(
+            version or self.default_version
+        ) or CompatService.level_from_http(self._http)
+        self._http.compat_level = ret
+        return ret
+
+    def _probes(self):
+        # type: () -> Iterable[Lazy]
+        return (self._level,)
+
+    def _probe(self, fn):
+        # type: (Callable[[], Any]) -> Lazy
+        """Lazy value that starts all `_probes` when used,
+        so independent probes run concurrently.
+        """
+
+        def _run():
+            # type: () -> Any
+            for i in self._probes():
+                i.start()
+            return fn()
+
+        return Lazy(_run)
 
     @property
     def http_url(self):
@@ -60,8 +124,19 @@ class ClientImpl(object):
         # type: (UserToken) -> None
         self._http.token = v
 
-    def table(self, database, module, module_type, filter_by=NULL_FILTER):
-        # type: (Text, Text, Text, Filter) -> TableView
+    def table(
+        self,
+        database,
+        module,
+        module_type,
+        filter_by=NULL_FILTER,
+        prefetch=0,
+        keyset=False,
+        adaptive_page_size=False,
+        stream=False,
+        max_in_size=0,
+    ):
+        # type: (Text, Text, Text, Filter, int, bool, bool, bool, int) -> CountableTableView
         return ORMTableView(
             self._http,
             self._compat,
@@ -69,6 +144,11 @@ class ClientImpl(object):
             module,
             module_type,
             filter_by,
+            prefetch,
+            keyset,
+            adaptive_page_size,
+            stream,
+            max_in_size,
         )
 
     def set(self, id, data):
@@ -78,49 +158,172 @@ class ClientImpl(object):
             return
         data = {self._compat.transform_field(k): v for k, v in data.items()}
 
-        if self._compat.level < self._compat.LEVEL_7_0:
-            return self._set_v5_2(id, data)
-        return self._set_v7_0(id, data)
-
-    def _set_v5_2(self, id, data):
-        # type: (Sequence[RowID], dict[str, Any]) -> None
+        batch = self._batch_state()
+        if batch.depth:
+            for i in id:
+                batch.pending.setdefault(i, {}).update(data)
+            return
 
         groups = {}  # type: dict[tuple[Text, Text,Text], list[Text]]
         for i in id:
             groups.setdefault((i.database, i.module, i.module_type), []).append(i.value)
 
         for key, id_list in iteritems(groups):
-            database, module, module_type = key
-            self._http.call(
-                "c_orm",
-                "set_in_id",
-                db=database,
-                module=module,
-                module_type=module_type,
-                id_array=id_list,
-                sign_data_array=data,
-            ).json()
-
-    def _set_v7_0(self, id, data):
-        # type: (Sequence[RowID], dict[str, Any]) -> None
-        groups = {}  # type: dict[tuple[Text, Text,Text], list[Text]]
-        for i in id:
-            groups.setdefault((i.database, i.module, i.module_type), []).append(i.value)
+            self._set_group(key, id_list, data)
 
-        for key, id_list in iteritems(groups):
-            database, module, module_type = key
-            self._http.call(
-                module_type,
-                "set",
-                db=database,
-                module=module,
-                module_type=module_type,
-                id_array=id_list,
-                sign_data_array=data,
-                exec_event_filter=True,
-            ).json()
-
-
-def new_client(http_url="", version=""):
-    # type: (Text, Text) -> Client
-    return ClientImpl(http_url, version)
+    def set_many(self, data):
+        # type: (Mapping[RowID, Dict[Text, Any]]) -> List[Tuple[List[RowID], Exception]]
+        """Set different data for each row.
+
+        Rows with same data are set in one call, calls are sent concurrently,
+        limited by `batch_max_workers`. Rows are queued when in `batch`.
+
+        Args:
+            data (Mapping[RowID, Dict[Text, Any]]): Data by row.
+
+        Returns:
+            List[Tuple[List[RowID], Exception]]: Failed rows with the error,
+                other rows are still set.
+        """
+
+        items = [
+            (k, {self._compat.transform_field(i): j for i, j in iteritems(v)})
+            for k, v in iteritems(data)
+            if v
+        ]
+        batch = self._batch_state()
+        if batch.depth:
+            for k, v in items:
+                batch.pending.setdefault(k, {}).update(v)
+            return []
+        return [
+            ([RowID(database, module, module_type, i) for i in id_list], err)
+            for (database, module, module_type), id_list, err in self._set_groups(items)
+        ]
+
+    def _batch_state(self):
+        # type: () -> Any
+        """Batch depth and pending data of current thread."""
+
+        ret = self._batch_local
+        if not hasattr(ret, "depth"):
+            ret.depth = 0
+            ret.pending = OrderedDict()
+        return ret
+
+    @contextlib.contextmanager
+    def batch(self):
+        # type: () -> Iterator[None]
+        """Queue `set` calls of current thread in context,
+        then send them by `flush`.
+
+        Later value wins when a field of same row is set more than once,
+        queued data is discarded when context exit with error.
+        Nested batch is flushed by the outermost one.
+        Other threads are not affected, their `set` calls are sent at once.
+        """
+
+        batch = self._batch_state()
+        batch.depth += 1
+        is_ok = False
+        try:
+            yield
+            is_ok = True
+        finally:
+            batch.depth -= 1
+            is_outermost = not batch.depth
+            if is_outermost and not is_ok:
+                batch.pending.clear()
+        if is_outermost:
+            self.flush()
+
+    def flush(self):
+        # type: () -> None
+        """Send queued `set` calls of current thread.
+
+        Rows with identical data are merged into one call,
+        calls are sent concurrently, limited by `batch_max_workers`.
+
+        Raises:
+            Exception: First error of calls, raised after all calls finished.
+        """
+
+        batch = self._batch_state()
+        pending = batch.pending
+        batch.pending = OrderedDict()
+        for _, _, err in self._set_groups(iteritems(pending)):
+            raise err
+
+    def _set_groups(self, items):
+        # type: (Iterable[Tuple[RowID, Dict[Text, Any]]]) -> List[Tuple[_Group, List[Text], Exception]]
+        """Set data of each row, rows with same data are set in one call.
+
+        Returns:
+            List[Tuple[_Group, List[Text], Exception]]: Failed calls.
+        """
+
+        groups = (
+            OrderedDict()
+        )  # type: OrderedDict[Tuple[_Group, Text], Tuple[List[Text], Dict[Text, Any]]]
+        for i, data in items:
+            key = ((i.database, i.module, i.module_type), _freeze(data))
+            groups.setdefault(key, ([], data))[0].append(i.value)
+
+        ret = []  # type: List[Tuple[_Group, List[Text], Exception]]
+        if not groups:
+            return ret
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.batch_max_workers, len(groups)))
+        ) as executor:
+            futures = [
+                (group, id_list, executor.submit(self._set_group, group, id_list, data))
+                for (group, _), (id_list, data) in iteritems(groups)
+            ]
+        for group, id_list, f in futures:
+            err = f.exception()
+            if err is not None:
+                ret.append((group, id_list, err))
+        return ret
+
+    def _set_group(self, group, id_list, data):
+        # type: (_Group, List[Text], Dict[Text, Any]) -> None
+        if self._compat.level < self._compat.LEVEL_7_0:
+            return self._set_v5_2(group, id_list, data)
+        return self._set_v7_0(group, id_list, data)
+
+    def _set_v5_2(self, group, id_list, data):
+        # type: (_Group, List[Text], Dict[Text, Any]) -> None
+        database, module, module_type = group
+        self._http.call(
+            "c_orm",
+            "set_in_id",
+            db=database,
+            module=module,
+            module_type=module_type,
+            id_array=id_list,
+            sign_data_array=data,
+        ).json()
+
+    def _set_v7_0(self, group, id_list, data):
+        # type: (_Group, List[Text], Dict[Text, Any]) -> None
+        database, module, module_type = group
+        self._http.call(
+            module_type,
+            "set",
+            db=database,
+            module=module,
+            module_type=module_type,
+            id_array=id_list,
+            sign_data_array=data,
+            exec_event_filter=True,
+        ).json()
+
+
+def _freeze(data):
+    # type: (Dict[Text, Any]) -> Text
+    return json.dumps(data, sort_keys=True, cls=JSONEncoder)
+
+
+def new_client(http_url="", version="", lazy=None):
+    # type: (Text, Text, Optional[bool]) -> Client
+    return ClientImpl(http_url, version, lazy)
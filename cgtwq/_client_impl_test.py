@@ -0,0 +1,174 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List, Text
+
+import threading
+
+import pytest
+
+from . import _transport_impl
+from ._client_impl import ClientImpl
+from ._compat_service import CompatService
+from ._fake_transport import FakeTransport
+from ._http_client import CGTeamworkError, HTTPClient
+from ._row_id import RowID
+from ._stand_in_server import StandInServer
+
+
+def _respond(payload):
+    # type: (Any) -> Any
+    if payload["sign_data_array"].get("task.status") == "Error":
+        return {"code": "2", "data": "set failed"}
+    return {"code": "1", "data": True}
+
+
+def _client(version="7.0"):
+    # type: (Text) -> ClientImpl
+    client = ClientImpl("http://127.0.0.1", version)
+    client._http = HTTPClient("http://127.0.0.1", FakeTransport(_respond))
+    return client
+
+
+def _calls(client):
+    # type: (ClientImpl) -> List[Any]
+    """Controller, method and payload of each request."""
+
+    transport = client._http._transport  # type: ignore
+    return [(i["controller"], i["method"], i) for i in transport.requests]
+
+
+def _id(value, module="shot"):
+    # type: (Text, Text) -> RowID
+    return RowID("proj_test", module, "task", value)
+
+
+def test_set():
+    client = _client()
+    client.set([_id("1"), _id("2"), _id("3", "asset")], {"task.status": "Wait"})
+    calls = _calls(client)
+    assert [(i[0], i[1], i[2]["module"], i[2]["id_array"]) for i in calls] == [
+        ("task", "set", "shot", ["1", "2"]),
+        ("task", "set", "asset", ["3"]),
+    ]
+
+
+@pytest.mark.parametrize(
+    "version,controller,method", [("7.0", "task", "set"), ("6.1", "c_orm", "set_in_id")]
+)
+def test_batch(version, controller, method):
+    # type: (Text, Text, Text) -> None
+    client = _client(version)
+    with client.batch():
+        for i in range(2000):
+            client.set([_id("%d" % i)], {"task.status": "Approve" if i % 2 else "Wait"})
+        client.set([_id("0")], {"task.artist": "a"})
+        with client.batch():
+            client.set([_id("1")], {"task.status": "Wait"})
+        assert not _calls(client)
+    calls = _calls(client)
+    assert {(i[0], i[1]) for i in calls} == {(controller, method)}
+    groups = sorted(
+        (sorted(i[2]["sign_data_array"].items()), i[2]["id_array"]) for i in calls
+    )
+    assert groups == [
+        ([("task.artist", "a"), ("task.status", "Wait")], ["0"]),
+        ([("task.status", "Approve")], ["%d" % i for i in range(3, 2000, 2)]),
+        (
+            [("task.status", "Wait")],
+            ["%d" % i for i in range(1, 2000) if i % 2 == 0 or i == 1],
+        ),
+    ]
+
+
+def test_batch_discard_on_error():
+    client = _client()
+    with pytest.raises(ZeroDivisionError):
+        with client.batch():
+            client.set([_id("1")], {"task.status": "Wait"})
+            _ = 1 / 0
+    client.flush()
+    assert not _calls(client)
+
+
+def test_batch_other_thread():
+    client = _client()
+    entered = threading.Event()
+    sent = threading.Event()
+
+    def _other():
+        entered.wait()
+        client.set([_id("2")], {"task.status": "Approve"})
+        sent.set()
+
+    thread = threading.Thread(target=_other)
+    thread.start()
+    with client.batch():
+        client.set([_id("1")], {"task.status": "Wait"})
+        entered.set()
+        assert sent.wait(5)
+        calls = _calls(client)
+        assert [i[2]["id_array"] for i in calls] == [["2"]]
+    thread.join()
+    assert [i[2]["id_array"] for i in _calls(client)] == [["2"], ["1"]]
+
+
+def test_flush_error():
+    client = _client()
+    with client.batch():
+        client.set([_id("1")], {"task.status": "Error"})
+        client.set([_id("2")], {"task.status": "Wait"})
+        with pytest.raises(CGTeamworkError):
+            client.flush()
+    assert len(_calls(client)) == 2
+
+
+@pytest.mark.parametrize(
+    "version,controller,method", [("7.0", "task", "set"), ("6.1", "c_orm", "set_in_id")]
+)
+def test_set_many(version, controller, method):
+    # type: (Text, Text, Text) -> None
+    client = _client(version)
+    failed = client.set_many(
+        {
+            _id("1"): {"task.first_frame": 1, "task.last_frame": 10},
+            _id("2"): {"task.first_frame": 1, "task.last_frame": 20},
+            _id("3"): {"task.last_frame": 10, "task.first_frame": 1},
+            _id("4", "asset"): {"task.first_frame": 1, "task.last_frame": 10},
+            _id("5"): {"task.status": "Error"},
+            _id("6"): {},
+        }
+    )
+    assert failed and len(failed) == 1
+    assert failed[0][0] == [_id("5")]
+    assert isinstance(failed[0][1], CGTeamworkError)
+    calls = _calls(client)
+    assert {(i[0], i[1]) for i in calls} == {(controller, method)}
+    assert sorted((i[2]["module"], i[2]["id_array"]) for i in calls) == [
+        ("asset", ["4"]),
+        ("shot", ["1", "3"]),
+        ("shot", ["2"]),
+        ("shot", ["5"]),
+    ]
+
+
+def test_lazy(monkeypatch):
+    # type: (Any) -> None
+    url = "http://lazy.stand-in"
+    server = StandInServer(server_header="nginx/1.15.9")
+    server.add_synthetic_table("proj_test", "shot", "task", 10)
+    monkeypatch.setitem(
+        _transport_impl._TRANSPORTS,  # type: ignore
+        url,
+        server.transport(),
+    )
+    monkeypatch.setattr(ClientImpl, "default_version", "")
+    client = ClientImpl(url, lazy=True)
+    assert server.request_count == 0
+    assert client.table("proj_test", "shot", "task").count() == 10
+    assert client._compat.level == CompatService.LEVEL_6_1  # type: ignore
+    assert server.request_count == 2
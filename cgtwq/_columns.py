@@ -0,0 +1,170 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import (
+        Any,
+        Text,
+        Iterable,
+        Iterator,
+        Dict,
+        List,
+        Optional,
+        Union,
+        Sequence,
+    )
+
+    Column = Union[List[Any], "array[float]", "DictionaryColumn", Any]
+
+from array import array
+from collections import OrderedDict
+
+
+def _to_float(v):
+    # type: (Any) -> float
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class DictionaryColumn:
+    """Dictionary encoded column, each distinct value is stored once.
+
+    Suitable for low-cardinality fields like status or pipeline.
+    """
+
+    def __init__(self):
+        self.codes = array(str("l"))  # type: Any
+        self.values = []  # type: List[Any]
+        self._index = {}  # type: Dict[Any, int]
+
+    def extend(self, values):
+        # type: (Iterable[Any]) -> None
+        index = self._index
+        codes = self.codes
+        for v in values:
+            code = index.get(v)
+            if code is None:
+                code = index[v] = len(self.values)
+                self.values.append(v)
+            codes.append(code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        # type: (int) -> Any
+        return self.values[self.codes[i]]
+
+    def __iter__(self):
+        # type: () -> Iterator[Any]
+        values = self.values
+        for i in self.codes:
+            yield values[i]
+
+
+class ColumnsBuilder:
+    """Collect page columns into per-field buffers.
+
+    Args:
+        fields (Sequence[Text]): Field order.
+        numeric (Iterable[Text]): Fields stored as float `array`,
+            invalid values become `nan`.
+        dictionary (Iterable[Text]): Fields stored as `DictionaryColumn`.
+    """
+
+    def __init__(self, fields, numeric=(), dictionary=()):
+        # type: (Sequence[Text], Iterable[Text], Iterable[Text]) -> None
+        numeric = set(numeric)
+        dictionary = set(dictionary)
+        self._fields = fields
+        self._columns = []  # type: List[Any]
+        for i in fields:
+            if i in numeric:
+                self._columns.append(array(str("d")))
+            elif i in dictionary:
+                self._columns.append(DictionaryColumn())
+            else:
+                self._columns.append([])
+        self._numeric = [i in numeric for i in fields]
+        self.numpy = False
+
+    @classmethod
+    def from_kwargs(cls, fields, kwargs):
+        # type: (Sequence[Text], Dict[Text, Any]) -> ColumnsBuilder
+        """Builder for `TableView.columns` keyword arguments.
+
+        Args:
+            fields (Sequence[Text]): Field order.
+            kwargs (Dict[Text, Any]): Keyword arguments, consumed.
+
+        kwargs:
+            numeric (Iterable[Text]): Fields stored as float `array`.
+            dictionary (Iterable[Text]): Fields stored as `DictionaryColumn`,
+                for low-cardinality fields like status.
+            numpy (bool): Convert numeric columns and dictionary codes
+                to numpy arrays, requires numpy.
+
+        Raises:
+            TypeError: Unexpected keyword argument.
+        """
+
+        ret = cls(
+            fields,
+            numeric=kwargs.pop("numeric", ()),
+            dictionary=kwargs.pop("dictionary", ()),
+        )
+        ret.numpy = kwargs.pop("numpy", False)
+        if kwargs:
+            raise TypeError("unexpected keyword arguments: %s" % (", ".join(kwargs),))
+        return ret
+
+    def extend(self, columns):
+        # type: (Sequence[Iterable[Any]]) -> None
+        """Append values of one page, one iterable per field."""
+
+        for column, is_numeric, values in zip(self._columns, self._numeric, columns):
+            if is_numeric:
+                values = (_to_float(i) for i in values)
+            column.extend(values)
+
+    def extend_rows(self, rows):
+        # type: (Iterable[Sequence[Any]]) -> None
+        """Append values of rows, in field order."""
+
+        rows = list(rows)
+        self.extend([[i[index] for i in rows] for index in range(len(self._fields))])
+
+    def build(self, numpy=None):
+        # type: (Optional[bool]) -> Dict[Text, Column]
+        """Finish columns.
+
+        Args:
+            numpy (bool, optional): Convert numeric arrays and dictionary codes
+                to numpy arrays, requires numpy.
+                Defaults to `numpy` keyword argument of `from_kwargs`.
+
+        Returns:
+            Dict[Text, Column]: Column by field, in field order.
+        """
+
+        columns = self._columns
+        if numpy is None:
+            numpy = self.numpy
+        if numpy:
+            import numpy as np  # type: ignore
+
+            def _convert(v):
+                # type: (Any) -> Any
+                if isinstance(v, array):
+                    return np.array(v, dtype=np.float64)  # type: ignore
+                if isinstance(v, DictionaryColumn):
+                    v.codes = np.array(v.codes, dtype=np.int64)  # type: ignore
+                return v
+
+            columns = [_convert(i) for i in columns]
+        return OrderedDict(zip(self._fields, columns))
@@ -0,0 +1,59 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import math
+from array import array
+
+import pytest
+
+from ._columns import ColumnsBuilder, DictionaryColumn
+
+
+def test_build():
+    builder = ColumnsBuilder(
+        ("name", "frame", "status"), numeric=["frame"], dictionary=["status"]
+    )
+    builder.extend([["a", "b"], ["10", ""], ["Wait", "Approve"]])
+    builder.extend([["c"], ["2.5"], ["Wait"]])
+    columns = builder.build()
+    assert list(columns) == ["name", "frame", "status"]
+    assert columns["name"] == ["a", "b", "c"]
+    frame = columns["frame"]
+    assert isinstance(frame, array)
+    assert frame[0] == 10 and math.isnan(frame[1]) and frame[2] == 2.5
+    status = columns["status"]
+    assert isinstance(status, DictionaryColumn)
+    assert list(status) == ["Wait", "Approve", "Wait"]
+    assert list(status.codes) == [0, 1, 0]
+    assert status.values == ["Wait", "Approve"]
+    assert status[2] == "Wait"
+    assert len(status) == 3
+
+
+def test_build_numpy():
+    np = pytest.importorskip("numpy")
+    builder = ColumnsBuilder(
+        ("frame", "status"), numeric=["frame"], dictionary=["status"]
+    )
+    builder.extend([["1", "2"], ["Wait", "Wait"]])
+    columns = builder.build(numpy=True)
+    assert isinstance(columns["frame"], np.ndarray)
+    assert columns["frame"].sum() == 3
+    assert isinstance(columns["status"].codes, np.ndarray)
+    assert list(columns["status"]) == ["Wait", "Wait"]
+
+
+def test_from_kwargs():
+    kwargs = dict(numeric=["frame"], dictionary=["status"])
+    builder = ColumnsBuilder.from_kwargs(("frame", "status"), kwargs)
+    assert not kwargs
+    builder.extend_rows([("1", "Wait"), ("x", "Wait")])
+    columns = builder.build()
+    frame = columns["frame"]
+    assert isinstance(frame, array)
+    assert frame[0] == 1 and math.isnan(frame[1])
+    assert isinstance(columns["status"], DictionaryColumn)
+    with pytest.raises(TypeError):
+        ColumnsBuilder.from_kwargs(("frame",), dict(unknown=True))
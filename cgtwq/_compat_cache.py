@@ -0,0 +1,163 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""Persisted `Server` header by server url, used to detect compat level.
+
+Fresh entry is used without request, stale entry is used while
+revalidated in background, so short-lived processes need no extra request.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Text, Dict, Tuple, Callable, Set, Optional
+
+import io
+import json
+import logging
+import os
+import threading
+import time
+
+from ._util import env_float
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _default_path():
+    # type: () -> Text
+    base = os.getenv("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "cgtwq", "compat-cache.json")
+
+
+class CompatCache(object):
+    """Server header cache persisted as json file.
+
+    Args:
+        path (Text, optional): Cache file path, empty to keep in memory only.
+        ttl (float, optional): Seconds before entry needs revalidation,
+            `0` disables the cache.
+    """
+
+    def __init__(self, path="", ttl=86400):
+        # type: (Text, float) -> None
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = None  # type: Optional[Dict[Text, Tuple[Text, float]]]
+        self._revalidating = set()  # type: Set[Text]
+
+    def _read_file(self):
+        # type: () -> Dict[Text, Tuple[Text, float]]
+        if not self.path:
+            return {}
+        try:
+            with io.open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {k: (v[0], float(v[1])) for k, v in data.items()}
+        except (IOError, OSError, ValueError, TypeError, KeyError, IndexError):
+            return {}
+
+    def _write_file(self, url, value):
+        # type: (Text, Tuple[Text, float]) -> None
+        if not self.path:
+            return
+        # merge with entries written by other processes.
+        data = self._read_file()
+        data[url] = value
+        tmp = "%s.%d.tmp" % (self.path, os.getpid())
+        try:
+            try:
+                os.makedirs(os.path.dirname(self.path))
+            except OSError:
+                pass
+            with io.open(tmp, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, ensure_ascii=False))
+            try:
+                os.replace(tmp, self.path)  # type: ignore
+            except AttributeError:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                os.rename(tmp, self.path)
+        except (IOError, OSError):
+            _LOGGER.debug("can not write compat cache: %s", self.path, exc_info=True)
+
+    def _entry(self, url):
+        # type: (Text) -> Optional[Tuple[Text, float]]
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read_file()
+            return self._entries.get(url)
+
+    def _put(self, url, value):
+        # type: (Text, Text) -> None
+        entry = (value, time.time())
+        with self._lock:
+            if self._entries is None:
+                self._entries = {}
+            self._entries[url] = entry
+            self._write_file(url, entry)
+
+    def _revalidate(self, url, fetch):
+        # type: (Text, Callable[[], Text]) -> None
+        try:
+            self._put(url, fetch())
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.debug("compat cache revalidation failed: %s", url, exc_info=True)
+        finally:
+            with self._lock:
+                self._revalidating.discard(url)
+
+    def get(self, url, fetch):
+        # type: (Text, Callable[[], Text]) -> Text
+        """Get server header of url, `fetch` is called when missing or stale."""
+
+        if self.ttl <= 0:
+            return fetch()
+        entry = self._entry(url)
+        if entry is None:
+            value = fetch()
+            self._put(url, value)
+            return value
+        value, checked_at = entry
+        if time.time() - checked_at > self.ttl:
+            with self._lock:
+                is_started = url in self._revalidating
+                self._revalidating.add(url)
+            if not is_started:
+                thread = threading.Thread(target=self._revalidate, args=(url, fetch))
+                thread.daemon = True
+                thread.start()
+        return value
+
+    def clear(self):
+        # type: () -> None
+        with self._lock:
+            self._entries = {}
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+
+DEFAULT_COMPAT_CACHE = CompatCache(
+    os.getenv("CGTEAMWORK_COMPAT_CACHE_PATH", _default_path()),
+    env_float("CGTEAMWORK_COMPAT_CACHE_TTL", 86400),
+)
+
+
+def _fetch_server_header(url):
+    # type: (Text) -> Callable[[], Text]
+    def _fetch():
+        # type: () -> Text
+        from ._transport_impl import get_transport
+
+        resp = get_transport(url).request("GET", url)
+        return resp.headers.get("Server", "")
+
+    return _fetch
+
+
+def server_header(url, fetch=None):
+    # type: (Text, Optional[Callable[[], Text]]) -> Text
+    """Server header of url, from `DEFAULT_COMPAT_CACHE`."""
+
+    return DEFAULT_COMPAT_CACHE.get(url, fetch or _fetch_server_header(url))
@@ -0,0 +1,76 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List, Text
+
+import time
+
+from ._compat_cache import CompatCache
+
+
+class _Fetch:
+    def __init__(self, value):
+        # type: (Text) -> None
+        self.value = value
+        self.calls = []  # type: List[float]
+
+    def __call__(self):
+        # type: () -> Text
+        self.calls.append(time.time())
+        return self.value
+
+
+def test_persisted(tmpdir):
+    # type: (Any) -> None
+    path = str(tmpdir.join("cache", "compat.json"))
+    fetch = _Fetch("nginx/1.15.9")
+    cache = CompatCache(path, ttl=60)
+    assert cache.get("http://a", fetch) == "nginx/1.15.9"
+    assert cache.get("http://a", fetch) == "nginx/1.15.9"
+    assert len(fetch.calls) == 1
+
+    # other process
+    assert CompatCache(path, ttl=60).get("http://a", fetch) == "nginx/1.15.9"
+    assert len(fetch.calls) == 1
+    assert CompatCache(path, ttl=60).get("http://b", _Fetch("nginx/1.9.15"))
+    assert CompatCache(path, ttl=60).get("http://a", fetch) == "nginx/1.15.9"
+    assert len(fetch.calls) == 1
+
+
+def test_revalidate(tmpdir):
+    # type: (Any) -> None
+    path = str(tmpdir.join("compat.json"))
+    cache = CompatCache(path, ttl=0.01)
+    assert cache.get("http://a", _Fetch("old")) == "old"
+    time.sleep(0.02)
+    fetch = _Fetch("new")
+    # stale value returned without waiting.
+    assert cache.get("http://a", fetch) == "old"
+    cache.ttl = 60
+    for _ in range(100):
+        if fetch.calls and cache.get("http://a", _Fetch("x")) == "new":
+            break
+        time.sleep(0.01)
+    assert len(fetch.calls) == 1
+    assert CompatCache(path, ttl=60).get("http://a", _Fetch("x")) == "new"
+
+
+def test_disabled(tmpdir):
+    # type: (Any) -> None
+    fetch = _Fetch("v")
+    cache = CompatCache(str(tmpdir.join("compat.json")), ttl=0)
+    cache.get("http://a", fetch)
+    cache.get("http://a", fetch)
+    assert len(fetch.calls) == 2
+
+
+def test_broken_file(tmpdir):
+    # type: (Any) -> None
+    f = tmpdir.join("compat.json")
+    f.write("not json")
+    assert CompatCache(str(f), ttl=60).get("http://a", _Fetch("v")) == "v"
+    assert CompatCache(str(f), ttl=60).get("http://a", _Fetch("x")) == "v"
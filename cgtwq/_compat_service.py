@@ -6,10 +6,13 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from typing import Text
+    from typing import Any, Text, Union, List, Optional, Sequence
     from ._http_client import HTTPClient
 
+from ._compat_cache import server_header
+from ._compat_translation import IDENTITY, LEVEL_5_2, Translation
 from ._filter import Filter
+from ._lazy import Lazy
 
 
 class CompatService:
@@ -28,7 +31,7 @@ class CompatService:
             return cls.LEVEL_5_2
         if "6.0" <= s < "7.0":
             return cls.LEVEL_6_1
-        if "7.0" <= s < "6.0":
+        if "7.0" <= s < "8.0":
             return cls.LEVEL_7_0
         return cls.LEVEL_UNKNOWN
 
@@ -36,45 +39,74 @@ class CompatService:
     def level_from_http(cls, http):
         # type: (HTTPClient) -> int
 
-        resp = http.get("")
+        return cls.level_from_server_header(
+            server_header(
+                http.url,
+                # index page needs no token, which may wait for compat level.
+                lambda: http.get("", cookies={}).raw.headers.get(  # type: ignore
+                    "Server", ""
+                ),
+            ),
+        )
+
+    @classmethod
+    def level_from_server_header(cls, s):
+        # type: (Text) -> int
         return {
             "nginx/1.9.15": cls.LEVEL_5_2,
             "nginx/1.15.9": cls.LEVEL_6_1,
             "nginx/1.19.9": cls.LEVEL_7_0,
-        }.get(
-            resp.raw.headers.get("Server", ""),  # type: ignore
-            cls.LEVEL_7_0,
-        )
+        }.get(s, cls.LEVEL_7_0)
 
     def __init__(self, level):
-        # type: (int) -> None
+        # type: (Union[int, Lazy]) -> None
+        """
+        Args:
+            level (Union[int, Lazy]): Compat level, `Lazy` is resolved on first use.
+        """
         self._l = level
-        pass
+        self._translation = None  # type: Optional[Translation]
 
     @property
     def level(self):
+        # type: () -> int
+        if isinstance(self._l, Lazy):
+            self._l = self._l.get()  # type: int
         return self._l
 
+    @property
+    def translation(self):
+        # type: () -> Translation
+        ret = self._translation
+        if ret is None:
+            ret = LEVEL_5_2 if self.level == self.LEVEL_5_2 else IDENTITY
+            self._translation = ret
+        return ret
+
     def transform_field(self, s):
         # type: (Text) -> Text
-        if self._l == self.LEVEL_5_2:
-            return {
-                "task.entity": "task.task_name",
-                "shot.entity": "shot.shot",
-                "eps.entity": "eps.eps_name",
-                "shot.link_eps": "shot.eps_name",
-                "asset.entity": "asset.asset_name",
-                "project.entity": "project.code",
-                "account.entity": "account.account",
-                "asset_type.entity": "asset.type_name",
-                "entity": "entity_name",
-            }.get(s, s)
-        return s
+        return self.translation.field(s)
+
+    def transform_fields(self, signs):
+        # type: (Sequence[Text]) -> List[Text]
+        """Translated sign array, result is shared and should not be modified."""
+        return self.translation.fields(signs)
 
     def transform_filter(self, v):
         # type: (Filter) -> Filter
 
-        ret = Filter(self.transform_field(v.left), v.op, v.right)
-        if v.chain_to:
-            ret = ret.chain(v.chain_logic, self.transform_filter(v.chain_to))
+        ret = None  # type: Optional[Filter]
+        logic = ""
+        for i in v.items():
+            if not isinstance(i, tuple):
+                logic = i
+                continue
+            clause = Filter(self.transform_field(i[0]), i[1], i[2])
+            ret = clause if ret is None else ret.chain(logic, clause)
+        assert ret
         return ret
+
+    def filter_payload(self, v):
+        # type: (Filter) -> List[Any]
+        """Translated filter payload, result is shared and should not be modified."""
+        return self.translation.filter_payload(v)
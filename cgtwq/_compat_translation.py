@@ -0,0 +1,90 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""Field sign translation compiled once per compat level.
+
+Translated sign arrays and filter payloads are memoized,
+so repeated requests (e.g. pages of same query) skip translation.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, Dict, List, Sequence, Tuple, Mapping
+    from ._filter import Filter
+
+import threading
+import weakref
+
+LEVEL_5_2_FIELD_SIGNS = {
+    "task.entity": "task.task_name",
+    "shot.entity": "shot.shot",
+    "eps.entity": "eps.eps_name",
+    "shot.link_eps": "shot.eps_name",
+    "asset.entity": "asset.asset_name",
+    "project.entity": "project.code",
+    "account.entity": "account.account",
+    "asset_type.entity": "asset.type_name",
+    "entity": "entity_name",
+}  # type: Dict[Text, Text]
+
+
+class Translation(object):
+    """Field sign translation by `field_signs` table.
+
+    Args:
+        field_signs (Mapping[Text, Text]): Server field sign by field sign,
+            missing sign is kept as is.
+        max_sign_arrays (int, optional): Max memoized sign arrays.
+    """
+
+    def __init__(self, field_signs, max_sign_arrays=1024):
+        # type: (Mapping[Text, Text], int) -> None
+        self._field_signs = dict(field_signs)
+        self.max_sign_arrays = max_sign_arrays
+        self._lock = threading.Lock()
+        self._sign_arrays = {}  # type: Dict[Tuple[Text, ...], List[Text]]
+        # filter is immutable, so payload is memoized by identity.
+        self._filter_payloads = (
+            weakref.WeakKeyDictionary()
+        )  # type: weakref.WeakKeyDictionary[Filter, List[Any]]
+
+    def field(self, s):
+        # type: (Text) -> Text
+        return self._field_signs.get(s, s)
+
+    def fields(self, signs):
+        # type: (Sequence[Text]) -> List[Text]
+        """Translated sign array, result is shared and should not be modified."""
+
+        key = tuple(signs)
+        ret = self._sign_arrays.get(key)
+        if ret is None:
+            ret = [self.field(i) for i in key]
+            with self._lock:
+                if len(self._sign_arrays) >= self.max_sign_arrays:
+                    self._sign_arrays.clear()
+                self._sign_arrays[key] = ret
+        return ret
+
+    def filter_payload(self, f):
+        # type: (Filter) -> List[Any]
+        """Translated payload of filter, result is shared and should not be modified."""
+
+        with self._lock:
+            ret = self._filter_payloads.get(f)
+        if ret is not None:
+            return ret
+        if not self._field_signs:
+            return f.as_payload()
+        ret = [
+            [self.field(i[0]), i[1], i[2]] if isinstance(i, tuple) else i
+            for i in f.items()
+        ]
+        with self._lock:
+            self._filter_payloads[f] = ret
+        return ret
+
+
+IDENTITY = Translation({})
+LEVEL_5_2 = Translation(LEVEL_5_2_FIELD_SIGNS)
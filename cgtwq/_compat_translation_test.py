@@ -0,0 +1,63 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import gc
+
+from ._compat_service import CompatService
+from ._compat_translation import IDENTITY, LEVEL_5_2, Translation
+from ._field_sign import FieldSign
+from ._filter import Filter
+
+
+def test_fields():
+    assert LEVEL_5_2.fields(("shot.entity", "shot.id")) == ["shot.shot", "shot.id"]
+    assert IDENTITY.fields(["shot.entity"]) == ["shot.entity"]
+
+
+def test_fields_memoized():
+    t = Translation({"a": "b"}, max_sign_arrays=2)
+    v = t.fields(["a", "c"])
+    assert v == ["b", "c"]
+    assert t.fields(("a", "c")) is v
+    t.fields(["x"])
+    t.fields(["y"])
+    assert t.fields(["a", "c"]) is not v
+
+
+def test_filter_payload():
+    f = (
+        FieldSign("shot.entity")
+        .equal("SH001")
+        .or_(FieldSign("shot.id").in_(["1", "2"]))
+        .and_(FieldSign("entity").has("%a%"))
+    )
+    assert LEVEL_5_2.filter_payload(f) == [
+        ["shot.shot", "=", "SH001"],
+        "or",
+        ["shot.id", "in", ["1", "2"]],
+        "and",
+        ["entity_name", "has", "%a%"],
+    ]
+    assert IDENTITY.filter_payload(f) == f.as_payload()
+
+
+def test_filter_payload_memoized():
+    t = Translation({})
+    f = Filter("a", "=", "1")
+    v = t.filter_payload(f)
+    assert t.filter_payload(f) is v
+    del f
+    gc.collect()
+    assert len(t._filter_payloads) == 0  # type: ignore
+
+
+def test_compat_service():
+    f = FieldSign("shot.entity").equal("SH001")
+    compat = CompatService(CompatService.LEVEL_5_2)
+    assert compat.transform_fields(["shot.entity"]) == ["shot.shot"]
+    assert compat.filter_payload(f) == compat.transform_filter(f).as_payload()
+    assert CompatService(CompatService.LEVEL_7_0).filter_payload(f) == [
+        ["shot.entity", "=", "SH001"]
+    ]
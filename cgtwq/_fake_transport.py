@@ -0,0 +1,82 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""In-process transport for tests, answers each request by a function."""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, Callable, List, Mapping, Optional, Tuple
+
+import json
+import threading
+import time
+
+from ._recording_transport import RecordedResponse
+
+
+class FakeTransport(object):
+    """Transport answers each request with json body returned by `respond`.
+
+    Args:
+        respond (Callable[[Any], Any], optional): Response body by
+            `api.php` request payload, `None` for other requests.
+            Defaults to `{"code": code, "data": [<request count>]}`.
+        status_code (int, optional): Response status code.
+        headers (Mapping[Text, Text], optional): Response headers.
+
+    Attributes:
+        requests (List[Any]): Request payloads.
+        calls (List[Tuple[Text, Text, Dict[Text, Any]]]): Request arguments.
+        code (Text): `code` of default response body.
+        gate (threading.Event, optional): Requests wait until it is set.
+        delay (float): Seconds to wait before responding.
+        max_in_flight (int): Max concurrent requests seen.
+    """
+
+    def __init__(self, respond=None, status_code=200, headers=None):
+        # type: (Optional[Callable[[Any], Any]], int, Optional[Mapping[Text, Text]]) -> None
+        self.respond = respond or self._count
+        self.status_code = status_code
+        self.headers = dict(headers or {})
+        self.requests = []  # type: List[Any]
+        self.calls = []  # type: List[Tuple[Text, Text, Any]]
+        self.code = "1"
+        self.gate = None  # type: Optional[threading.Event]
+        self.delay = 0.0
+        self.max_in_flight = 0
+        self.closed = False
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _count(self, payload):
+        # type: (Any) -> Any
+        return {"code": self.code, "data": [len(self.requests)]}
+
+    def request(self, method, url, **kwargs):
+        # type: (Text, Text, *Any) -> RecordedResponse
+        data = kwargs.get("data")
+        payload = None
+        if isinstance(data, dict) and "data" in data:
+            payload = json.loads(data["data"])  # type: ignore
+        with self._lock:
+            self.requests.append(payload)
+            self.calls.append((method, url, kwargs))
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.gate:
+                self.gate.wait(5)
+            if self.delay:
+                time.sleep(self.delay)
+            body = self.respond(payload)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        return RecordedResponse(
+            self.status_code, self.headers, json.dumps(body).encode("utf-8")
+        )
+
+    def close(self):
+        # type: () -> None
+        self.closed = True
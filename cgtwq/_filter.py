@@ -5,54 +5,126 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from typing import Any, Text, Optional, List
+    from typing import Any, Text, Optional, List, Tuple, Iterable, Union
 
+    _Clause = Tuple[Text, Text, Any]
+    _Item = Union[_Clause, Text]
+
+
+class Filter(object):
+    """Immutable filter, chained filters share structure.
+
+    `chain` is O(1), payload is flattened without recursion and memoized.
+    """
 
-class Filter:
     def __init__(self, left, op, right):
         # type: (Text, Text, Any) -> None
-        self._left = left
-        self._op = op
-        self._right = right
+        self._init(((left, op, right),), None)
+
+    def _init(self, items, parts):
+        # type: (Optional[Tuple[_Item, ...]], Optional[Tuple[Filter, Text, Filter]]) -> None
+        # flattened items, or `None` for concatenation of `parts`.
+        self._items = items
+        self._parts = parts
+        self._payload = None  # type: Optional[List[Any]]
         self._chain_to = None  # type: Optional[Filter]
-        self._chain_logic = ""
+        if parts:
+            a, logic, b = parts
+            self._first = a._first
+            self._first_logic = a._first_logic if a._size > 1 else logic
+            self._size = a._size + b._size  # type: int
+        else:
+            assert items
+            self._first = items[0]  # type: ignore
+            self._first_logic = items[1] if len(items) > 1 else ""  # type: ignore
+            self._size = (len(items) + 1) // 2
+
+    @classmethod
+    def _new(cls, items, parts):
+        # type: (Optional[Tuple[_Item, ...]], Optional[Tuple[Filter, Text, Filter]]) -> Filter
+        v = cls.__new__(cls)
+        v._init(items, parts)
+        return v
+
+    @classmethod
+    def _join(cls, logic, filters):
+        # type: (Text, Iterable[Filter]) -> Filter
+        items = []  # type: List[_Item]
+        for i in filters:
+            if items:
+                items.append(logic)
+            items.extend(i.items())
+        if not items:
+            raise ValueError("no filter to join")
+        return cls._new(tuple(items), None)
+
+    @classmethod
+    def all_of(cls, filters):
+        # type: (Iterable[Filter]) -> Filter
+        """Chain filters with `and`, in one pass."""
+        return cls._join("and", filters)
+
+    @classmethod
+    def any_of(cls, filters):
+        # type: (Iterable[Filter]) -> Filter
+        """Chain filters with `or`, in one pass."""
+        return cls._join("or", filters)
 
     @property
     def left(self):
-        return self._left
+        return self._first[0]
 
     @property
     def op(self):
-        return self._op
+        return self._first[1]
 
     @property
     def right(self):
-        return self._right
+        return self._first[2]
 
     @property
     def chain_to(self):
+        # type: () -> Optional[Filter]
+        """Filter after first clause, prefer `items` for iteration."""
+
+        if self._size < 2:
+            return None
+        if self._chain_to is None:
+            self._chain_to = self._new(self.items()[2:], None)
         return self._chain_to
 
     @property
     def chain_logic(self):
-        return self._chain_logic
+        return self._first_logic
+
+    def items(self):
+        # type: () -> Tuple[_Item, ...]
+        """Flattened `(left, op, right)` clauses and logic between them."""
+
+        if self._items is not None:
+            return self._items
+        items = []  # type: List[_Item]
+        stack = [self]  # type: List[Union[Filter, Text]]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, Filter):
+                items.append(node)
+            elif node._items is not None:
+                items.extend(node._items)
+            else:
+                assert node._parts
+                a, logic, b = node._parts
+                stack.extend((b, logic, a))
+        self._items = tuple(items)
+        return self._items
 
     def copy(self):
-        v = Filter(self.left, self.op, self.right)
-        v._chain_logic = self._chain_logic
-        if self.chain_to:
-            v._chain_to = self.chain_to.copy()
-        return v
+        # type: () -> Filter
+        return self
 
     def chain(self, logic, other):
-        # type: (str, Filter) -> Filter
-        v = self.copy()
-        last = v
-        while last._chain_to:
-            last = last._chain_to
-        last._chain_logic = logic
-        last._chain_to = other
-        return v
+        # type: (Text, Filter) -> Filter
+        return self._new(None, (self, logic, other))
 
     def and_(self, other):
         # type: (Filter) -> Filter
@@ -64,10 +136,13 @@ class Filter:
 
     def as_payload(self):
         # type: () -> List[Any]
-        chain = []
-        if self.chain_logic and self.chain_to:
-            chain = [self.chain_logic] + self.chain_to.as_payload()
-        return [[self.left, self.op, self.right]] + chain
+        """Payload of filter, result is shared and should not be modified."""
+
+        if self._payload is None:
+            self._payload = [
+                list(i) if isinstance(i, tuple) else i for i in self.items()
+            ]
+        return self._payload
 
 
 NULL_FILTER = Filter("#id", "has", "%")
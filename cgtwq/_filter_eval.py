@@ -0,0 +1,248 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""Evaluate filters locally, with same semantic as `_filter_sql`.
+
+Operators and `and`-before-`or` precedence follow the server,
+`None` value never matches except for `is`, like SQL `NULL`.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import (
+        Any,
+        Text,
+        List,
+        Tuple,
+        Callable,
+        Sequence,
+        Mapping,
+        Optional,
+        Union,
+    )
+    from . import filter as legacy_filter
+
+    _Clause = Tuple[Text, Text, Any]
+    _Test = Callable[[Any], bool]
+
+import re
+
+from ._filter import Filter
+from ._filter_sql import escape_like, fold_case, like_pattern
+from ._util import text_type
+
+
+def _like(pattern, ignore_case=False):
+    # type: (Text, bool) -> _Test
+    """Compile SQL `LIKE` pattern with `\\` as escape character.
+
+    `ignore_case` folds case by `fold_case`, same as `_filter_sql`.
+    """
+
+    if ignore_case:
+        pattern = text_type(fold_case(pattern))
+
+    parts = []  # type: List[Text]
+    escaped = False
+    for c in pattern:
+        if escaped:
+            parts.append(re.escape(c))
+            escaped = False
+        elif c == "\\":
+            escaped = True
+        elif c == "%":
+            parts.append(".*")
+        elif c == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(c))
+    match = re.compile("(?s)" + "".join(parts) + r"\Z").match
+    fold = fold_case if ignore_case else text_type
+
+    def _test(v):
+        # type: (Any) -> bool
+        return match(fold(v)) is not None
+
+    return _test
+
+
+def _compare(op, right):
+    # type: (Text, Any) -> _Test
+    compare = {
+        "=": lambda a: a == right,  # type: ignore
+        "!=": lambda a: a != right,  # type: ignore
+        "<": lambda a: a < right,  # type: ignore
+        "<=": lambda a: a <= right,  # type: ignore
+        ">": lambda a: a > right,  # type: ignore
+        ">=": lambda a: a >= right,  # type: ignore
+    }[
+        op
+    ]  # type: _Test
+
+    def _test(v):
+        # type: (Any) -> bool
+        try:
+            return compare(v)
+        except TypeError:
+            return False
+
+    return _test
+
+
+def _operator(op, right):
+    # type: (Text, Any) -> _Test
+    if op in ("=", "!=", "<", "<=", ">", ">="):
+        return _compare(op, right)
+    if op == "~":
+        folded = fold_case(right)
+        return lambda v: fold_case(v) == folded
+    if op == "in":
+        if isinstance(right, (str, text_type)):
+            right = [right]
+        values = list(right)
+        try:
+            value_set = frozenset(values)
+            return lambda v: v in value_set
+        except TypeError:
+            return lambda v: v in values
+    if op == "has":
+        return _like("%" + escape_like(right) + "%")
+    if op == "!has":
+        test = _like("%" + escape_like(right) + "%")
+        return lambda v: not test(v)
+    if op == "~has":
+        return _like("%" + escape_like(right) + "%", True)
+    if op == "concat":
+        return _like(like_pattern(right))
+    if op == "!concat":
+        test = _like(like_pattern(right))
+        return lambda v: not test(v)
+    if op == "start":
+        return _like(escape_like(right) + "%")
+    if op == "end":
+        return _like("%" + escape_like(right))
+    raise ValueError("unsupported filter operator: %s" % (op,))
+
+
+def _test(op, right):
+    # type: (Text, Any) -> _Test
+    if op == "is":
+        return lambda v: v is right or v == right
+    test = _operator(op, right)
+    return lambda v: v is not None and test(v)
+
+
+def _groups(filter_by):
+    # type: (Union[Filter, Sequence[Any]]) -> List[List[_Clause]]
+    """Split filter to `or` groups of `and` clauses."""
+
+    groups = [[]]  # type: List[List[_Clause]]
+    if isinstance(filter_by, Filter):
+        for i in filter_by.items():
+            if isinstance(i, tuple):
+                groups[-1].append(i)
+            elif i == "or":
+                groups.append([])
+            elif i != "and":
+                raise ValueError("unsupported filter logic: %s" % (i,))
+        return groups
+
+    # legacy `FilterList` or `Filter`: `[key, operator, value]`
+    if filter_by and isinstance(filter_by[0], (str, text_type)):
+        filter_by = [filter_by]
+    for i in filter_by:
+        if i == "or":
+            groups.append([])
+        elif i == "and":
+            continue
+        elif isinstance(i, (str, text_type)):
+            raise ValueError("unsupported filter logic: %s" % (i,))
+        else:
+            key, op, value = i
+            groups[-1].append((key, op, value))
+    return groups
+
+
+def compile_filter(filter_by, fields=None):
+    # type: (Union[Filter, legacy_filter.Filter, legacy_filter.FilterList], Optional[Sequence[Text]]) -> Callable[[Any], bool]
+    """Compile filter to row predicate.
+
+    Args:
+        filter_by (Filter, legacy Filter, legacy FilterList): Filter.
+        fields (Sequence[Text], optional): Field order of sequence row,
+            row is a mapping by field when not given.
+
+    Returns:
+        Callable[[Any], bool]: Row predicate.
+    """
+
+    index = {}  # type: Mapping[Text, int]
+    if fields is not None:
+        index = {v: k for k, v in enumerate(fields)}
+
+    def _getter(field):
+        # type: (Text) -> Callable[[Any], Any]
+        if fields is None:
+            return lambda row: row.get(field)
+        try:
+            i = index[field]
+        except KeyError:
+            raise ValueError("field not in row: %s" % (field,))
+        return lambda row: row[i]
+
+    groups = [
+        [(_getter(left), _test(op, right)) for left, op, right in group]
+        for group in _groups(filter_by)
+    ]
+
+    def _predicate(row):
+        # type: (Any) -> bool
+        for group in groups:
+            for get, test in group:
+                if not test(get(row)):
+                    break
+            else:
+                return True
+        return False
+
+    return _predicate
+
+
+def _column_mask(column, test):
+    # type: (Any, _Test) -> List[bool]
+    codes = getattr(column, "codes", None)
+    if codes is not None:
+        # dictionary encoded, test each distinct value once.
+        matched = [test(i) for i in column.values]
+        return [matched[i] for i in codes]
+    return [test(i) for i in column]
+
+
+def filter_columns(filter_by, columns):
+    # type: (Union[Filter, legacy_filter.Filter, legacy_filter.FilterList], Mapping[Text, Any]) -> List[bool]
+    """Evaluate filter on columnar data, e.g. result of `TableView.columns`.
+
+    Args:
+        filter_by (Filter, legacy Filter, legacy FilterList): Filter.
+        columns (Mapping[Text, Any]): Column by field, `DictionaryColumn`
+            is evaluated once per distinct value.
+
+    Returns:
+        List[bool]: Match mask, one item per row.
+    """
+
+    size = len(next(iter(columns.values()))) if columns else 0
+    ret = [False] * size
+    for group in _groups(filter_by):
+        mask = [True] * size
+        for left, op, right in group:
+            try:
+                column = columns[left]
+            except KeyError:
+                raise ValueError("field not in columns: %s" % (left,))
+            mask = [
+                a and b for a, b in zip(mask, _column_mask(column, _test(op, right)))
+            ]
+        ret = [a or b for a, b in zip(ret, mask)]
+    return ret
@@ -0,0 +1,120 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Text
+
+import pytest
+
+from ._columns import ColumnsBuilder
+from ._field_sign import FieldSign
+from ._filter import Filter
+from ._filter_eval import compile_filter, filter_columns
+from ._filter_sql_test import _NAMES, _UNICODE_NAMES, _select  # type: ignore
+from .filter import Field
+
+F = FieldSign("shot.entity")
+
+_CASES = [
+    F.equal("sc002"),
+    F.not_equal(""),
+    F.equal_ignore_case("sc001_b"),
+    F.has("001"),
+    F.has("c0_1"),
+    F.not_has("sc"),
+    F.has_ignore_case("sc001"),
+    F.like("sc0-1%"),
+    F.not_like("sc%"),
+    F.starts_with("shot_"),
+    F.ends_with("_a"),
+    F.in_(["sc002", "sc0x1"]),
+    F.in_([]),
+    F.greater_than("sc002"),
+    F.less_equal_than("SC001_B"),
+    F.equal("sc002").or_(F.has("x")).and_(F.has("1")),
+    F.equal("sc002").and_(F.has("x")).or_(F.has("_a")),
+]
+
+
+@pytest.mark.parametrize("filter_by", _CASES)
+def test_compile_filter_same_as_sql(filter_by):
+    # type: (Filter) -> None
+    match = compile_filter(filter_by)
+    assert [i for i in _NAMES if match({"shot.entity": i})] == _select(filter_by)
+
+
+@pytest.mark.parametrize("filter_by", _CASES)
+def test_filter_columns_same_as_sql(filter_by):
+    # type: (Filter) -> None
+    builder = ColumnsBuilder(["shot.entity"], dictionary=["shot.entity"])
+    builder.extend([_NAMES + _NAMES])
+    mask = filter_columns(filter_by, builder.build())
+    assert [i for i, m in zip(_NAMES + _NAMES, mask) if m] == _select(filter_by) * 2
+
+
+def test_sequence_row():
+    match = compile_filter(
+        FieldSign("shot.id").in_(["1", "2"]).and_(F.has("sc")),
+        ("shot.id", "shot.entity"),
+    )
+    assert match(("1", "sc001"))
+    assert not match(("3", "sc001"))
+    assert not match(("1", "SC001"))
+    with pytest.raises(ValueError):
+        compile_filter(FieldSign("shot.artist").equal(""), ("shot.id",))
+
+
+def test_none_value():
+    assert not compile_filter(F.not_equal("a"))({"shot.entity": None})
+    assert not compile_filter(F.not_has("a"))({})
+    assert compile_filter(F.is_(None))({})
+
+
+def test_legacy_filter():
+    # type: () -> None
+    rows = [
+        {"shot.entity": "sc001", "shot.artist": "a"},
+        {"shot.entity": "sc002", "shot.artist": "b"},
+        {"shot.entity": "sc003", "shot.artist": "a"},
+    ]
+
+    def _select_legacy(filter_by):
+        # type: (...) -> List[Text]
+        match = compile_filter(filter_by)
+        return [i["shot.entity"] for i in rows if match(i)]
+
+    entity = Field("shot.entity")
+    artist = Field("shot.artist")
+    assert _select_legacy(artist == "a") == ["sc001", "sc003"]
+    # `and` before `or`
+    either = (entity == "sc002") | (artist == "a") & (entity == "sc003")
+    assert _select_legacy(either) == ["sc002", "sc003"]
+    assert _select_legacy(entity.in_(["sc001", "sc002"]) & artist.has("b")) == ["sc002"]
+    mask = filter_columns(
+        (artist == "a") | (entity > "sc002"),
+        {
+            "shot.entity": [i["shot.entity"] for i in rows],
+            "shot.artist": [i["shot.artist"] for i in rows],
+        },
+    )
+    assert mask == [True, False, True]
+
+
+@pytest.mark.parametrize(
+    "filter_by",
+    [
+        F.equal_ignore_case("ärger"),
+        F.has_ignore_case("cole_"),
+        F.has_ignore_case("ÉCOLE"),
+        F.has("É"),
+    ],
+)
+def test_fold_case_unicode_same_as_sql(filter_by):
+    # type: (Filter) -> None
+    match = compile_filter(filter_by)
+    assert [i for i in _UNICODE_NAMES if match({"shot.entity": i})] == _select(
+        filter_by, _UNICODE_NAMES
+    )
@@ -0,0 +1,297 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""Rewrite filters to smaller equivalent ones, and shard oversized `in` lists.
+
+Filter is read as `or` groups of `and` clauses, same precedence as server:
+
+- duplicated clauses and groups are removed.
+- `has %` tautology on `#id` or id field of the module itself is removed
+  from groups with other clauses, joined module id may be null so not
+  a tautology.
+- `or` groups of single `=`/`in` clause on same field are merged to one `in`.
+  `has` is only merged for full uuid on id field, other field may hold
+  joined ids (e.g. note `#link_id`) so `has` is not equality there.
+
+Filter with unknown logic is kept as is.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, List, Tuple, Optional, Sequence, Iterable, Hashable
+
+    _Clause = Tuple[Text, Text, Any]
+    _Group = List[_Clause]
+
+import re
+
+from . import filter as legacy_filter
+from ._filter import Filter
+from ._util import env_int, text_type
+
+# opt-in, shards are queried separately so rows are not ordered across shards.
+MAX_IN_SIZE = env_int("CGTEAMWORK_FILTER_MAX_IN_SIZE", 0)
+
+_UUID = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"
+)
+
+
+def _is_id_field(s):
+    # type: (Text) -> bool
+    return s == "#id" or s.endswith(".id")
+
+
+def _is_tautology(c, id_field):
+    # type: (_Clause, Text) -> bool
+    left, op, right = c
+    return op == "has" and right == "%" and left in ("#id", id_field)
+
+
+def _freeze(v):
+    # type: (Any) -> Hashable
+    if isinstance(v, (list, tuple)):
+        return tuple(_freeze(i) for i in v)  # type: ignore
+    if isinstance(v, dict):
+        return tuple(sorted((k, _freeze(i)) for k, i in v.items()))  # type: ignore
+    try:
+        hash(v)
+    except TypeError:
+        return repr(v)
+    return v  # type: ignore
+
+
+def _key(c):
+    # type: (_Clause) -> Hashable
+    return (c[0], c[1], _freeze(c[2]))
+
+
+def _in_values(c):
+    # type: (_Clause) -> Optional[List[Any]]
+    """Values of clause that equals to `in` clause, `None` if not."""
+
+    left, op, right = c
+    if op == "in":
+        if isinstance(right, (str, text_type)):
+            return [right]
+        if isinstance(right, (list, tuple)):
+            return list(right)  # type: ignore
+        return None
+    if isinstance(right, (list, tuple, dict)):
+        return None
+    if op == "=":
+        return [right]
+    if (
+        op == "has"
+        and _is_id_field(left)
+        and isinstance(right, (str, text_type))
+        and _UUID.match(right)
+    ):
+        return [right]
+    return None
+
+
+def _dedupe(values):
+    # type: (Iterable[Any]) -> List[Any]
+    ret = []  # type: List[Any]
+    seen = set()  # type: set[Hashable]
+    for i in values:
+        k = _freeze(i)
+        if k in seen:
+            continue
+        seen.add(k)
+        ret.append(i)
+    return ret
+
+
+def _groups(items):
+    # type: (Iterable[Any]) -> Optional[List[_Group]]
+    groups = [[]]  # type: List[_Group]
+    for i in items:
+        if isinstance(i, (str, text_type)):
+            if not groups[-1] or i not in ("and", "or"):
+                return None
+            if i == "or":
+                groups.append([])
+        else:
+            if len(i) != 3:
+                return None
+            groups[-1].append(tuple(i))  # type: ignore
+    if not groups[-1]:
+        return None
+    return groups
+
+
+def _items(groups):
+    # type: (Sequence[_Group]) -> List[Any]
+    ret = []  # type: List[Any]
+    for index, group in enumerate(groups):
+        if index:
+            ret.append("or")
+        for clause_index, clause in enumerate(group):
+            if clause_index:
+                ret.append("and")
+            ret.append(clause)
+    return ret
+
+
+def optimize_groups(groups, id_field="#id"):
+    # type: (Sequence[_Group], Text) -> Tuple[List[_Group], bool]
+    """Optimized groups, and whether changed.
+
+    Args:
+        groups (Sequence[_Group]): `or` groups of `and` clauses.
+        id_field (Text, optional): Id field of the module,
+            e.g. `shot.id`, `#id` is always treated as id field.
+    """
+
+    changed = False
+    ret = []  # type: List[_Group]
+    seen_groups = set()  # type: set[Hashable]
+    # field: [group index, values, source count]
+    merged = {}  # type: dict[Text, List[Any]]
+    for group in groups:
+        clauses = []  # type: _Group
+        seen = set()  # type: set[Hashable]
+        for c in group:
+            k = _key(c)
+            if k in seen or (_is_tautology(c, id_field) and len(group) > 1):
+                changed = True
+                continue
+            seen.add(k)
+            clauses.append(c)
+        if not clauses:
+            # all tautology, matches every row.
+            return [[group[0]]], True
+        if (
+            len(clauses) == 1
+            and _is_tautology(clauses[0], id_field)
+            and len(groups) > 1
+        ):
+            return [clauses], True
+        values = _in_values(clauses[0]) if len(clauses) == 1 else None
+        if values is not None:
+            left = clauses[0][0]
+            if left in merged:
+                merged[left][1].extend(values)
+                merged[left][2] += 1
+                changed = True
+                continue
+            merged[left] = [len(ret), list(values), 1]
+        group_key = frozenset(_key(i) for i in clauses)
+        if group_key in seen_groups:
+            changed = True
+            continue
+        seen_groups.add(group_key)
+        ret.append(clauses)
+    for left, (index, values, count) in merged.items():
+        if count < 2:
+            continue
+        values = _dedupe(values)
+        if len(values) > 1:
+            ret[index] = [(left, "in", values)]
+    return ret, changed
+
+
+def shard_groups(groups, max_in_size):
+    # type: (Sequence[_Group], int) -> Optional[List[List[_Group]]]
+    """Split largest `in` clause of single group into chunks,
+    `None` when not needed or not possible.
+    """
+
+    if max_in_size <= 0 or len(groups) != 1:
+        return None
+    group = groups[0]
+    index, values = -1, []  # type: Tuple[int, List[Any]]
+    for i, c in enumerate(group):
+        if c[1] != "in":
+            continue
+        v = _in_values(c)
+        if v is not None and len(v) > len(values):
+            index, values = i, v
+    if len(values) <= max_in_size:
+        return None
+    # shards must not overlap, so union needs no deduplication.
+    values = _dedupe(values)
+    if len(values) <= max_in_size:
+        return None
+    left = group[index][0]
+    return [
+        [
+            group[:index]
+            + [(left, "in", values[i : i + max_in_size])]
+            + group[index + 1 :]
+        ]
+        for i in range(0, len(values), max_in_size)
+    ]
+
+
+def _new_filter(items):
+    # type: (List[Any]) -> Filter
+    ret = None  # type: Optional[Filter]
+    logic = ""
+    for i in items:
+        if isinstance(i, tuple):
+            clause = Filter(*i)
+            ret = clause if ret is None else ret.chain(logic, clause)
+        else:
+            logic = i
+    assert ret
+    return ret
+
+
+def optimize(f, id_field="#id"):
+    # type: (Filter, Text) -> Filter
+    groups = _groups(f.items())
+    if groups is None:
+        return f
+    groups, changed = optimize_groups(groups, id_field)
+    if not changed:
+        return f
+    return _new_filter(_items(groups))
+
+
+def shard(f, max_in_size=MAX_IN_SIZE):
+    # type: (Filter, int) -> List[Filter]
+    """Split filter to filters that matches disjoint rows,
+    result union matches same rows as `f`.
+    """
+
+    groups = _groups(f.items())
+    shards = shard_groups(groups, max_in_size) if groups else None
+    if not shards:
+        return [f]
+    return [_new_filter(_items(i)) for i in shards]
+
+
+def _new_filter_list(items):
+    # type: (List[Any]) -> legacy_filter.FilterList
+    return legacy_filter.FilterList(
+        legacy_filter.Filter(i[0], i[2], i[1]) if isinstance(i, tuple) else i
+        for i in items
+    )
+
+
+def optimize_list(f, id_field="#id"):
+    # type: (legacy_filter.FilterList, Text) -> legacy_filter.FilterList
+    groups = _groups(f)
+    if groups is None:
+        return f
+    groups, changed = optimize_groups(groups, id_field)
+    if not changed:
+        return f
+    return _new_filter_list(_items(groups))
+
+
+def shard_list(f, max_in_size=MAX_IN_SIZE):
+    # type: (legacy_filter.FilterList, int) -> List[legacy_filter.FilterList]
+    """Split filter list to filter lists that matches disjoint rows,
+    result union matches same rows as `f`.
+    """
+
+    groups = _groups(f)
+    shards = shard_groups(groups, max_in_size) if groups else None
+    if not shards:
+        return [f]
+    return [_new_filter_list(_items(i)) for i in shards]
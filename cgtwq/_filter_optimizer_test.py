@@ -0,0 +1,127 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List
+
+import itertools
+import uuid
+
+import pytest
+
+from ._field_sign import FieldSign
+from ._filter import Filter
+from ._filter_eval import compile_filter
+from ._filter_optimizer import optimize, optimize_list, shard, shard_list
+from .filter import Field, FilterList
+
+A = FieldSign("shot.entity")
+B = FieldSign("shot.status")
+ID = FieldSign("shot.id")
+_IDS = [str(uuid.UUID(int=i)) for i in range(3)]
+
+_CASES = [
+    (A.equal("a").or_(A.equal("b")), [["shot.entity", "in", ["a", "b"]]]),
+    (
+        A.equal("a").or_(B.equal("x")).or_(A.in_(["b", "a"])),
+        [["shot.entity", "in", ["a", "b"]], "or", ["shot.status", "=", "x"]],
+    ),
+    (A.equal("a").or_(A.equal("a")), [["shot.entity", "=", "a"]]),
+    (
+        A.equal("a").and_(B.equal("x")).or_(B.equal("x").and_(A.equal("a"))),
+        [["shot.entity", "=", "a"], "and", ["shot.status", "=", "x"]],
+    ),
+    (
+        A.equal("a").and_(A.equal("a")).and_(ID.has("%")),
+        [["shot.entity", "=", "a"]],
+    ),
+    (A.equal("a").or_(ID.has("%")), [["shot.id", "has", "%"]]),
+    (ID.has("%").and_(ID.has("%")), [["shot.id", "has", "%"]]),
+    (A.equal("a").and_(FieldSign("#id").has("%")), [["shot.entity", "=", "a"]]),
+    # joined module id may be null.
+    (
+        A.equal("a").and_(FieldSign("eps.id").has("%")),
+        [["shot.entity", "=", "a"], "and", ["eps.id", "has", "%"]],
+    ),
+    (
+        ID.has(_IDS[0]).or_(ID.has(_IDS[1])),
+        [["shot.id", "in", _IDS[:2]]],
+    ),
+    # substring match is not equality.
+    (
+        A.has("a").or_(A.has("b")),
+        [["shot.entity", "has", "a"], "or", ["shot.entity", "has", "b"]],
+    ),
+    # `and` binds tighter than `or`.
+    (
+        A.equal("a").and_(B.equal("x")).or_(A.equal("b")),
+        [
+            ["shot.entity", "=", "a"],
+            "and",
+            ["shot.status", "=", "x"],
+            "or",
+            ["shot.entity", "=", "b"],
+        ],
+    ),
+]
+
+_ROWS = [
+    {"shot.entity": a, "shot.status": b, "shot.id": c, "#id": c, "eps.id": d}
+    for a, b, c, d in itertools.product(
+        ["a", "b", "ab", ""], ["x", "y"], _IDS, [_IDS[0], None]
+    )
+]  # type: List[Dict[str, Any]]
+
+
+@pytest.mark.parametrize("filter_by,expected", _CASES)
+def test_optimize(filter_by, expected):
+    # type: (Filter, List[Any]) -> None
+    ret = optimize(filter_by, "shot.id")
+    assert ret.as_payload() == expected
+    test, expected_test = compile_filter(ret), compile_filter(filter_by)
+    assert [test(i) for i in _ROWS] == [expected_test(i) for i in _ROWS]
+
+
+def test_optimize_unchanged():
+    f = A.equal("a").or_(B.equal("x"))
+    assert optimize(f) is f
+    f = A.equal("a").and_(ID.has("%"))
+    assert optimize(f) is f
+    f = Filter("shot.entity", "=", "a").chain("xor", B.equal("x"))
+    assert optimize(f) is f
+
+
+def test_shard():
+    values = ["%d" % i for i in range(10)] + ["0"]
+    f = A.in_(values).and_(B.equal("x"))
+    shards = shard(f, 4)
+    assert [i.as_payload() for i in shards] == [
+        [["shot.entity", "in", ["0", "1", "2", "3"]], "and", ["shot.status", "=", "x"]],
+        [["shot.entity", "in", ["4", "5", "6", "7"]], "and", ["shot.status", "=", "x"]],
+        [["shot.entity", "in", ["8", "9"]], "and", ["shot.status", "=", "x"]],
+    ]
+    assert shard(f, 11) == [f]
+    assert shard(f, 0) == [f]
+    # rows may match several `or` groups.
+    f = A.in_(values).or_(B.equal("x"))
+    assert shard(f, 4) == [f]
+
+
+def test_legacy():
+    fl = FilterList(Field("#link_id").has("x")) | Field("#link_id").has("x")
+    fl = fl | (Field("shot.entity") == "a") | (Field("shot.entity") == "b")
+    assert optimize_list(fl) == [
+        ["#link_id", "has", "x"],
+        "or",
+        ["shot.entity", "in", ["a", "b"]],
+    ]
+    assert isinstance(optimize_list(fl), FilterList)
+    fl = FilterList(Field("shot.entity") == "a")
+    assert optimize_list(fl) is fl
+    assert shard_list(FilterList(Field("shot.entity").in_(["a", "b", "c"])), 2) == [
+        [["shot.entity", "in", ["a", "b"]]],
+        [["shot.entity", "in", ["c"]]],
+    ]
@@ -0,0 +1,120 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""Translate `Filter` to SQL where clause.
+
+Connection should have `PRAGMA case_sensitive_like = ON`,
+so `LIKE` matches case like server does and can use index,
+and functions from `register_functions`.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, List, Tuple, Callable, Optional
+    import sqlite3
+
+from ._filter import Filter
+from ._util import text_type
+
+
+def quote_identifier(s):
+    # type: (Text) -> Text
+    return '"%s"' % s.replace('"', '""')
+
+
+def escape_like(s):
+    # type: (Text) -> Text
+    return s.replace("\\", "\\\\").replace("_", "\\_")
+
+
+def fold_case(v):
+    # type: (Any) -> Optional[Text]
+    """Fold case for `~` operators, same as `_filter_eval` does.
+
+    SQLite `NOCASE` and `lower()` only fold ASCII characters.
+    """
+
+    if v is None:
+        return None
+    return text_type(v).lower()
+
+
+def register_functions(conn):
+    # type: (sqlite3.Connection) -> None
+    """Register functions used by translated SQL on connection."""
+
+    conn.create_function("fold_case", 1, fold_case)
+
+
+def like_pattern(s):
+    # type: (Text) -> Text
+    """Convert `concat` pattern to SQL `LIKE` pattern,
+    `%` match zero or many character, `-` match one character.
+    """
+
+    return escape_like(s).replace("-", "_")
+
+
+def _condition(column, op, value):
+    # type: (Text, Text, Any) -> Tuple[Text, List[Any]]
+    if op in ("=", "!=", "<", "<=", ">", ">="):
+        return "%s %s ?" % (column, op), [value]
+    if op == "~":
+        return "fold_case(%s) = ?" % (column,), [fold_case(value)]
+    if op == "is":
+        return "%s IS ?" % (column,), [value]
+    if op == "in":
+        if isinstance(value, (str, text_type)):
+            value = [value]
+        value = list(value)
+        if not value:
+            return "0", []
+        return "%s IN (%s)" % (column, ", ".join("?" * len(value))), value
+    # Substring operators escape `_` like `start` and `end`.
+    if op == "has":
+        return "%s LIKE ? ESCAPE '\\'" % (column,), ["%" + escape_like(value) + "%"]
+    if op == "!has":
+        return "%s NOT LIKE ? ESCAPE '\\'" % (column,), ["%" + escape_like(value) + "%"]
+    if op == "~has":
+        return "fold_case(%s) LIKE ? ESCAPE '\\'" % (column,), [
+            "%" + escape_like(fold_case(value) or "") + "%"
+        ]
+    if op == "concat":
+        return "%s LIKE ? ESCAPE '\\'" % (column,), [like_pattern(value)]
+    if op == "!concat":
+        return "%s NOT LIKE ? ESCAPE '\\'" % (column,), [like_pattern(value)]
+    if op == "start":
+        return "%s LIKE ? ESCAPE '\\'" % (column,), [escape_like(value) + "%"]
+    if op == "end":
+        return "%s LIKE ? ESCAPE '\\'" % (column,), ["%" + escape_like(value)]
+    raise ValueError("unsupported filter operator: %s" % (op,))
+
+
+def filter_to_sql(filter_by, column=quote_identifier):
+    # type: (Filter, Callable[[Text], Text]) -> Tuple[Text, List[Any]]
+    """Translate filter chain to SQL where clause.
+
+    Args:
+        filter_by (Filter): Filter to translate.
+        column (Callable[[Text], Text], optional): Map field to SQL column,
+            raise `ValueError` for unknown field.
+
+    Returns:
+        Tuple[Text, List[Any]]: SQL expression and parameters.
+    """
+
+    parts = []  # type: List[Text]
+    params = []  # type: List[Any]
+    for i in filter_by.items():
+        if not isinstance(i, tuple):
+            if i not in ("and", "or"):
+                raise ValueError("unsupported filter logic: %s" % (i,))
+            # `and` binds tighter than `or` in SQL, same as server.
+            parts.append(i.upper())
+            continue
+        left, op, right = i
+        sql, args = _condition(column(left), op, right)
+        parts.append(sql)
+        params.extend(args)
+    return " ".join(parts), params
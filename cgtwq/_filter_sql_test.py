@@ -0,0 +1,88 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Text
+
+import sqlite3
+
+import pytest
+
+from ._field_sign import FieldSign
+from ._filter import Filter
+from ._filter_sql import filter_to_sql, like_pattern, register_functions
+
+_NAMES = ["sc001_a", "SC001_B", "sc002", "sc0x1", "", "shot_100%"]
+
+
+def _select(filter_by, names=_NAMES):
+    # type: (Filter, List[Text]) -> List[Text]
+    conn = sqlite3.connect(":memory:")
+    conn.execute("PRAGMA case_sensitive_like = ON")
+    register_functions(conn)
+    conn.execute('CREATE TABLE data ("shot.entity")')
+    conn.executemany("INSERT INTO data VALUES (?)", [(i,) for i in names])
+    where, args = filter_to_sql(filter_by)
+    return [i for (i,) in conn.execute("SELECT * FROM data WHERE " + where, args)]
+
+
+F = FieldSign("shot.entity")
+
+
+@pytest.mark.parametrize(
+    "filter_by,expected",
+    [
+        (F.equal("sc002"), ["sc002"]),
+        (F.not_equal(""), [i for i in _NAMES if i]),
+        (F.equal_ignore_case("sc001_b"), ["SC001_B"]),
+        (F.has("001"), ["sc001_a", "SC001_B"]),
+        (F.has("c0_1"), []),
+        (F.has("1_"), ["sc001_a", "SC001_B"]),
+        (F.not_has("sc"), ["SC001_B", "", "shot_100%"]),
+        (F.has_ignore_case("sc001"), ["sc001_a", "SC001_B"]),
+        (F.like("sc0-1%"), ["sc001_a", "sc0x1"]),
+        (F.not_like("sc%"), ["SC001_B", "", "shot_100%"]),
+        (F.starts_with("shot_"), ["shot_100%"]),
+        (F.ends_with("_a"), ["sc001_a"]),
+        (F.in_(["sc002", "sc0x1"]), ["sc002", "sc0x1"]),
+        (F.in_([]), []),
+        (F.greater_than("sc002"), ["sc0x1", "shot_100%"]),
+        (F.less_equal_than("SC001_B"), ["SC001_B", ""]),
+        (F.equal("sc002").or_(F.has("x")).and_(F.has("1")), ["sc002", "sc0x1"]),
+        (F.equal("sc002").and_(F.has("x")).or_(F.has("_a")), ["sc001_a"]),
+    ],
+)
+def test_filter_to_sql(filter_by, expected):
+    # type: (Filter, List[Text]) -> None
+    assert _select(filter_by) == expected
+
+
+def test_like_pattern():
+    assert like_pattern("a_b-%") == "a\\_b_%"
+
+
+def test_unsupported():
+    with pytest.raises(ValueError):
+        filter_to_sql(Filter("a", "unknown", 1))
+    with pytest.raises(ValueError):
+        filter_to_sql(Filter("a", "=", 1).chain("xor", Filter("b", "=", 2)))
+
+
+_UNICODE_NAMES = ["Ärger", "ärger", "ÉCOLE_1", "école_1", "ecole"]
+
+
+@pytest.mark.parametrize(
+    "filter_by,expected",
+    [
+        (F.equal_ignore_case("ärger"), ["Ärger", "ärger"]),
+        (F.has_ignore_case("cole_"), ["ÉCOLE_1", "école_1"]),
+        (F.has_ignore_case("ÉCOLE"), ["ÉCOLE_1", "école_1"]),
+        (F.has("É"), ["ÉCOLE_1"]),
+    ],
+)
+def test_fold_case_unicode(filter_by, expected):
+    # type: (Filter, List[Text]) -> None
+    assert _select(filter_by, _UNICODE_NAMES) == expected
@@ -0,0 +1,65 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import pytest
+
+from ._field_sign import FieldSign
+from ._filter import Filter
+
+
+def test_payload():
+    a = FieldSign("a").equal("1")
+    b = FieldSign("b").in_(["2", "3"])
+    c = FieldSign("c").has("%4%")
+    f = a.and_(b.or_(c))
+    assert f.as_payload() == [
+        ["a", "=", "1"],
+        "and",
+        ["b", "in", ["2", "3"]],
+        "or",
+        ["c", "has", "%4%"],
+    ]
+    assert f.as_payload() is f.as_payload()
+    # operands are not changed.
+    assert a.as_payload() == [["a", "=", "1"]]
+    assert b.or_(c).as_payload() == [["b", "in", ["2", "3"]], "or", ["c", "has", "%4%"]]
+
+
+def test_chain_to():
+    f = FieldSign("a").equal("1").and_(FieldSign("b").equal("2"))
+    f = f.or_(FieldSign("c").equal("3"))
+    assert (f.left, f.op, f.right, f.chain_logic) == ("a", "=", "1", "and")
+    rest = f.chain_to
+    assert rest
+    assert (rest.left, rest.chain_logic) == ("b", "or")
+    last = rest.chain_to
+    assert last
+    assert (last.left, last.chain_logic, last.chain_to) == ("c", "", None)
+
+
+def test_long_chain():
+    length = 100000
+    f = FieldSign("id").equal("0")
+    for i in range(1, length):
+        f = f.or_(FieldSign("id").equal("%d" % i))
+    payload = f.as_payload()
+    assert len(payload) == length * 2 - 1
+    assert payload[-1] == ["id", "=", "%d" % (length - 1)]
+
+
+def test_all_of_any_of():
+    filters = [FieldSign("id").equal("%d" % i) for i in range(3)]
+    assert Filter.any_of(filters).as_payload() == (
+        filters[0].or_(filters[1]).or_(filters[2]).as_payload()
+    )
+    assert Filter.all_of([Filter.any_of(filters[:2]), filters[2]]).as_payload() == [
+        ["id", "=", "0"],
+        "or",
+        ["id", "=", "1"],
+        "and",
+        ["id", "=", "2"],
+    ]
+    with pytest.raises(ValueError):
+        Filter.any_of([])
@@ -5,16 +5,24 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from typing import Any, Text, Dict, Optional
+    from typing import Any, Text, Dict, List, Optional, Iterator, Callable, Union
+    from ._transport import Transport, Response
+    from ._json_codec import JSONCodec
 
-from collections import OrderedDict
-
-import requests
-import json
 from . import exceptions
 
+from . import _instrumentation
+from ._instrumentation import CallRecord
+from ._json_codec import DEFAULT_JSON_CODEC, JSONEncoder
+from ._json_stream import iter_data
+from ._lazy import Lazy
+from ._rate_limiter import DEFAULT_RATE_LIMITER
+from ._request_policy import DEFAULT_REQUEST_POLICY
+from ._response_cache import DEFAULT_RESPONSE_CACHE, CachedResponse, tag_of
+from ._singleflight import DEFAULT_SINGLEFLIGHT
 from ._util import cast_text
 from ._user_token import UserToken
+from ._transport_impl import get_transport
 
 import logging
 
@@ -45,48 +53,148 @@ def _raise_error(result):
     raise CGTeamworkError(cast_text(data))
 
 
+class HTTPStatusError(RuntimeError):
+    def __init__(self, status_code):
+        # type: (int) -> None
+        super(HTTPStatusError, self).__init__(
+            "cgteamwork response status %d" % status_code
+        )
+        self.status_code = status_code
+
+
 class HTTPResponse:
-    def __init__(self, raw):
-        # type: (requests.Response) -> None
+    def __init__(self, raw, record=None, codec=DEFAULT_JSON_CODEC):
+        # type: (Response, Optional[CallRecord], JSONCodec) -> None
+        self._record = record
+        self._codec = codec
+        if record:
+            record.status = raw.status_code
         if raw.status_code != 200:  # type: ignore
-            raise RuntimeError("cgteamwork response status %d" % raw.status_code)
+            err = HTTPStatusError(raw.status_code)
+            if record:
+                record.finish(error=err)
+            raise err
         self.raw = raw
+        self._streamed_length = -1
+        # called with response body after successfully decoded by `json`.
+        self.on_json = None  # type: Optional[Callable[[bytes], None]]
+
+    def __del__(self):
+        # record without decoding, e.g. only headers used.
+        record = getattr(self, "_record", None)
+        if record:
+            record.finish()
+
+    def content_length(self):
+        # type: () -> int
+        if self._streamed_length >= 0:
+            return self._streamed_length
+        return len(self.raw.content)
+
+    def _iter_content(self, chunk_size):
+        # type: (int) -> Iterator[bytes]
+        self._streamed_length = 0
+        for i in self.raw.iter_content(chunk_size):
+            self._streamed_length += len(i)
+            yield i
+
+    def iter_data(self, chunk_size=64 << 10):
+        # type: (int) -> Iterator[Any]
+        """Decode items of `data` array while receiving,
+        requires response of `stream=True` request.
+
+        Error envelope is raised before first item when `code` precedes `data`,
+        otherwise after last item.
+        """
+
+        count = 0
+        err = None  # type: Optional[BaseException]
+        try:
+            for i in iter_data(self._iter_content(chunk_size), _raise_error):
+                count += 1
+                yield i
+        except Exception as ex:
+            err = ex
+            raise
+        finally:
+            self.raw.close()
+            if self._record:
+                self._record.finish(self._streamed_length, count, err)
 
     def json(self):
         # type: () -> Any
-        data = self.raw.json()  # type: ignore
-        _raise_error(data)
-        if not isinstance(data, dict):
-            return data
-        return data.get("data", data)  # type: ignore
-
-
-class JSONEncoder(json.JSONEncoder):
-    def default(
-        self,
-        o,
-    ):
-        # type: (Any, Any) -> Any
-        method = getattr(o, "as_payload", None)
-        if callable(method):
-            return method()
-        if isinstance(o, set):
-            return list(o)  # type: ignore
-        if isinstance(o, OrderedDict):
-            return dict(o)  # type: ignore
-        return super(JSONEncoder, self).default(o)  # type: ignore
+        try:
+            data = self._codec.decode(self.raw.content)
+            _raise_error(data)
+        except Exception as ex:
+            if self._record:
+                self._record.finish(len(self.raw.content), error=ex)
+            raise
+        if isinstance(data, dict):
+            data = data.get("data", data)  # type: ignore
+        if self._record:
+            self._record.finish(
+                len(self.raw.content),
+                len(data) if isinstance(data, list) else -1,  # type: ignore
+            )
+        if self.on_json:
+            self.on_json(self.raw.content)
+        return data  # type: ignore
 
 
 class HTTPClient:
-    def __init__(self, url):
-        # type: (Text) -> None
-        self._url = url
-        self._session = requests.Session()
-        self.token = UserToken("", "")
-        self._encoder = JSONEncoder()
+    def __init__(self, url, transport=None):
+        # type: (Union[Text, Lazy], Optional[Transport]) -> None
+        """
+        Args:
+            url (Union[Text, Lazy]): Server url, `Lazy` is resolved on first use.
+            transport (Optional[Transport], optional): Defaults to shared
+                transport of the url.
+        """
+        self._lazy_url = url
+        self._transport_value = transport
+        self._token = UserToken("", "")
+        # resolved on first use of `token`, set `token` to discard.
+        self.lazy_token = None  # type: Optional[Lazy]
+        self.json_codec = DEFAULT_JSON_CODEC
+        self.request_policy = DEFAULT_REQUEST_POLICY
+        self.rate_limiter = DEFAULT_RATE_LIMITER
+        # set to None to disable.
+        self.response_cache = DEFAULT_RESPONSE_CACHE
+        # share in-flight identical read-only call between threads,
+        # set to None to disable.
+        self.singleflight = DEFAULT_SINGLEFLIGHT
+        # compat level for instrumentation, set by client.
+        self.compat_level = 0
 
-    def __del__(self):
-        self._session.close()
+    @property
+    def _url(self):
+        # type: () -> Text
+        if isinstance(self._lazy_url, Lazy):
+            self._lazy_url = self._lazy_url.get()  # type: Text
+        return self._lazy_url
+
+    @property
+    def _transport(self):
+        # type: () -> Transport
+        if self._transport_value is None:
+            self._transport_value = get_transport(self._url)
+        return self._transport_value
+
+    @property
+    def token(self):
+        # type: () -> UserToken
+        lazy = self.lazy_token
+        if lazy is not None:
+            self._token = lazy.get()
+            self.lazy_token = None
+        return self._token
+
+    @token.setter
+    def token(self, v):
+        # type: (UserToken) -> None
+        self.lazy_token = None
+        self._token = v
 
     def _build_url(self, pathname):
         # type: (Text) -> Text
@@ -99,33 +207,65 @@ class HTTPClient:
     def post(self, pathname, data, **kwargs):
         # type: (Text, Optional[Dict[Text, Any]],  *Any) -> HTTPResponse
         assert "data" not in kwargs
-        if data is not None:
+        if data is None:
+            return self._post(pathname, pathname, "", None, **kwargs)
+        return self._post(
+            pathname,
+            data.get("controller") or pathname,
+            data.get("method") or "",
+            self.json_codec.encode(data),
+            **kwargs
+        )
+
+    def _post(self, pathname, controller, method, body, **kwargs):
+        # type: (Text, Text, Text, Optional[Text], *Any) -> HTTPResponse
+        data = None
+        if body is not None:
             data = {
-                "data": self._encoder.encode(data),
+                "data": body,
             }
         url = self._build_url(pathname)
         _LOGGER.debug("will request: POST %s: %s", url, data)
-        return HTTPResponse(
-            self._session.post(  # type: ignore
+        record = None
+        if _instrumentation.is_enabled():
+            record = CallRecord(
+                url,
+                controller,
+                method,
+                self.compat_level,
+                len(body.encode("utf-8")) if body else 0,
+            )
+        with self.rate_limiter.acquire(controller):
+            return self._send(
+                record,
+                "POST",
                 url,
                 data=data,
                 cookies={"token": self.token.raw},
                 verify=False,
                 **kwargs
             )
-        )
 
     def get(self, pathname, **kwargs):
         # type: (Text,  *Any) -> HTTPResponse
 
-        return HTTPResponse(
-            self._session.get(  # type: ignore
-                self._build_url(pathname),
-                cookies={"token": self.token.raw},
-                verify=False,
-                **kwargs
-            )  # type: ignore
-        )
+        url = self._build_url(pathname)
+        record = None
+        if _instrumentation.is_enabled():
+            record = CallRecord(url, pathname, "", self.compat_level, 0)
+        if "cookies" not in kwargs:
+            kwargs["cookies"] = {"token": self.token.raw}
+        return self._send(record, "GET", url, verify=False, **kwargs)
+
+    def _send(self, record, method, url, **kwargs):
+        # type: (Optional[CallRecord], Text, Text, *Any) -> HTTPResponse
+        try:
+            raw = self._transport.request(method, url, **kwargs)
+        except Exception as ex:
+            if record:
+                record.finish(error=ex)
+            raise
+        return HTTPResponse(raw, record, self.json_codec)
 
     def call(self, controller, method, **data):
         # type: (Text, Text, *Any) -> HTTPResponse
@@ -135,4 +275,74 @@ class HTTPClient:
         data["controller"] = controller
         data["method"] = method
 
-        return self.post("api.php", data)
+        policy = self.request_policy
+        cache = self.response_cache
+        if not policy.is_read_only(controller, method):
+            try:
+                return policy.run(
+                    controller, method, lambda: self.post("api.php", data)
+                )
+            finally:
+                if cache:
+                    cache.invalidate(tag_of(self._url, data))
+
+        body = self.json_codec.encode(data)
+        user = self.token.user_id or self.token.raw
+
+        def _send():
+            # type: () -> HTTPResponse
+            return policy.run(
+                controller,
+                method,
+                lambda: self._post("api.php", controller, method, body),
+            )
+
+        key = (self._url, user, body)
+        send = _send
+        if self.singleflight:
+            singleflight = self.singleflight
+
+            def _send_shared():
+                # type: () -> HTTPResponse
+                owned = []  # type: List[HTTPResponse]
+
+                def _send_owned():
+                    # type: () -> HTTPResponse
+                    resp = _send()
+                    owned.append(resp)
+                    return resp
+
+                resp = singleflight.do(key, _send_owned)
+                if owned:
+                    return resp
+                # waiter gets own response, call is recorded by owner only.
+                return HTTPResponse(resp.raw, codec=self.json_codec)
+
+            send = _send_shared
+
+        ttl = cache.ttl_of(controller, method) if cache else 0
+        if not cache or ttl <= 0:
+            return send()
+        content = cache.get(key)
+        if content is not None:
+            return HTTPResponse(CachedResponse(content), codec=self.json_codec)
+        resp = send()
+        resp.on_json = lambda content: cache.put(
+            key, tag_of(self._url, data), content, ttl
+        )
+        return resp
+
+    def call_stream(self, controller, method, **data):
+        # type: (Text, Text, *Any) -> HTTPResponse
+        """Call controller method, response body is read by `HTTPResponse.iter_data`."""
+
+        data.setdefault("app", "api")
+        data["controller"] = controller
+        data["method"] = method
+
+        return self.request_policy.run(
+            controller,
+            method,
+            lambda: self.post("api.php", data, stream=True),
+            can_hedge=False,
+        )
@@ -0,0 +1,265 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""Per-call records of HTTP requests, sent to registered sinks.
+
+Nothing is measured when no sink is registered.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, Callable, Dict, List, Optional, Sequence, Tuple
+
+    Sink = Callable[["CallRecord"], None]
+
+import bisect
+import logging
+import threading
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+_SINKS = ()  # type: Tuple[Sink, ...]
+_SINKS_LOCK = threading.Lock()
+
+
+def add_sink(sink):
+    # type: (Sink) -> None
+    """Receive `CallRecord` of every request,
+    sink is called in the requesting thread and should be fast.
+    """
+
+    global _SINKS
+    with _SINKS_LOCK:
+        _SINKS = _SINKS + (sink,)
+
+
+def remove_sink(sink):
+    # type: (Sink) -> None
+    global _SINKS
+    with _SINKS_LOCK:
+        _SINKS = tuple(i for i in _SINKS if i != sink)
+
+
+class CallRecord(object):
+    """Measurement of one request.
+
+    `rows` is -1 when response data is not a list or not decoded,
+    `status` is 0 when no response received.
+    """
+
+    __slots__ = (
+        "url",
+        "controller",
+        "method",
+        "level",
+        "request_bytes",
+        "response_bytes",
+        "rows",
+        "status",
+        "elapsed",
+        "error",
+        "_started_at",
+        "_is_finished",
+    )
+
+    def __init__(self, url, controller, method, level, request_bytes):
+        # type: (Text, Text, Text, int, int) -> None
+        self.url = url
+        self.controller = controller
+        self.method = method
+        self.level = level
+        self.request_bytes = request_bytes
+        self.response_bytes = -1
+        self.rows = -1
+        self.status = 0
+        self.elapsed = 0.0
+        self.error = None  # type: Optional[BaseException]
+        self._started_at = time.time()
+        self._is_finished = False
+
+    def finish(self, response_bytes=-1, rows=-1, error=None):
+        # type: (int, int, Optional[BaseException]) -> None
+        """Send record to sinks, only the first call takes effect."""
+
+        if self._is_finished:
+            return
+        self._is_finished = True
+        self.elapsed = time.time() - self._started_at
+        self.response_bytes = response_bytes
+        self.rows = rows
+        self.error = error
+        for sink in _SINKS:
+            try:
+                sink(self)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("instrumentation sink failed: %r", sink)
+
+
+def is_enabled():
+    # type: () -> bool
+    """Whether any sink registered, callers skip measuring when disabled."""
+
+    return bool(_SINKS)
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class _Histogram(object):
+    def __init__(self, buckets):
+        # type: (Sequence[float]) -> None
+        self.buckets = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.errors = 0
+        self.rows = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+class HistogramSink:
+    """Aggregate latency histogram and payload totals
+    by (controller, method).
+
+    Args:
+        buckets (Sequence[float], optional): Upper bounds of latency buckets
+            in seconds, ascending.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        # type: (Sequence[float]) -> None
+        self.bounds = tuple(buckets)
+        self._data = {}  # type: Dict[Tuple[Text, Text], _Histogram]
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        # type: (CallRecord) -> None
+        key = (record.controller, record.method)
+        with self._lock:
+            h = self._data.get(key)
+            if h is None:
+                h = self._data[key] = _Histogram(self.bounds)
+            h.buckets[bisect.bisect_left(self.bounds, record.elapsed)] += 1
+            h.count += 1
+            h.sum += record.elapsed
+            if record.error is not None:
+                h.errors += 1
+            h.rows += max(record.rows, 0)
+            h.request_bytes += max(record.request_bytes, 0)
+            h.response_bytes += max(record.response_bytes, 0)
+
+    def snapshot(self):
+        # type: () -> Dict[Tuple[Text, Text], Dict[Text, Any]]
+        """Aggregated values by (controller, method).
+
+        Returns:
+            Dict[Tuple[Text, Text], Dict[Text, Any]]: `buckets` is
+                non-cumulative count per bucket, last one is overflow.
+        """
+
+        with self._lock:
+            return {
+                k: {
+                    "buckets": list(v.buckets),
+                    "count": v.count,
+                    "sum": v.sum,
+                    "errors": v.errors,
+                    "rows": v.rows,
+                    "request_bytes": v.request_bytes,
+                    "response_bytes": v.response_bytes,
+                }
+                for k, v in self._data.items()
+            }
+
+    def prometheus_text(self, prefix="cgtwq_call"):
+        # type: (Text) -> Text
+        """Export in Prometheus text exposition format."""
+
+        def _labels(key, *extra):
+            # type: (Tuple[Text, Text], Tuple[Text, Text]) -> Text
+            pairs = (("controller", key[0]), ("method", key[1])) + extra
+            return ",".join(
+                '%s="%s"'
+                % (
+                    k,
+                    v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+                )
+                for k, v in pairs
+            )
+
+        snapshot = sorted(self.snapshot().items())
+        lines = [
+            "# HELP %s_duration_seconds Call wall time." % prefix,
+            "# TYPE %s_duration_seconds histogram" % prefix,
+        ]  # type: List[Text]
+        for key, v in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), v["buckets"]):
+                cumulative += count
+                lines.append(
+                    "%s_duration_seconds_bucket{%s} %d"
+                    % (
+                        prefix,
+                        _labels(
+                            key,
+                            (
+                                "le",
+                                "+Inf" if bound == float("inf") else repr(float(bound)),
+                            ),
+                        ),
+                        cumulative,
+                    )
+                )
+            lines.append(
+                "%s_duration_seconds_sum{%s} %r" % (prefix, _labels(key), v["sum"])
+            )
+            lines.append(
+                "%s_duration_seconds_count{%s} %d" % (prefix, _labels(key), v["count"])
+            )
+        for name, field, help_ in (
+            ("errors_total", "errors", "Failed calls."),
+            ("rows_total", "rows", "Rows returned."),
+            ("request_bytes_total", "request_bytes", "Request body bytes."),
+            ("response_bytes_total", "response_bytes", "Response body bytes."),
+        ):
+            lines.append("# HELP %s_%s %s" % (prefix, name, help_))
+            lines.append("# TYPE %s_%s counter" % (prefix, name))
+            for key, v in snapshot:
+                lines.append("%s_%s{%s} %d" % (prefix, name, _labels(key), v[field]))
+        return "\n".join(lines) + "\n"
+
+
+class SlowCallSink:
+    """Log calls slower than threshold.
+
+    Args:
+        threshold (float, optional): Seconds.
+        logger (logging.Logger, optional): Defaults to logger of this module.
+        level (int, optional): Log level.
+    """
+
+    def __init__(self, threshold=1.0, logger=None, level=logging.WARNING):
+        # type: (float, Optional[logging.Logger], int) -> None
+        self.threshold = threshold
+        self.logger = logger or _LOGGER
+        self.level = level
+
+    def __call__(self, record):
+        # type: (CallRecord) -> None
+        if record.elapsed < self.threshold:
+            return
+        self.logger.log(
+            self.level,
+            "slow call: %s %s.%s: %.3fs, status=%d, request=%dB, response=%dB, rows=%d%s",
+            record.url,
+            record.controller,
+            record.method,
+            record.elapsed,
+            record.status,
+            record.request_bytes,
+            record.response_bytes,
+            record.rows,
+            ", error=%r" % (record.error,) if record.error is not None else "",
+        )
@@ -0,0 +1,144 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List, Text
+
+import logging
+
+import pytest
+
+from . import compat, core, server
+from ._compat_service import CompatService
+from ._fake_transport import FakeTransport
+from ._http_client import CGTeamworkError, HTTPClient
+from ._instrumentation import (
+    CallRecord,
+    HistogramSink,
+    SlowCallSink,
+    add_sink,
+    is_enabled,
+    remove_sink,
+)
+
+
+@pytest.fixture
+def records():  # type: ignore
+    ret = []  # type: List[CallRecord]
+    add_sink(ret.append)
+    yield ret
+    remove_sink(ret.append)
+    assert not is_enabled()
+
+
+def test_http_client(records):
+    # type: (List[CallRecord]) -> None
+    http = HTTPClient(
+        "http://127.0.0.1:8080",
+        FakeTransport(lambda _: {"code": "1", "data": [[1], [2], [3]]}),
+    )
+    http.compat_level = 3
+    assert len(http.call("task", "get_filter", limit="10").json()) == 3
+    (record,) = records
+    assert (record.controller, record.method, record.level) == (
+        "task",
+        "get_filter",
+        3,
+    )
+    assert record.url == "http://127.0.0.1:8080/api.php"
+    assert record.status == 200
+    assert record.rows == 3
+    assert record.request_bytes > 0
+    assert record.response_bytes == len(b'{"code": "1", "data": [[1], [2], [3]]}')
+    assert record.elapsed >= 0
+    assert record.error is None
+
+
+def test_http_client_error(records):
+    # type: (List[CallRecord]) -> None
+    http = HTTPClient(
+        "http://127.0.0.1:8080",
+        FakeTransport(lambda _: {"code": "2", "data": "error"}),
+    )
+    with pytest.raises(CGTeamworkError):
+        http.call("task", "set").json()
+    http = HTTPClient("http://127.0.0.1:8080", FakeTransport(lambda _: {}, 500))
+    with pytest.raises(RuntimeError):
+        http.call("task", "set")
+    assert [i.status for i in records] == [200, 500]
+    assert isinstance(records[0].error, CGTeamworkError)
+    assert isinstance(records[1].error, RuntimeError)
+
+
+def test_legacy(records, monkeypatch):
+    # type: (List[CallRecord], Any) -> None
+    from . import _transport_impl
+
+    monkeypatch.setitem(
+        _transport_impl._TRANSPORTS,  # type: ignore
+        _transport_impl._origin(core.CONFIG["URL"]),  # type: ignore
+        FakeTransport(lambda _: {"code": "1", "data": [1, 2]}),
+    )
+    monkeypatch.setitem(core.CONFIG, "API_VERSION", "")
+    monkeypatch.setitem(
+        compat._API_LEVEL_CACHE,  # type: ignore
+        core.CONFIG["URL"],
+        compat.API_LEVEL_5_2,
+    )
+    assert compat.detected_api_level() == compat.API_LEVEL_5_2
+    assert server.http.call("c_orm", "get_with_filter", "token") == [1, 2]
+    (record,) = records
+    assert (record.controller, record.method, record.rows, record.level) == (
+        "c_orm",
+        "get_with_filter",
+        2,
+        CompatService.LEVEL_5_2,
+    )
+
+
+def _record(controller, method, elapsed, error=None):
+    # type: (Text, Text, float, Any) -> CallRecord
+    ret = CallRecord("http://x/api.php", controller, method, 0, 10)
+    ret.finish(100, 2, error)
+    ret.elapsed = elapsed
+    return ret
+
+
+def test_histogram():
+    sink = HistogramSink(buckets=(0.1, 1))
+    for i in (0.05, 0.5, 0.5, 5):
+        sink(_record("task", "get_filter", i))
+    sink(_record("task", "set", 0.01, RuntimeError()))
+    snapshot = sink.snapshot()
+    assert snapshot[("task", "get_filter")]["buckets"] == [1, 2, 1]
+    assert snapshot[("task", "get_filter")]["count"] == 4
+    assert snapshot[("task", "get_filter")]["rows"] == 8
+    assert snapshot[("task", "set")]["errors"] == 1
+    text = sink.prometheus_text()
+    assert "# TYPE cgtwq_call_duration_seconds histogram" in text
+    assert (
+        'cgtwq_call_duration_seconds_bucket{controller="task",method="get_filter",le="1.0"} 3'
+        in text
+    )
+    assert (
+        'cgtwq_call_duration_seconds_bucket{controller="task",method="get_filter",le="+Inf"} 4'
+        in text
+    )
+    assert 'cgtwq_call_errors_total{controller="task",method="set"} 1' in text
+    assert (
+        'cgtwq_call_response_bytes_total{controller="task",method="get_filter"} 400'
+        in text
+    )
+
+
+def test_slow_call(caplog):
+    # type: (Any) -> None
+    sink = SlowCallSink(threshold=1)
+    with caplog.at_level(logging.WARNING):
+        sink(_record("task", "get_filter", 0.5))
+        sink(_record("task", "get_filter", 1.5))
+    assert len(caplog.records) == 1
+    assert "task.get_filter" in caplog.records[0].getMessage()
@@ -0,0 +1,210 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""JSON codec for request payload and response body.
+
+Uses `orjson` or `ujson` when installed, select with `CGTEAMWORK_JSON_CODEC`.
+All codecs escape non-ASCII characters same as `json`,
+encoded text only differs in whitespace.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, Union, Dict, Callable
+
+import json
+import os
+import re
+from collections import OrderedDict
+
+from ._util import PY2, binary_type, text_type
+
+_SCALAR_TYPES = frozenset(
+    (text_type, str, int, float, bool, type(None))
+    + ((long,) if PY2 else ())  # type: ignore
+)
+_INTEGER_TYPES = (int, long) if PY2 else (int,)  # type: ignore
+
+
+def _unchanged(items, o):
+    # type: (Any, Any) -> bool
+    return all(a is b for a, b in zip(items, o))
+
+
+def as_payload(o):
+    # type: (Any) -> Any
+    """Convert `o` to plain json types, same as `JSONEncoder` does.
+
+    Plain containers are returned as is when no item need conversion.
+    """
+
+    t = type(o)
+    if t in _SCALAR_TYPES:
+        return o
+    if t is list:
+        if set(map(type, o)) <= _SCALAR_TYPES:
+            return o
+        items = [as_payload(i) for i in o]  # type: ignore
+        return o if _unchanged(items, o) else items
+    if t is dict:
+        if set(map(type, o.values())) <= _SCALAR_TYPES:  # type: ignore
+            return o
+        values = [as_payload(i) for i in o.values()]  # type: ignore
+        if _unchanged(values, o.values()):  # type: ignore
+            return o
+        return dict(zip(o.keys(), values))  # type: ignore
+    if isinstance(o, text_type):
+        return text_type(o)
+    if isinstance(o, str):
+        return str(o)
+    if isinstance(o, float):
+        return float(o)
+    if isinstance(o, _INTEGER_TYPES):
+        return int(o)
+    if isinstance(o, dict):
+        return {k: as_payload(v) for k, v in o.items()}  # type: ignore
+    if isinstance(o, (list, tuple)):
+        return [as_payload(i) for i in o]  # type: ignore
+    method = getattr(o, "as_payload", None)
+    if callable(method):
+        return as_payload(method())
+    if isinstance(o, (set, frozenset)):
+        return [as_payload(i) for i in o]  # type: ignore
+    raise TypeError("object of type %s is not json serializable" % (t.__name__,))
+
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def _escape_char(match):
+    # type: (Any) -> Text
+    code = ord(match.group(0))
+    if code < 0x10000:
+        return "\\u%04x" % (code,)
+    code -= 0x10000
+    return "\\u%04x\\u%04x" % (0xD800 | (code >> 10), 0xDC00 | (code & 0x3FF))
+
+
+def _escape_non_ascii(s):
+    # type: (Text) -> Text
+    """Escape non-ASCII characters of json text, same as `ensure_ascii`.
+
+    Non-ASCII characters can only appear in strings of valid json text.
+    """
+
+    return _NON_ASCII.sub(_escape_char, s)
+
+
+def _text(b):
+    # type: (Union[bytes, Text]) -> Text
+    if isinstance(b, binary_type):
+        return b.decode("utf-8")
+    return b
+
+
+class JSONEncoder(json.JSONEncoder):
+    def default(
+        self,
+        o,
+    ):
+        # type: (Any, Any) -> Any
+        method = getattr(o, "as_payload", None)
+        if callable(method):
+            return method()
+        if isinstance(o, set):
+            return list(o)  # type: ignore
+        if isinstance(o, OrderedDict):
+            return dict(o)  # type: ignore
+        return super(JSONEncoder, self).default(o)  # type: ignore
+
+
+class JSONCodec(object):
+    """Standard library codec, payload objects are converted by `default` hook."""
+
+    name = "json"
+
+    def __init__(self):
+        self._encoder = JSONEncoder()
+
+    def encode(self, o):
+        # type: (Any) -> Text
+        return self._encoder.encode(o)
+
+    def decode(self, s):
+        # type: (Union[bytes, Text]) -> Any
+        return json.loads(_text(s))
+
+
+class OrjsonCodec(JSONCodec):
+    """`orjson` codec, payload objects are converted by `as_payload` pre-pass."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        super(OrjsonCodec, self).__init__()
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def encode(self, o):
+        # type: (Any) -> Text
+        return _escape_non_ascii(
+            self._dumps(as_payload(o), option=self._option).decode("utf-8")
+        )
+
+    def decode(self, s):
+        # type: (Union[bytes, Text]) -> Any
+        return self._loads(s)
+
+
+class UjsonCodec(JSONCodec):
+    """`ujson` codec, payload objects are converted by `as_payload` pre-pass."""
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson  # type: ignore
+
+        super(UjsonCodec, self).__init__()
+        self._dumps = ujson.dumps  # type: Callable[..., Text]
+        self._loads = ujson.loads  # type: Callable[[Any], Any]
+
+    def encode(self, o):
+        # type: (Any) -> Text
+        # escape non-ASCII same as `json` codec, request body stays ASCII.
+        return self._dumps(
+            as_payload(o), ensure_ascii=True, escape_forward_slashes=False
+        )
+
+    def decode(self, s):
+        # type: (Union[bytes, Text]) -> Any
+        return self._loads(s)
+
+
+CODECS = OrderedDict(
+    (
+        ("orjson", OrjsonCodec),
+        ("ujson", UjsonCodec),
+        ("json", JSONCodec),
+    )
+)  # type: OrderedDict[Text, Callable[[], JSONCodec]]
+
+
+def new_codec(name=""):
+    # type: (Text) -> JSONCodec
+    """Create codec by name, fastest installed one when name is empty."""
+
+    if name:
+        return CODECS[name]()
+    for factory in CODECS.values():
+        try:
+            return factory()
+        except ImportError:
+            pass
+    return JSONCodec()
+
+
+DEFAULT_JSON_CODEC = new_codec(os.getenv("CGTEAMWORK_JSON_CODEC", ""))
@@ -0,0 +1,82 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Text
+
+import json
+from collections import OrderedDict
+
+import pytest
+
+from ._field_sign import FieldSign
+from ._json_codec import CODECS, JSONEncoder, as_payload, new_codec
+from .filter import Field
+
+_PAYLOAD = {
+    "db": "proj_test",
+    "id_array": ["id-%d" % i for i in range(100)],
+    "sign_array": ("shot.entity", "shot.id"),
+    "sign_filter_array": FieldSign("shot.entity")
+    .in_(["sc001", "sc002"])
+    .and_(FieldSign("shot.id").has("1")),
+    "legacy_filter": (Field("shot.entity") == "sc001") | (Field("shot.id") == "1"),
+    "sign_data_array": OrderedDict((("shot.entity", "镜头"), ("shot.frame", 24))),
+    "set": set(["a"]),
+    "none": None,
+    "float": 1.5,
+}
+
+
+def _codec(name):
+    # type: (Text) -> ...
+    try:
+        return new_codec(name)
+    except ImportError:
+        pytest.skip("%s not installed" % (name,))
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_encode(name):
+    # type: (Text) -> None
+    codec = _codec(name)
+    expected = json.loads(JSONEncoder().encode(_PAYLOAD))
+    assert json.loads(codec.encode(_PAYLOAD)) == expected
+    assert codec.decode(codec.encode(_PAYLOAD)) == expected
+    assert codec.decode(codec.encode(_PAYLOAD).encode("utf-8")) == expected
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_encode_escape(name):
+    # type: (Text) -> None
+    codec = _codec(name)
+    payload = {"a": ["镜头/1", "\U0001f600", '"\\\n']}
+    expected = json.dumps(payload, separators=(",", ":"))
+    assert expected == '{"a":["\\u955c\\u5934/1","\\ud83d\\ude00","\\"\\\\\\n"]}'
+    assert codec.encode(payload).replace(", ", ",").replace(": ", ":") == expected
+
+
+def test_as_payload():
+    ids = ["a", "b"]
+    data = {"id_array": ids}
+    assert as_payload(data) is data
+    assert as_payload(ids) is ids
+    assert as_payload({"a": ("b",)}) == {"a": ["b"]}
+    with pytest.raises(TypeError):
+        as_payload({"a": object()})
+
+
+def test_default_codec():
+    assert new_codec().name == next(i for i in CODECS if _installed(i))
+
+
+def _installed(name):
+    # type: (Text) -> bool
+    try:
+        new_codec(name)
+        return True
+    except ImportError:
+        return False
@@ -0,0 +1,151 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""Incremental decoding of `api.php` JSON response."""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, Iterable, Iterator, Callable, Dict
+
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class _Reader(object):
+    def __init__(self, chunks):
+        # type: (Iterable[bytes]) -> None
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        # type: () -> bool
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buf = self._buf[self._pos :] + text
+                self._pos = 0
+                return True
+        self._buf = self._buf[self._pos :] + self._decoder.decode(b"", True)
+        self._pos = 0
+        self._eof = True
+        return True
+
+    def peek(self):
+        # type: () -> Text
+        """Skip whitespace and return next character, empty at end."""
+
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()  # type: ignore
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, c):
+        # type: (Text) -> None
+        if self.peek() != c:
+            raise ValueError("malformed json: expected %r at %r" % (c, self.peek()))
+        self._pos += 1
+
+    def value(self):
+        # type: () -> Any
+        self.peek()
+        while True:
+            try:
+                ret, end = _DECODER.raw_decode(self._buf, self._pos)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            # number at buffer end may continue in next chunk.
+            if (
+                _WHITESPACE.match(self._buf, end).end() < len(self._buf)  # type: ignore
+                or not self._fill()
+            ):
+                self._pos = end
+                return ret
+
+    def array(self):
+        # type: () -> Iterator[Any]
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            c = self.peek()
+            self._pos += 1
+            if c == "]":
+                return
+            if c != ",":
+                raise ValueError("malformed json: expected ',' at %r" % (c,))
+
+
+def iter_data(chunks, check):
+    # type: (Iterable[bytes], Callable[[Any], None]) -> Iterator[Any]
+    """Decode items of `data` array from response body chunks.
+
+    Args:
+        chunks (Iterable[bytes]): UTF-8 encoded response body.
+        check (Callable[[Any], None]): Raise error for error envelope,
+            called with envelope fields except streamed `data`.
+            Called before first item when `code` precedes `data`,
+            otherwise after last item.
+
+    Returns:
+        Iterator[Any]: Items of `data` array, or items of top level array.
+    """
+
+    r = _Reader(chunks)
+    c = r.peek()
+    if c == "[":
+        for i in r.array():
+            yield i
+        return
+    if c != "{":
+        data = r.value()
+        check(data)
+        raise ValueError("response data is not an array: %r" % (data,))
+
+    r.expect("{")
+    envelope = {}  # type: Dict[Text, Any]
+    is_streamed = False
+    if r.peek() == "}":
+        r.expect("}")
+    else:
+        while True:
+            key = r.value()
+            r.expect(":")
+            if key == "data" and r.peek() == "[":
+                if "code" in envelope:
+                    check(envelope)
+                for i in r.array():
+                    yield i
+                is_streamed = True
+            else:
+                envelope[key] = r.value()
+            c = r.peek()
+            r.expect(c)
+            if c == "}":
+                break
+            if c != ",":
+                raise ValueError("malformed json: expected ',' at %r" % (c,))
+    check(envelope)
+    if is_streamed:
+        return
+    data = envelope.get("data")
+    if isinstance(data, list):
+        for i in data:  # type: ignore
+            yield i
+    elif data:
+        raise ValueError("response data is not an array: %r" % (data,))
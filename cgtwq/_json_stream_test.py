@@ -0,0 +1,73 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List
+
+import json
+
+import pytest
+
+from . import exceptions
+from ._http_client import CGTeamworkError, _raise_error  # type: ignore
+from ._json_stream import iter_data
+
+
+def _chunks(data, size):
+    # type: (Any, int) -> List[bytes]
+    body = json.dumps(data, ensure_ascii=False, indent=1).encode("utf-8")
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+_ROWS = [
+    {"task.id": "1", "task.artist": "张三", "task.frame": 12345},
+    {"task.id": "2", "task.artist": 'a\\"b]', "task.frame": -1.5e3},
+    ["x", None, True, False, {"nested": [1, [2]]}],
+]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1 << 16])
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"code": "1", "type": "json", "data": _ROWS},
+        {"data": _ROWS, "code": "1", "type": "json"},
+        _ROWS,
+    ],
+)
+def test_iter_data(data, size):
+    # type: (Any, int) -> None
+    assert list(iter_data(_chunks(data, size), _raise_error)) == _ROWS
+
+
+def test_iter_data_empty():
+    assert list(iter_data(_chunks({"code": "1", "data": []}, 2), _raise_error)) == []
+    assert list(iter_data(_chunks({"code": "1", "data": ""}, 2), _raise_error)) == []
+    assert list(iter_data(_chunks([], 2), _raise_error)) == []
+
+
+def test_iter_data_error():
+    with pytest.raises(exceptions.LoginError):
+        list(
+            iter_data(
+                _chunks({"code": "2", "type": "msg", "data": "please login!!!"}, 3),
+                _raise_error,
+            )
+        )
+    rows = iter_data(_chunks({"code": "2", "data": [1, 2]}, 3), _raise_error)
+    with pytest.raises(CGTeamworkError):
+        next(rows)
+    rows = iter_data(_chunks({"data": [1, 2], "code": "2"}, 3), _raise_error)
+    assert next(rows) == 1
+    with pytest.raises(CGTeamworkError):
+        list(rows)
+
+
+def test_iter_data_malformed():
+    with pytest.raises(ValueError):
+        list(iter_data([b'{"code": "1", "data": [1, 2'], _raise_error))
+    with pytest.raises(ValueError):
+        list(iter_data([b'{"code": "1" "data": []}'], _raise_error))
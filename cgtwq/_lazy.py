@@ -0,0 +1,80 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Optional
+
+import threading
+
+
+class Lazy(object):
+    """Value computed once on first `get`, or in background after `start`.
+
+    Failed computation is not cached, next `get` computes again.
+    """
+
+    def __init__(self, fn):
+        # type: (Callable[[], Any]) -> None
+        self._fn = fn
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._running = False
+        self._value = None  # type: Any
+        self._error = None  # type: Optional[BaseException]
+
+    @property
+    def done(self):
+        # type: () -> bool
+        return self._done.is_set() and self._error is None
+
+    def _claim(self):
+        # type: () -> bool
+        with self._lock:
+            if self._running or self.done:
+                return False
+            self._running = True
+            self._done.clear()
+            return True
+
+    def _run(self):
+        # type: () -> None
+        try:
+            self._value = self._fn()
+            self._error = None
+        except BaseException as ex:  # pylint: disable=broad-except
+            self._error = ex
+        finally:
+            with self._lock:
+                self._running = False
+                self._done.set()
+
+    def start(self):
+        # type: () -> None
+        """Compute in background thread, if not computing or computed."""
+
+        if not self._claim():
+            return
+        thread = threading.Thread(target=self._run)
+        thread.daemon = True
+        thread.start()
+
+    def get(self):
+        # type: () -> Any
+        if self._claim():
+            self._run()
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+def resolve(v):
+    # type: (Any) -> Any
+    """Value of `Lazy`, other value is returned as is."""
+
+    if isinstance(v, Lazy):
+        return v.get()
+    return v
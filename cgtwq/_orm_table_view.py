@@ -5,18 +5,130 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from typing import Text, Iterator, Sequence, Any
-    from ._table_view import TableView
+    from typing import (
+        Text,
+        Iterator,
+        Iterable,
+        Sequence,
+        Any,
+        Callable,
+        Optional,
+        Hashable,
+        Dict,
+        List,
+        Tuple,
+    )
+    from concurrent.futures import Future
+    from ._columns import Column
+    from ._table_view import CountableTableView
 
+    # raw `get_filter` rows: list for v5.2, dict by field for v7.0
+    _Page = Sequence[Any]
+    _PageFetcher = Callable[[int, int], _Page]
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from six.moves import queue  # type: ignore
+
+from ._columns import ColumnsBuilder
 from ._filter import Filter, NULL_FILTER
-from ._http_client import HTTPClient
+from ._filter_optimizer import MAX_IN_SIZE, optimize, shard
+from ._http_client import HTTPClient, HTTPResponse
+from ._page_size_tuner import DEFAULT_PAGE_SIZE_TUNER, PageSizeTuner
 from ._row_id import RowID
 
 from ._compat_service import CompatService
 
 
+def controller_v7_0(database, module, module_type):
+    # type: (Text, Text, Text) -> tuple[Text, dict[str, Any]]
+    param = {}  # type: dict[str, Any]
+    if database == "public" and module == "account" and module_type == "info":
+        controller = "account"
+    elif database == "public" and module == "project" and module_type == "info":
+        controller = "project"
+    elif module_type == "task":
+        if module == "etask":
+            # TODO: transform easy task field
+            controller = "etask"
+        else:
+            controller = "task"
+        param["database"] = database
+        param["module"] = module
+    else:
+        controller = "info"
+        param["database"] = database
+        param["module"] = module
+    return controller, param
+
+
+def _and_each_term(filter_by, condition):
+    # type: (Filter, Filter) -> Filter
+    """Add condition to every `or` term, server evaluates `and` before `or`."""
+
+    ret = None  # type: Optional[Filter]
+    logic = ""
+    for i in filter_by.items():
+        if not isinstance(i, tuple):
+            if i == "or":
+                assert ret
+                ret = ret.and_(condition)
+            logic = i
+            continue
+        v = Filter(*i)
+        ret = v if ret is None else ret.chain(logic, v)
+    assert ret
+    return ret.and_(condition)
+
+
+class _StreamPage(object):
+    """Page rows decoded while iterating, can only be iterated once.
+
+    Length and last row are available after iteration.
+    """
+
+    def __init__(self, rows, on_done):
+        # type: (Iterator[Any], Callable[[int], None]) -> None
+        self._rows = rows
+        self._on_done = on_done
+        self._count = 0
+        self.last = None  # type: Any
+
+    def __iter__(self):
+        # type: () -> Iterator[Any]
+        for i in self._rows:
+            self._count += 1
+            self.last = i
+            yield i
+        self._on_done(self._count)
+
+    def __len__(self):
+        return self._count
+
+
 class ORMTableView:
     page_size = 1000
+    # max pages requested concurrently, 0 to request pages one by one.
+    prefetch = 0
+    # page by `id > last_seen_id` instead of `start_num`,
+    # stays linear and consistent under concurrent edits.
+    # pages depend on each other so `prefetch` is not used.
+    keyset = False
+    # tune page size per field set from observed latency and response size,
+    # `page_size` is ignored when set.
+    page_size_tuner = None  # type: Optional[PageSizeTuner]
+    # decode rows while receiving page, lower peak memory
+    # and time to first row for large pages.
+    stream = False
+    # optimize filter and split `in` list longer than this into queries
+    # run concurrently, 0 to disable. rows of different shards are not ordered.
+    max_in_size = MAX_IN_SIZE
+    shard_workers = 4
+    # max pages buffered by each running shard, ahead of consumer.
+    shard_read_ahead = 1
 
     def __init__(
         self,
@@ -26,8 +138,13 @@ class ORMTableView:
         module,
         module_type,
         filter_by,
+        prefetch=0,
+        keyset=False,
+        adaptive_page_size=False,
+        stream=False,
+        max_in_size=0,
     ):
-        # type: (HTTPClient, CompatService, Text, Text, Text, Filter) -> None
+        # type: (HTTPClient, CompatService, Text, Text, Text, Filter, int, bool, bool, bool, int) -> None
         self._http = http
         self._compat = compat
         self._database = database
@@ -36,7 +153,19 @@ class ORMTableView:
         self._id_field = "%s.id" % (self._module_type)
         if filter_by is NULL_FILTER:
             filter_by = Filter(self._id_field, "has", "%")
+        if max_in_size:
+            self.max_in_size = max_in_size
+        if self.max_in_size > 0:
+            filter_by = optimize(filter_by, self._id_field)
         self._filter_by = filter_by
+        if prefetch:
+            self.prefetch = prefetch
+        if keyset:
+            self.keyset = keyset
+        if adaptive_page_size:
+            self.page_size_tuner = DEFAULT_PAGE_SIZE_TUNER
+        if stream:
+            self.stream = stream
 
     def __iter__(self):
         for id in self.column(self._id_field):
@@ -44,89 +173,325 @@ class ORMTableView:
 
     def rows(self, *fields):
         # type: (Text) -> Iterator[Sequence[Text]]
+        for page in self._raw_pages(fields):
+            for i in self._page_rows(page, fields):
+                yield i
+
+    def count(self):
+        # type: () -> int
+        count = self._count_v5_2
+        if self._compat.level >= self._compat.LEVEL_7_0:
+            count = self._count_v7_0
+        shards = self._shards()
+        if len(shards) == 1:
+            return count(shards[0])
+        with ThreadPoolExecutor(max_workers=self.shard_workers) as executor:
+            return sum(executor.map(count, shards))
+
+    def exists(self):
+        # type: () -> bool
+        for i in self._shards():
+            page = self._page((self._id_field,), i, ())(0, 1)
+            if any(True for _ in page):
+                return True
+        return False
+
+    def _shards(self):
+        # type: () -> List[Filter]
+        if self.max_in_size <= 0:
+            return [self._filter_by]
+        return shard(self._filter_by, self.max_in_size)
+
+    def _count_v5_2(self, filter_by):
+        # type: (Filter) -> int
+        resp = self._http.call(
+            "c_orm",
+            "get_count_with_filter",
+            db=self._database,
+            module=self._module,
+            module_type=self._module_type,
+            sign_filter_array=self._compat.filter_payload(filter_by),
+        )
+        return int(resp.json())
+
+    def _count_v7_0(self, filter_by):
+        # type: (Filter) -> int
+        controller, param = controller_v7_0(
+            self._database,
+            self._module,
+            self._module_type,
+        )
+        resp = self._http.call(
+            controller,
+            "get_count",
+            sign_filter_array=self._compat.filter_payload(filter_by),
+            **param,
+        )
+        return int(resp.json())
+
+    def columns(self, *fields, **kwargs):
+        # type: (Text, *Any) -> Dict[Text, Column]
+        r"""Fetch fields as per-field columns, without building row tuples.
+
+        Args:
+            \*fields (Text): Fields to fetch.
+            \*\*kwargs: See `ColumnsBuilder.from_kwargs`.
+
+        Returns:
+            Dict[Text, Column]: Column by field, in field order.
+        """
+
+        builder = ColumnsBuilder.from_kwargs(fields, kwargs)
+        for page in self._raw_pages(fields):
+            builder.extend(self._page_columns(page, fields))
+        return builder.build()
+
+    def _page_rows(self, page, fields):
+        # type: (_Page, Sequence[Text]) -> Iterable[Sequence[Text]]
         if self._compat.level < self._compat.LEVEL_7_0:
-            return self._rows_v5_2(*fields)
-        return self._rows_v7_0(*fields)
+            size = len(fields)
+            return (i if len(i) == size else i[:size] for i in page)
+        return (tuple(i[field] for field in fields) for i in page)
 
-    def _rows_v5_2(self, *fields):
-        # type: (Text) -> Iterator[Sequence[Text]]
-        page_size = self.page_size
-        page_index = 0
-        has_next_page = True
-        sign_array = [self._compat.transform_field(i) for i in fields]
-        sign_filter_array = self._compat.transform_filter(self._filter_by)
-        while has_next_page:
-            has_next_page = False
-            resp = self._http.call(
+    def _page_columns(self, page, fields):
+        # type: (_Page, Sequence[Text]) -> Sequence[Iterable[Text]]
+        if isinstance(page, _StreamPage):
+            page = list(page)
+        if self._compat.level < self._compat.LEVEL_7_0:
+            return [[i[index] for i in page] for index in range(len(fields))]
+        return [[i[field] for i in page] for field in fields]
+
+    def _raw_pages(self, fields):
+        # type: (Sequence[Text]) -> Iterator[_Page]
+        shards = self._shards()
+        if len(shards) == 1:
+            return self._filter_pages(fields, shards[0])
+        return self._pages_sharded(fields, shards)
+
+    def _filter_pages(self, fields, filter_by):
+        # type: (Sequence[Text], Filter) -> Iterator[_Page]
+        if self.keyset:
+            return self._pages_keyset(fields, filter_by)
+        fetch = self._page(fields, filter_by, fields[:3])
+        if self.prefetch > 0:
+            return self._pages_prefetch(fetch, fields)
+        return self._pages_serial(fetch, fields)
+
+    def _pages_sharded(self, fields, shards):
+        # type: (Sequence[Text], Sequence[Filter]) -> Iterator[_Page]
+        """Fetch pages of each shard concurrently, yielded in shard order.
+
+        Running shard waits when `shard_read_ahead` pages are not consumed,
+        workers stop when generator is closed.
+        """
+
+        stop = threading.Event()
+        queues = [queue.Queue(max(1, self.shard_read_ahead)) for _ in shards]
+
+        def _put(q, item):
+            # type: (Any, Tuple[Optional[_Page], Optional[Exception]]) -> bool
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def _fetch(filter_by, q):
+            # type: (Filter, Any) -> None
+            if stop.is_set():
+                return
+            pages = self._filter_pages(fields, filter_by)
+            try:
+                for page in pages:
+                    # next page request depends on length of this one.
+                    if isinstance(page, _StreamPage):
+                        page = list(page)
+                    if not _put(q, (page, None)) or stop.is_set():
+                        return
+                _put(q, (None, None))
+            except Exception as ex:
+                _put(q, (None, ex))
+            finally:
+                pages.close()  # type: ignore
+
+        with ThreadPoolExecutor(max_workers=self.shard_workers) as executor:
+            futures = [executor.submit(_fetch, i, q) for i, q in zip(shards, queues)]
+            try:
+                for q in queues:
+                    while True:
+                        page, err = q.get()
+                        if err is not None:
+                            raise err
+                        if page is None:
+                            break
+                        yield page
+            finally:
+                stop.set()
+                for i in futures:
+                    i.cancel()
+
+    def _pages_keyset(self, fields, filter_by):
+        # type: (Sequence[Text], Filter) -> Iterator[_Page]
+        sign_fields = tuple(fields)
+        if self._id_field not in fields:
+            sign_fields += (self._id_field,)
+        base_filter = filter_by
+        while True:
+            page_size = self._page_size(sign_fields)
+            page = self._page(sign_fields, filter_by, (self._id_field,))(0, page_size)
+            yield page
+            if len(page) < page_size:
+                break
+            last = page.last if isinstance(page, _StreamPage) else page[-1]
+            if self._compat.level < self._compat.LEVEL_7_0:
+                last_id = last[sign_fields.index(self._id_field)]
+            else:
+                last_id = last[self._id_field]
+            filter_by = _and_each_term(
+                base_filter,
+                Filter(self._id_field, ">", last_id),
+            )
+
+    def _page(self, fields, filter_by, order_by):
+        # type: (Sequence[Text], Filter, Sequence[Text]) -> _PageFetcher
+        if self._compat.level < self._compat.LEVEL_7_0:
+            return self._page_v5_2(fields, filter_by, order_by)
+        return self._page_v7_0(fields, filter_by, order_by)
+
+    def _page_size_key(self, fields):
+        # type: (Sequence[Text]) -> Hashable
+        return (self._database, self._module, self._module_type, frozenset(fields))
+
+    def _page_size(self, fields):
+        # type: (Sequence[Text]) -> int
+        if self.page_size_tuner:
+            return self.page_size_tuner.size(self._page_size_key(fields))
+        return self.page_size
+
+    def _observe_page(self, fields, limit, row_count, started_at, resp):
+        # type: (Sequence[Text], int, int, float, HTTPResponse) -> None
+        if self.page_size_tuner:
+            self.page_size_tuner.observe(
+                self._page_size_key(fields),
+                limit,
+                row_count,
+                time.time() - started_at,
+                resp.content_length(),
+            )
+
+    def _call(self, controller, method, **data):
+        # type: (Text, Text, *Any) -> HTTPResponse
+        if self.stream:
+            return self._http.call_stream(controller, method, **data)
+        return self._http.call(controller, method, **data)
+
+    def _read_page(self, fields, limit, started_at, resp):
+        # type: (Sequence[Text], int, float, HTTPResponse) -> _Page
+        if self.stream:
+            return _StreamPage(
+                resp.iter_data(),
+                lambda count: self._observe_page(
+                    fields, limit, count, started_at, resp
+                ),
+            )
+        ret = resp.json()
+        self._observe_page(fields, limit, len(ret), started_at, resp)
+        return ret
+
+    def _pages_serial(self, fetch, fields):
+        # type: (_PageFetcher, Sequence[Text]) -> Iterator[_Page]
+        start = 0
+        while True:
+            page_size = self._page_size(fields)
+            page = fetch(start, page_size)
+            yield page
+            if len(page) < page_size:
+                break
+            start += page_size
+
+    def _pages_prefetch(self, fetch, fields):
+        # type: (_PageFetcher, Sequence[Text]) -> Iterator[_Page]
+        """Speculatively request next `prefetch` pages on a worker pool,
+        pages are still yielded in server order.
+        """
+
+        start = 0
+        pending = deque()  # type: deque[tuple[int, Future[_Page]]]
+        executor = ThreadPoolExecutor(max_workers=self.prefetch)
+        try:
+            while True:
+                while len(pending) < self.prefetch:
+                    page_size = self._page_size(fields)
+                    pending.append(
+                        (page_size, executor.submit(fetch, start, page_size))
+                    )
+                    start += page_size
+                page_size, future = pending.popleft()
+                page = future.result()
+                yield page
+                if len(page) < page_size:
+                    break
+        finally:
+            for _, i in pending:
+                i.cancel()
+            # do not block close on requests already in flight.
+            executor.shutdown(wait=False)
+
+    def _page_v5_2(self, fields, filter_by, order_by):
+        # type: (Sequence[Text], Filter, Sequence[Text]) -> _PageFetcher
+        sign_array = self._compat.transform_fields(fields)
+        order_sign_array = self._compat.transform_fields(order_by)
+        sign_filter_array = self._compat.filter_payload(filter_by)
+
+        def fetch(start, limit):
+            # type: (int, int) -> _Page
+            started_at = time.time()
+            resp = self._call(
                 "c_orm",
                 "get_with_filter",
                 db=self._database,
                 module=self._module,
                 module_type=self._module_type,
                 sign_array=sign_array,
-                order_sign_array=sign_array[:3],
+                order_sign_array=order_sign_array,
                 sign_filter_array=sign_filter_array,
-                limit="%d" % (page_size,),
-                start_num="%d" % (page_index * page_size,),
+                limit="%d" % (limit,),
+                start_num="%d" % (start,),
             )
-            for index, i in enumerate(resp.json()):
-                if index == page_size - 1:
-                    has_next_page = True
-                yield i
-            page_index += 1
+            return self._read_page(fields, limit, started_at, resp)
 
-    def _rows_v7_0(self, *fields):
-        # type: (Text) -> Iterator[Sequence[Text]]
-        page_size = self.page_size
-        page_index = 0
-        has_next_page = True
-        sign_array = [self._compat.transform_field(i) for i in fields]
-        sign_filter_array = self._compat.transform_filter(self._filter_by)
-
-        param = {}  # type: dict[str, Any]
-        if (
-            self._database == "public"
-            and self._module == "account"
-            and self._module_type == "info"
-        ):
-            controller = "account"
-        elif (
-            self._database == "public"
-            and self._module == "project"
-            and self._module_type == "info"
-        ):
-            controller = "project"
-        elif self._module_type == "task":
-            if self._module == "etask":
-                # TODO: transform easy task field
-                controller = "etask"
-            else:
-                controller = "task"
-            param["database"] = self._database
-            param["module"] = self._module
-        else:
-            controller = "info"
-            param["database"] = self._database
-            param["module"] = self._module
+        return fetch
+
+    def _page_v7_0(self, fields, filter_by, order_by):
+        # type: (Sequence[Text], Filter, Sequence[Text]) -> _PageFetcher
+        sign_array = self._compat.transform_fields(fields)
+        order_sign_array = self._compat.transform_fields(order_by)
+        sign_filter_array = self._compat.filter_payload(filter_by)
 
+        controller, param = controller_v7_0(
+            self._database,
+            self._module,
+            self._module_type,
+        )
         param["sign_array"] = sign_array
-        param["order_sign_array"] = sign_array[:3]
+        param["order_sign_array"] = order_sign_array
         param["sign_filter_array"] = sign_filter_array
-        while has_next_page:
-            has_next_page = False
-            param["limit"] = "%d" % (page_size,)
-            param["start_num"] = "%d" % (page_index * page_size,)
 
-            resp = self._http.call(
+        def fetch(start, limit):
+            # type: (int, int) -> _Page
+            started_at = time.time()
+            resp = self._call(
                 controller,
                 "get_filter",
+                limit="%d" % (limit,),
+                start_num="%d" % (start,),
                 **param,
             )
-            for index, i in enumerate(resp.json()):
-                if index == page_size - 1:
-                    has_next_page = True
-                yield tuple(i[field] for field in fields)
-            page_index += 1
+            return self._read_page(fields, limit, started_at, resp)
+
+        return fetch
 
     def column(self, field):
         # type: (Text) -> ...
@@ -135,5 +500,5 @@ class ORMTableView:
 
 
 def _(v):
-    # type: (ORMTableView) -> TableView
+    # type: (ORMTableView) -> CountableTableView
     return v
@@ -0,0 +1,291 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List
+
+import threading
+import time
+
+from ._compat_service import CompatService
+from ._field_sign import FieldSign
+from ._filter import NULL_FILTER
+from ._fake_transport import FakeTransport
+from ._http_client import HTTPClient
+from ._orm_table_view import ORMTableView, _and_each_term  # type: ignore
+from ._stand_in_server import StandInServer
+
+
+class _FakeHTTP(HTTPClient):
+    """`HTTPClient` on `FakeTransport`, serves `rows` by filter and page."""
+
+    def __init__(self, row_count, delay=0):
+        # type: (int, float) -> None
+        self.rows = [
+            {"task.id": "%06d" % i, "task.artist": "artist%d" % i}
+            for i in range(row_count)
+        ]
+        self.transport = FakeTransport(self._respond)
+        self.transport.delay = delay
+        super(_FakeHTTP, self).__init__("http://127.0.0.1:8080", self.transport)
+        self.response_cache = None
+
+    @property
+    def calls(self):
+        # type: () -> List[Any]
+        return [(i["controller"], i["method"], i) for i in self.transport.requests]
+
+    @property
+    def max_in_flight(self):
+        # type: () -> int
+        return self.transport.max_in_flight
+
+    def _respond(self, data):
+        # type: (Any) -> Any
+        method = data["method"]
+        if method in ("get_count", "get_count_with_filter"):
+            return {"code": "1", "data": "%d" % len(self.rows)}
+        start, limit = int(data["start_num"]), int(data["limit"])
+        rows = self.rows
+        for i in data["sign_filter_array"]:
+            if i[:2] == ["task.id", ">"]:
+                rows = [j for j in rows if j["task.id"] > i[2]]
+        if method == "get_with_filter":
+            rows = [[j[k] for k in data["sign_array"]] for j in rows]
+        else:
+            rows = [{k: j[k] for k in data["sign_array"]} for j in rows]
+        return {"code": "1", "data": rows[start : start + limit]}
+
+
+def _view(http, level=CompatService.LEVEL_7_0, **kwargs):
+    # type: (_FakeHTTP, int, *Any) -> ORMTableView
+    v = ORMTableView(
+        http, CompatService(level), "proj_test", "shot", "task", NULL_FILTER, **kwargs
+    )
+    v.page_size = 10
+    return v
+
+
+def test_rows_serial():
+    http = _FakeHTTP(25)
+    assert list(_view(http).column("task.id")) == [i["task.id"] for i in http.rows]
+    assert len(http.calls) == 3
+    assert http.max_in_flight == 1
+
+
+def test_rows_prefetch():
+    http = _FakeHTTP(95, delay=0.01)
+    assert list(_view(http, prefetch=4).column("task.id")) == [
+        i["task.id"] for i in http.rows
+    ]
+    assert http.max_in_flight > 1
+    assert http.max_in_flight <= 4
+
+
+def test_rows_prefetch_close():
+    http = _FakeHTTP(95)
+    release = threading.Event()
+    respond = http.transport.respond
+
+    def _respond(data):
+        # type: (Any) -> Any
+        if data.get("start_num", "0") != "0":
+            release.wait(5)
+        return respond(data)
+
+    http.transport.respond = _respond
+    rows = _view(http, prefetch=4).rows("task.id")
+    next(rows)
+    started_at = time.time()
+    rows.close()
+    assert time.time() - started_at < 1
+    release.set()
+
+
+def test_rows_prefetch_exact_page():
+    http = _FakeHTTP(20)
+    assert len(list(_view(http, prefetch=2).rows("task.id"))) == 20
+
+
+def test_rows_keyset():
+    http = _FakeHTTP(25)
+    view = _view(http, keyset=True)
+    assert list(view.rows("task.artist")) == [(i["task.artist"],) for i in http.rows]
+    assert len(http.calls) == 3
+    for _, _, data in http.calls:
+        assert data["start_num"] == "0"
+        assert data["order_sign_array"] == ["task.id"]
+        assert data["sign_array"] == ["task.artist", "task.id"]
+    assert http.calls[-1][2]["sign_filter_array"] == [
+        ["task.id", "has", "%"],
+        "and",
+        ["task.id", ">", "000019"],
+    ]
+
+
+def test_rows_stream():
+    for level in (CompatService.LEVEL_6_1, CompatService.LEVEL_7_0):
+        http = _FakeHTTP(25)
+        view = _view(http, level, stream=True)
+        assert [tuple(i) for i in view.rows("task.id", "task.artist")] == [
+            (i["task.id"], i["task.artist"]) for i in http.rows
+        ]
+        assert len(http.calls) == 3
+        assert list(_view(http, level, stream=True, keyset=True).column("task.id")) == [
+            i["task.id"] for i in http.rows
+        ]
+        columns = _view(http, level, stream=True).columns("task.artist")
+        assert list(columns["task.artist"]) == [i["task.artist"] for i in http.rows]
+        assert _view(http, level, stream=True).exists()
+        assert not _view(_FakeHTTP(0), level, stream=True).exists()
+
+
+def test_and_each_term():
+    from ._filter import Filter
+
+    f = Filter("a", "=", 1).or_(Filter("b", "=", 2).and_(Filter("c", "=", 3)))
+    assert _and_each_term(f, Filter("id", ">", "x")).as_payload() == [
+        ["a", "=", 1],
+        "and",
+        ["id", ">", "x"],
+        "or",
+        ["b", "=", 2],
+        "and",
+        ["c", "=", 3],
+        "and",
+        ["id", ">", "x"],
+    ]
+
+
+def test_rows_adaptive_page_size():
+    from ._page_size_tuner import PageSizeTuner
+
+    http = _FakeHTTP(1000)
+    view = _view(http)
+    # 40 rows of `task.id` is 943 bytes.
+    view.page_size_tuner = PageSizeTuner(initial_size=10, min_size=10, max_bytes=943)
+    assert list(view.column("task.id")) == [i["task.id"] for i in http.rows]
+    limits = [int(data["limit"]) for _, _, data in http.calls]
+    assert limits[0] == 10
+    assert 35 <= max(limits) <= 40
+    assert [int(data["start_num"]) for _, _, data in http.calls] == [
+        sum(limits[:i]) for i in range(len(limits))
+    ]
+
+
+def test_rows_v5_2_keyset():
+    http = _FakeHTTP(25)
+    view = _view(http, CompatService.LEVEL_5_2, keyset=True)
+    assert list(view.rows("task.artist")) == [[i["task.artist"]] for i in http.rows]
+    assert http.calls[-1][:2] == ("c_orm", "get_with_filter")
+
+
+def test_columns():
+    http = _FakeHTTP(25)
+    for level in (CompatService.LEVEL_5_2, CompatService.LEVEL_7_0):
+        columns = _view(http, level).columns(
+            "task.id", "task.artist", dictionary=["task.artist"]
+        )
+        assert list(columns) == ["task.id", "task.artist"]
+        assert columns["task.id"] == [i["task.id"] for i in http.rows]
+        assert list(columns["task.artist"]) == [i["task.artist"] for i in http.rows]
+
+
+def test_count_and_exists():
+    for level, controller, method in (
+        (CompatService.LEVEL_5_2, "c_orm", "get_count_with_filter"),
+        (CompatService.LEVEL_7_0, "task", "get_count"),
+    ):
+        http = _FakeHTTP(25)
+        view = _view(http, level)
+        assert view.count() == 25
+        assert http.calls[-1][:2] == (controller, method)
+        assert "limit" not in http.calls[-1][2]
+        assert view.exists()
+        assert http.calls[-1][2]["limit"] == "1"
+        assert not _view(_FakeHTTP(0), level).exists()
+
+
+def test_sharded_in_filter():
+    server = StandInServer()
+    server.add_synthetic_table("proj_test", "shot", "task", 50)
+    http = HTTPClient("http://shard.stand-in", server.transport())
+    http.response_cache = None
+    all_rows = ORMTableView(
+        http,
+        CompatService(CompatService.LEVEL_7_0),
+        "proj_test",
+        "shot",
+        "task",
+        NULL_FILTER,
+    ).rows("task.id", "task.entity")
+    ids = sorted(i[0] for i in all_rows)[:10]
+    for level in (CompatService.LEVEL_5_2, CompatService.LEVEL_7_0):
+        f = FieldSign("task.id").equal(ids[0])
+        for i in ids[1:]:
+            f = f.or_(FieldSign("task.id").equal(i))
+        view = ORMTableView(
+            http, CompatService(level), "proj_test", "shot", "task", f, max_in_size=4
+        )
+        server.request_count = 0
+        assert view.count() == 10
+        assert server.request_count == 3
+        assert sorted(i for (i,) in view.rows("task.id")) == ids
+        assert view.exists()
+
+
+def test_in_filter_order():
+    server = StandInServer()
+    server.add_synthetic_table("proj_test", "shot", "task", 50)
+    http = HTTPClient("http://order.stand-in", server.transport())
+    http.response_cache = None
+    compat = CompatService(CompatService.LEVEL_7_0)
+    all_rows = list(
+        ORMTableView(http, compat, "proj_test", "shot", "task", NULL_FILTER).rows(
+            "task.entity", "task.id"
+        )
+    )
+    ids = [i[1] for i in all_rows[::-5]]
+    expected = [i for i in all_rows if i[1] in ids]
+    f = FieldSign("task.id").in_(ids)
+
+    # sharding is opt-in, server order is kept by default.
+    view = ORMTableView(http, compat, "proj_test", "shot", "task", f)
+    server.request_count = 0
+    assert list(view.rows("task.entity", "task.id")) == expected
+    assert server.request_count == 1
+
+    view = ORMTableView(
+        http, compat, "proj_test", "shot", "task", f, max_in_size=len(ids) // 3
+    )
+    server.request_count = 0
+    assert sorted(view.rows("task.entity", "task.id")) == sorted(expected)
+    assert server.request_count == 4
+
+
+def test_sharded_close_early():
+    for stream in (False, True):
+        http = _FakeHTTP(1000)
+        f = FieldSign("task.id").in_(["%06d" % i for i in range(20)])
+        view = ORMTableView(
+            http,
+            CompatService(CompatService.LEVEL_7_0),
+            "proj_test",
+            "shot",
+            "task",
+            f,
+            stream=stream,
+            max_in_size=2,
+        )
+        view.page_size = 10
+        rows = view.rows("task.id")
+        assert next(rows) == ("000000",)
+        rows.close()
+        # fake server ignores `in`, each of 10 shards has 100 pages.
+        count = len(http.calls)
+        assert count <= view.shard_workers * (view.shard_read_ahead + 2)
+        time.sleep(0.3)
+        assert len(http.calls) == count
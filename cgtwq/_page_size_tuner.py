@@ -0,0 +1,71 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Hashable, Dict
+
+import threading
+
+from ._util import env_float
+
+
+class PageSizeTuner:
+    """Tune page size from observed latency and payload size.
+
+    Page size for each key converges to the row count that the server
+    returns in `target_latency` seconds, and is capped so that a page
+    does not exceed `max_bytes`.
+    Tuned sizes are kept for the process lifetime.
+    """
+
+    def __init__(
+        self,
+        target_latency=env_float("CGTEAMWORK_PAGE_TARGET_LATENCY", 1),
+        initial_size=1000,
+        min_size=50,
+        max_size=20000,
+        max_bytes=16 << 20,
+    ):
+        # type: (float, int, int, int, int) -> None
+        self.target_latency = target_latency
+        self.initial_size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._sizes = {}  # type: Dict[Hashable, int]
+        self._lock = threading.Lock()
+
+    def size(self, key):
+        # type: (Hashable) -> int
+        return self._sizes.get(key, self.initial_size)
+
+    def observe(self, key, limit, row_count, elapsed, byte_count):
+        # type: (Hashable, int, int, float, int) -> None
+        """Record a finished page request.
+
+        Args:
+            key (Hashable): Tuning key.
+            limit (int): Requested page size.
+            row_count (int): Returned row count.
+            elapsed (float): Request seconds.
+            byte_count (int): Response body size.
+        """
+
+        if row_count < limit or row_count == 0:
+            # short page latency is dominated by request overhead.
+            return
+        ideal = limit * self.target_latency / max(elapsed, 1e-3)
+        if byte_count > 0:
+            ideal = min(ideal, self.max_bytes * row_count / byte_count)
+        with self._lock:
+            current = self._sizes.get(key, self.initial_size)
+            # move half way, at most double or halve at once.
+            v = (current + ideal) / 2
+            v = max(current / 2, min(current * 2, v))
+            self._sizes[key] = int(max(self.min_size, min(self.max_size, v)))
+
+
+DEFAULT_PAGE_SIZE_TUNER = PageSizeTuner()
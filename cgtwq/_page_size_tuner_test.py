@@ -0,0 +1,39 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+from ._page_size_tuner import PageSizeTuner
+
+
+def test_grow_and_shrink():
+    tuner = PageSizeTuner(target_latency=1, initial_size=1000)
+    tuner.observe("fast", 1000, 1000, 0.1, 0)
+    assert tuner.size("fast") == 2000
+    tuner.observe("slow", 1000, 1000, 4, 0)
+    assert tuner.size("slow") == 625
+    assert tuner.size("other") == 1000
+
+
+def test_short_page_ignored():
+    tuner = PageSizeTuner(initial_size=1000)
+    tuner.observe("key", 1000, 10, 0.001, 0)
+    assert tuner.size("key") == 1000
+
+
+def test_limit_by_bytes():
+    tuner = PageSizeTuner(target_latency=10, initial_size=1000, max_bytes=1 << 20)
+    # 4KiB per row, 256 rows fit in max_bytes.
+    for _ in range(20):
+        size = tuner.size("wide")
+        tuner.observe("wide", size, size, 0.1, size * 4096)
+    assert 256 <= tuner.size("wide") < 260
+
+
+def test_bounds():
+    tuner = PageSizeTuner(initial_size=100, min_size=50, max_size=150)
+    tuner.observe("key", 100, 100, 0.001, 0)
+    assert tuner.size("key") == 150
+    for _ in range(5):
+        tuner.observe("key", 150, 150, 100, 0)
+    assert tuner.size("key") == 50
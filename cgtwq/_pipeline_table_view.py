@@ -5,11 +5,13 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from typing import Text, Iterator, Sequence
+    from typing import Text, Iterator, Sequence, Any, Dict
+    from ._columns import Column
     from ._compat_service import CompatService
     from ._http_client import HTTPClient
     from ._table_view import TableView
 
+from ._columns import ColumnsBuilder
 from ._row_id import RowID
 
 from ._filter import Filter
@@ -44,14 +46,20 @@ class PipelineTableView:
         for (i,) in self.rows(field):
             yield i
 
+    def columns(self, *fields, **kwargs):
+        # type: (Text, *Any) -> Dict[Text, Column]
+        builder = ColumnsBuilder.from_kwargs(fields, kwargs)
+        builder.extend_rows(self.rows(*fields))
+        return builder.build()
+
     def _rows_v5_2(self, *fields):
         # type: (Text) -> Iterator[Sequence[Text]]
         resp = self._http.call(
             "c_pipeline",
             "get_with_filter",
             db=self._database,
-            field_array=[self._compat.transform_field(i) for i in fields],
-            filter_array=self._compat.transform_filter(self._filter_by),
+            field_array=self._compat.transform_fields(fields),
+            filter_array=self._compat.filter_payload(self._filter_by),
         )
         return resp.json()
 
@@ -61,8 +69,8 @@ class PipelineTableView:
             "pipeline",
             "get_filter",
             db=self._database,
-            field_array=[self._compat.transform_field(i) for i in fields],
-            filter_array=self._compat.transform_filter(self._filter_by),
+            field_array=self._compat.transform_fields(fields),
+            filter_array=self._compat.filter_payload(self._filter_by),
         )
         return resp.json()
 
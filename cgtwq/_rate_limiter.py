@@ -0,0 +1,120 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Text, Dict, Iterator
+
+import contextlib
+import threading
+import time
+
+from ._util import env_float
+
+
+class RateLimiter:
+    """Token bucket rate limit and max in-flight requests,
+    shared by all clients in the process.
+
+    Args:
+        rate (float, optional): Tokens added per second, 0 for no rate limit.
+        burst (float, optional): Bucket size, defaults to `rate`.
+        max_in_flight (int, optional): Max concurrent requests, 0 for no limit.
+
+    Each request takes tokens by weight of its controller (or pathname
+    for non-api request), default weight is 1.
+    """
+
+    def __init__(
+        self,
+        rate=env_float("CGTEAMWORK_RATE_LIMIT", 0),
+        burst=env_float("CGTEAMWORK_RATE_BURST", 0),
+        max_in_flight=int(env_float("CGTEAMWORK_MAX_IN_FLIGHT", 0)),
+    ):
+        # type: (float, float, int) -> None
+        self.rate = rate
+        self.burst = burst or rate
+        self.max_in_flight = max_in_flight
+        self.weights = {"web_upload_file": 10.0}  # type: Dict[Text, float]
+        self._tokens = self.burst
+        self._updated_at = time.time()
+        self._in_flight = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._request_count = 0
+        self._delayed_count = 0
+        self._delay_total = 0.0
+        self._delay_max = 0.0
+
+    @contextlib.contextmanager
+    def acquire(self, key):
+        # type: (Text) -> Iterator[None]
+        """Wait for request slot.
+
+        Args:
+            key (Text): Controller or pathname of the request.
+        """
+
+        if not (self.rate > 0 or self.max_in_flight > 0):
+            yield
+            return
+        started_at = time.time()
+        if self.rate > 0:
+            self._take(self.weights.get(key, 1.0))
+        with self._cond:
+            if self.max_in_flight > 0:
+                while self._in_flight >= self.max_in_flight:
+                    self._cond.wait()
+            self._in_flight += 1
+            delay = time.time() - started_at
+            self._request_count += 1
+            if delay > 0.001:
+                self._delayed_count += 1
+            self._delay_total += delay
+            self._delay_max = max(self._delay_max, delay)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify()
+
+    def _take(self, weight):
+        # type: (float) -> None
+        while True:
+            with self._cond:
+                now = time.time()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                # weight larger than burst is allowed with full bucket.
+                required = min(weight, self.burst)
+                if self._tokens >= required:
+                    self._tokens -= weight
+                    return
+                wait = (required - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def metrics(self):
+        # type: () -> Dict[Text, float]
+        """Queueing metrics since created.
+
+        Returns:
+            Dict[Text, float]: request count, delayed request count,
+                total and max queueing delay seconds,
+                current in-flight requests.
+        """
+
+        with self._cond:
+            return {
+                "request_count": self._request_count,
+                "delayed_count": self._delayed_count,
+                "delay_total": self._delay_total,
+                "delay_max": self._delay_max,
+                "in_flight": self._in_flight,
+            }
+
+
+DEFAULT_RATE_LIMITER = RateLimiter()
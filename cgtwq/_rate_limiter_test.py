@@ -0,0 +1,68 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import threading
+import time
+
+from ._rate_limiter import RateLimiter
+
+
+def test_disabled():
+    limiter = RateLimiter(0, 0, 0)
+    with limiter.acquire("task"):
+        pass
+    assert limiter.metrics()["request_count"] == 0
+
+
+def test_rate():
+    limiter = RateLimiter(rate=100, burst=5)
+    started_at = time.time()
+    for _ in range(15):
+        with limiter.acquire("task"):
+            pass
+    # 5 burst then 10 at 100/s
+    assert 0.08 < time.time() - started_at < 0.5
+    metrics = limiter.metrics()
+    assert metrics["request_count"] == 15
+    assert metrics["delayed_count"] >= 9
+    assert metrics["delay_max"] > 0
+
+
+def test_weight():
+    limiter = RateLimiter(rate=100, burst=10)
+    limiter.weights["heavy"] = 20
+    started_at = time.time()
+    with limiter.acquire("heavy"):
+        pass
+    with limiter.acquire("task"):
+        pass
+    # heavy request allowed with full bucket, then takes 0.11s to repay.
+    assert 0.08 < time.time() - started_at < 0.5
+
+
+def test_max_in_flight():
+    limiter = RateLimiter(max_in_flight=2)
+    lock = threading.Lock()
+    state = {"current": 0, "max": 0}
+
+    def _run():
+        with limiter.acquire("task"):
+            with lock:
+                state["current"] += 1
+                state["max"] = max(state["max"], state["current"])
+            time.sleep(0.01)
+            with lock:
+                state["current"] -= 1
+
+    threads = [threading.Thread(target=_run) for _ in range(8)]
+    for i in threads:
+        i.start()
+    for i in threads:
+        i.join()
+    assert state["max"] == 2
+    metrics = limiter.metrics()
+    assert metrics["in_flight"] == 0
+    assert metrics["request_count"] == 8
+    assert metrics["delay_total"] > 0
@@ -0,0 +1,205 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""Record request/response pairs of a transport, and replay them offline.
+
+Recording is a json lines file, gzip compressed when path ends with `.gz`.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, Dict, List, Optional, Iterator, Mapping, Tuple
+    from ._transport import Transport, Response
+
+    _Key = Tuple[Text, Text, Text]
+
+import gzip
+import io
+import json
+import threading
+import time
+from collections import deque
+
+from six.moves.urllib.parse import urlsplit  # type: ignore
+
+from ._util import cast_text
+
+
+def _open(path, mode):
+    # type: (Text, Text) -> Any
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, mode + "b"), encoding="utf-8")
+    return io.open(path, mode, encoding="utf-8")
+
+
+def _path(url):
+    # type: (Text) -> Text
+    return urlsplit(url).path.lstrip("/")  # type: ignore
+
+
+def _payload(kwargs):
+    # type: (Mapping[Text, Any]) -> Any
+    data = kwargs.get("data")
+    if not isinstance(data, dict) or "data" not in data:
+        return None
+    return json.loads(data["data"])  # type: ignore
+
+
+def _key(method, path, payload):
+    # type: (Text, Text, Any) -> _Key
+    return (method.upper(), path, json.dumps(payload, sort_keys=True))
+
+
+class RecordedResponse(object):
+    """Response from recording or stand-in server."""
+
+    def __init__(self, status_code, headers, content):
+        # type: (int, Mapping[Text, Text], bytes) -> None
+        self.status_code = status_code
+        self.headers = dict(headers)
+        self.content = content
+
+    @property
+    def text(self):
+        # type: () -> Text
+        return self.content.decode("utf-8")
+
+    def json(self):
+        # type: () -> Any
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size):
+        # type: (int) -> Iterator[bytes]
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+    def close(self):
+        # type: () -> None
+        pass
+
+
+class RecordingTransport(object):
+    """Forward requests to `transport` and append each pair to `path`.
+
+    Entry has `controller`, `method`, `limit` and `start_num` of `api.php`
+    calls extracted, so recordings can be summarized without decoding payload.
+    """
+
+    def __init__(self, transport, path):
+        # type: (Transport, Text) -> None
+        self.transport = transport
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = _open(path, "a")
+
+    def request(self, method, url, **kwargs):
+        # type: (Text, Text, *Any) -> Response
+        payload = _payload(kwargs)
+        started_at = time.time()
+        resp = self.transport.request(method, url, **kwargs)
+        elapsed = time.time() - started_at
+        entry = {
+            "http_method": method.upper(),
+            "path": _path(url),
+            "status": resp.status_code,
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() == "server"},
+            "elapsed": round(elapsed, 6),
+            "request": payload,
+            "response": resp.content.decode("utf-8"),
+        }  # type: Dict[Text, Any]
+        if isinstance(payload, dict):
+            for k in ("controller", "method", "limit", "start_num"):
+                if k in payload:
+                    entry[k] = payload[k]
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(cast_text(line) + "\n")
+            self._file.flush()
+        return resp
+
+    def close(self):
+        # type: () -> None
+        with self._lock:
+            self._file.close()
+        self.transport.close()
+
+
+def load_recording(path):
+    # type: (Text) -> List[Dict[Text, Any]]
+    """Read entries of recording file."""
+
+    with _open(path, "r") as f:
+        return [json.loads(i) for i in f if i.strip()]
+
+
+class Recording(object):
+    """Recorded responses by request.
+
+    Identical requests get responses in recorded order,
+    the last one is repeated after all used.
+    """
+
+    def __init__(self, entries):
+        # type: (List[Dict[Text, Any]]) -> None
+        self._responses = (
+            {}
+        )  # type: Dict[_Key, deque[Tuple[int, Dict[Text, Text], bytes, float]]]
+        self._lock = threading.Lock()
+        for i in entries:
+            self._responses.setdefault(
+                _key(i["http_method"], i["path"], i["request"]), deque()
+            ).append(
+                (
+                    i["status"],
+                    i.get("headers") or {},
+                    i["response"].encode("utf-8"),
+                    i.get("elapsed", 0),
+                )
+            )
+
+    @classmethod
+    def load(cls, path):
+        # type: (Text) -> Recording
+        return cls(load_recording(path))
+
+    def find(self, method, path, payload):
+        # type: (Text, Text, Any) -> Optional[Tuple[int, Dict[Text, Text], bytes, float]]
+        with self._lock:
+            responses = self._responses.get(_key(method, path, payload))
+            if not responses:
+                return None
+            if len(responses) > 1:
+                return responses.popleft()
+            return responses[0]
+
+
+class ReplayTransport(object):
+    """Serve requests from recording, without network.
+
+    Args:
+        recording (Recording): Recorded responses.
+        latency (float, optional): Seconds to wait before each response,
+            negative value replays recorded elapsed time.
+    """
+
+    def __init__(self, recording, latency=0.0):
+        # type: (Recording, float) -> None
+        self.recording = recording
+        self.latency = latency
+
+    def request(self, method, url, **kwargs):
+        # type: (Text, Text, *Any) -> Response
+        path = _path(url)
+        found = self.recording.find(method, path, _payload(kwargs))
+        if found is None:
+            raise KeyError("request not recorded: %s %s" % (method, path))
+        status, headers, content, elapsed = found
+        delay = elapsed if self.latency < 0 else self.latency
+        if delay > 0:
+            time.sleep(delay)
+        return RecordedResponse(status, headers, content)
+
+    def close(self):
+        # type: () -> None
+        pass
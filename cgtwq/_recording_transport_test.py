@@ -0,0 +1,71 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+import pytest
+
+from ._http_client import HTTPClient
+from ._recording_transport import (
+    Recording,
+    RecordingTransport,
+    ReplayTransport,
+    load_recording,
+)
+from ._stand_in_server import StandInServer
+
+
+def _view_ids(http):
+    # type: (HTTPClient) -> Any
+    http.response_cache = None
+    return http.call(
+        "task",
+        "get_filter",
+        database="proj_test",
+        module="shot",
+        sign_array=["task.id", "task.status"],
+        order_sign_array=["task.id"],
+        sign_filter_array=[["task.status", "=", "Work"]],
+        limit="20",
+        start_num="0",
+    ).json()
+
+
+@pytest.mark.parametrize("name", ["recording.jsonl", "recording.jsonl.gz"])
+def test_record_replay(tmpdir, name):
+    # type: (Any, str) -> None
+    path = str(tmpdir.join(name))
+    server = StandInServer()
+    server.add_synthetic_table("proj_test", "shot", "task", 100)
+    recorder = RecordingTransport(server.transport(), path)
+    http = HTTPClient("http://stand-in.test", recorder)
+    expected = _view_ids(http)
+    assert expected
+    http.get("")
+    recorder.close()
+
+    entries = load_recording(path)
+    assert [
+        (i["http_method"], i.get("controller"), i.get("limit")) for i in entries
+    ] == [
+        ("POST", "task", "20"),
+        ("GET", None, None),
+    ]
+
+    replay = ReplayTransport(Recording.load(path))
+    http = HTTPClient("http://other.test", replay)
+    assert _view_ids(http) == expected
+    # repeats last response.
+    assert _view_ids(http) == expected
+    assert http.get("").raw.headers["Server"] == server.server_header
+    with pytest.raises(KeyError):
+        http.call("task", "get_count", database="proj_test")
+
+    # stand-in serves recording before tables.
+    replay_server = StandInServer(recording=Recording.load(path))
+    http = HTTPClient("http://other.test", replay_server.transport())
+    assert _view_ids(http) == expected
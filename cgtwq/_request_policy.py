@@ -0,0 +1,195 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, Callable, Dict, Optional, Set, Tuple, TypeVar
+
+    T = TypeVar("T")
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from ._util import env_int, parse_yes_no
+
+# methods that never start with `get` but only read data.
+_READ_ONLY = frozenset(
+    (
+        ("c_file", "filebox_get_one_with_sign"),
+        ("c_file", "filebox_get_submit_data"),
+    )
+)
+
+
+def _is_retryable(err):
+    # type: (Exception) -> bool
+    if isinstance(err, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return getattr(err, "status_code", None) in (502, 503, 504)
+
+
+class _LatencyWindow(object):
+    def __init__(self, size=200, min_samples=20):
+        # type: (int, int) -> None
+        self._samples = deque(maxlen=size)  # type: deque[float]
+        self._min_samples = min_samples
+        self._quantiles = {}  # type: Dict[float, float]
+        self._lock = threading.Lock()
+
+    def add(self, v):
+        # type: (float) -> None
+        with self._lock:
+            self._samples.append(v)
+            if len(self._samples) % self._min_samples == 0:
+                self._quantiles.clear()
+
+    def quantile(self, q):
+        # type: (float) -> Optional[float]
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return None
+            ret = self._quantiles.get(q)
+            if ret is None:
+                samples = sorted(self._samples)
+                ret = self._quantiles[q] = samples[
+                    min(len(samples) - 1, int(q * len(samples)))
+                ]
+            return ret
+
+
+_EXECUTOR = None  # type: Optional[ThreadPoolExecutor]
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _executor():
+    # type: () -> ThreadPoolExecutor
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=32)
+        return _EXECUTOR
+
+
+class RequestPolicy:
+    """Retry and hedge read-only calls.
+
+    Methods named `get` or `get_*` are read-only, other methods
+    (e.g. `set`, `create`, `submit`, `del_in_id`) are never sent twice.
+
+    Args:
+        retries (int, optional): Max retries of read-only call on
+            connection error, timeout or 502/503/504 status.
+        backoff (float, optional): Base seconds of full jittered
+            exponential backoff between retries.
+        max_backoff (float, optional): Max seconds between retries.
+        hedge (bool, optional): Send duplicate request when read-only call
+            takes longer than `hedge_quantile` of recent latency of same method,
+            first response is used.
+        hedge_quantile (float, optional): Latency quantile to hedge after.
+        hedge_min_delay (float, optional): Min seconds to hedge after.
+    """
+
+    def __init__(
+        self,
+        retries=env_int("CGTEAMWORK_READ_RETRIES", 2),
+        backoff=0.1,
+        max_backoff=2.0,
+        hedge=parse_yes_no(os.getenv("CGTEAMWORK_HEDGE_READS") or "no"),
+        hedge_quantile=0.95,
+        hedge_min_delay=0.05,
+    ):
+        # type: (int, float, float, bool, float, float) -> None
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        # (controller, method) pairs that override default classification.
+        self.read_only = set(_READ_ONLY)  # type: Set[Tuple[Text, Text]]
+        self.mutating = set()  # type: Set[Tuple[Text, Text]]
+        self._windows = {}  # type: Dict[Tuple[Text, Text], _LatencyWindow]
+        self._lock = threading.Lock()
+
+    def is_read_only(self, controller, method):
+        # type: (Text, Text) -> bool
+        key = (controller, method)
+        if key in self.mutating:
+            return False
+        return method == "get" or method.startswith("get_") or key in self.read_only
+
+    def _window(self, controller, method):
+        # type: (Text, Text) -> _LatencyWindow
+        key = (controller, method)
+        with self._lock:
+            ret = self._windows.get(key)
+            if ret is None:
+                ret = self._windows[key] = _LatencyWindow()
+            return ret
+
+    def run(self, controller, method, send, can_hedge=True):
+        # type: (Text, Text, Callable[[], T], bool) -> T
+        """Send request by policy.
+
+        Args:
+            controller (Text): Controller name.
+            method (Text): Method name.
+            send (Callable[[], T]): Send request once.
+            can_hedge (bool, optional): Allow duplicate concurrent requests.
+
+        Returns:
+            T: Result of `send`.
+        """
+
+        if not self.is_read_only(controller, method):
+            return send()
+        window = self._window(controller, method)
+        attempt = 0
+        while True:
+            started_at = time.time()
+            delay = None
+            if self.hedge and can_hedge:
+                delay = window.quantile(self.hedge_quantile)
+            try:
+                if delay is None:
+                    ret = send()
+                else:
+                    ret = self._hedged(send, max(delay, self.hedge_min_delay))
+            except Exception as ex:  # pylint: disable=broad-except
+                if attempt >= self.retries or not _is_retryable(ex):
+                    raise
+                time.sleep(
+                    random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+                )
+                attempt += 1
+                continue
+            window.add(time.time() - started_at)
+            return ret
+
+    def _hedged(self, send, delay):
+        # type: (Callable[[], T], float) -> T
+        executor = _executor()
+        first = executor.submit(send)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+        pending = set([first, executor.submit(send)])
+        err = None  # type: Any
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for i in done:
+                err = i.exception()
+                if err is None:
+                    return i.result()
+        raise err
+
+
+DEFAULT_REQUEST_POLICY = RequestPolicy()
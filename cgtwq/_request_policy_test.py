@@ -0,0 +1,96 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List
+
+import threading
+import time
+
+import pytest
+import requests
+
+from ._http_client import CGTeamworkError, HTTPStatusError
+from ._request_policy import RequestPolicy
+
+
+class _Send:
+    def __init__(self, errors, delays=()):
+        # type: (List[Exception], List[float]) -> None
+        self.errors = list(errors)
+        self.delays = list(delays)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        # type: () -> Any
+        with self._lock:
+            self.count += 1
+            index = self.count
+            err = self.errors.pop(0) if self.errors else None
+            delay = self.delays.pop(0) if self.delays else 0
+        time.sleep(delay)
+        if err:
+            raise err
+        return index
+
+
+def _policy(**kwargs):
+    # type: (*Any) -> RequestPolicy
+    kwargs.setdefault("backoff", 0.001)
+    return RequestPolicy(**kwargs)
+
+
+def test_classify():
+    policy = _policy()
+    assert policy.is_read_only("task", "get_filter")
+    assert policy.is_read_only("c_orm", "get_with_filter")
+    assert policy.is_read_only("c_file", "filebox_get_submit_data")
+    for method in ("set", "create", "submit", "del_in_id", "set_in_id"):
+        assert not policy.is_read_only("c_orm", method)
+    policy.mutating.add(("c_orm", "get_with_filter"))
+    assert not policy.is_read_only("c_orm", "get_with_filter")
+
+
+def test_retry_read():
+    send = _Send([requests.ConnectionError(), HTTPStatusError(503)])
+    assert _policy(retries=2).run("task", "get_filter", send) == 3
+
+
+def test_retry_exhausted():
+    send = _Send([requests.Timeout()] * 3)
+    with pytest.raises(requests.Timeout):
+        _policy(retries=2).run("task", "get_filter", send)
+    assert send.count == 3
+
+
+def test_no_retry():
+    send = _Send([CGTeamworkError("error")])
+    with pytest.raises(CGTeamworkError):
+        _policy().run("task", "get_filter", send)
+    assert send.count == 1
+
+    for method in ("set", "create", "submit", "del_in_id"):
+        send = _Send([requests.ConnectionError()])
+        with pytest.raises(requests.ConnectionError):
+            _policy().run("c_orm", method, send)
+        assert send.count == 1
+
+
+def test_hedge():
+    policy = _policy(hedge=True, hedge_min_delay=0.01)
+    for _ in range(20):
+        policy.run("task", "get_filter", _Send([]))
+    send = _Send([], [1, 0])
+    started_at = time.time()
+    assert policy.run("task", "get_filter", send) == 2
+    assert time.time() - started_at < 0.5
+
+    send = _Send([requests.ConnectionError()], [0.05, 0])
+    assert policy.run("task", "get_filter", send) == 2
+
+    send = _Send([], [1, 0])
+    assert policy.run("task", "get_filter", send, can_hedge=False) == 1
@@ -0,0 +1,146 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, Dict, Hashable, Iterator, Mapping, Optional, Tuple
+
+    # url, database, module
+    _Tag = Tuple[Text, Text, Text]
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from ._util import env_float
+
+
+# opt-in, writes by legacy `cgtwq.server` do not invalidate cache.
+_DEFAULT_TTL = env_float("CGTEAMWORK_RESPONSE_CACHE_TTL", 0)
+
+# key is `controller` or `controller.method`.
+DEFAULT_TTL = {
+    "c_pipeline.get_with_filter": _DEFAULT_TTL,
+    "c_field.get_join_module_data": _DEFAULT_TTL,
+    "c_status.get_status_and_color": _DEFAULT_TTL,
+    "c_module.get_with_filter": _DEFAULT_TTL,
+    "task.get_submit_filebox_sign": _DEFAULT_TTL,
+    "etask.get_submit_filebox_sign": _DEFAULT_TTL,
+}  # type: Dict[Text, float]
+
+
+def tag_of(url, data):
+    # type: (Text, Mapping[Text, Any]) -> _Tag
+    """Invalidation tag of call payload."""
+
+    return (url, data.get("db") or data.get("database") or "", data.get("module") or "")
+
+
+class CachedResponse(object):
+    """Response served from cache."""
+
+    status_code = 200
+
+    def __init__(self, content):
+        # type: (bytes) -> None
+        self.content = content
+        self.headers = {}  # type: Dict[Text, Text]
+
+    @property
+    def text(self):
+        # type: () -> Text
+        return self.content.decode("utf-8")
+
+    def json(self):
+        # type: () -> Any
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size):
+        # type: (int) -> Iterator[bytes]
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+    def close(self):
+        # type: () -> None
+        pass
+
+
+class ResponseCache:
+    """LRU cache of successful response body with per-controller TTL.
+
+    Args:
+        max_size (int, optional): Max cached responses.
+        ttl (Mapping[Text, float], optional): TTL seconds by `controller`
+            or `controller.method`, not cached when absent.
+            Defaults to `DEFAULT_TTL`.
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        # type: (int, Optional[Mapping[Text, float]]) -> None
+        self.max_size = max_size
+        self.ttl = dict(DEFAULT_TTL if ttl is None else ttl)
+        self._entries = (
+            OrderedDict()
+        )  # type: OrderedDict[Hashable, Tuple[float, _Tag, bytes]]
+        self._lock = threading.Lock()
+
+    def ttl_of(self, controller, method):
+        # type: (Text, Text) -> float
+        ret = self.ttl.get("%s.%s" % (controller, method))
+        if ret is None:
+            ret = self.ttl.get(controller, 0)
+        return ret
+
+    def get(self, key):
+        # type: (Hashable) -> Optional[bytes]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, content = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries[key] = self._entries.pop(key)
+            return content
+
+    def put(self, key, tag, content, ttl):
+        # type: (Hashable, _Tag, bytes, float) -> None
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time() + ttl, tag, content)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tag):
+        # type: (_Tag) -> None
+        """Drop entries of the module and entries of its database
+        that not bound to a module.
+
+        Without module, all entries of the database are dropped,
+        without database, all entries of the url are dropped.
+        """
+
+        url, database, module = tag
+        with self._lock:
+            for key, (_, (entry_url, entry_database, entry_module), _) in list(
+                self._entries.items()
+            ):
+                if entry_url != url:
+                    continue
+                if not database or (
+                    entry_database == database
+                    and (not module or entry_module in ("", module))
+                ):
+                    del self._entries[key]
+
+    def clear(self):
+        # type: () -> None
+        with self._lock:
+            self._entries.clear()
+
+
+DEFAULT_RESPONSE_CACHE = ResponseCache()
@@ -0,0 +1,83 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text
+
+import time
+
+import pytest
+
+from ._fake_transport import FakeTransport
+from ._http_client import CGTeamworkError, HTTPClient
+from ._response_cache import ResponseCache
+from ._user_token import UserToken
+
+
+def _http(**ttl):
+    # type: (*float) -> HTTPClient
+    http = HTTPClient("http://127.0.0.1:8080", FakeTransport())
+    http.response_cache = ResponseCache(max_size=3, ttl=ttl)
+    return http
+
+
+def _get(http, module="shot", **kwargs):
+    # type: (HTTPClient, Text, *Any) -> Any
+    return http.call(
+        "c_pipeline", "get_with_filter", db="proj_test", module=module, **kwargs
+    ).json()
+
+
+def test_cache():
+    http = _http(c_pipeline=10)
+    assert _get(http) == [1]
+    assert _get(http) == [1]
+    assert _get(http, "asset") == [2]
+    assert _get(http, limit="1") == [3]
+    http.token = UserToken("user2", "token2")
+    assert _get(http) == [4]
+    # evicted by LRU
+    assert _get(http, "asset") == [5]
+    assert len(http._transport.requests) == 5  # type: ignore
+
+
+def test_ttl():
+    http = _http(**{"c_pipeline.get_with_filter": 0.05, "c_pipeline": 10})
+    assert _get(http) == [1]
+    assert _get(http) == [1]
+    time.sleep(0.06)
+    assert _get(http) == [2]
+    assert http.call("c_status", "get_status_and_color").json() == [3]
+    assert http.call("c_status", "get_status_and_color").json() == [4]
+
+
+def test_mutation_safe():
+    http = _http(c_pipeline=10)
+    _get(http).append(2)
+    assert _get(http) == [1]
+
+
+def test_error_not_cached():
+    http = _http(c_pipeline=10)
+    http._transport.code = "2"  # type: ignore
+    with pytest.raises(CGTeamworkError):
+        _get(http)
+    http._transport.code = "1"  # type: ignore
+    assert _get(http) == [2]
+
+
+def test_invalidate():
+    http = _http(c_pipeline=10, c_module=10)
+    assert _get(http) == [1]
+    assert _get(http, "asset") == [2]
+    assert http.call("c_module", "get_with_filter", db="proj_test").json() == [3]
+    http.call("task", "set", db="proj_test", module="shot").json()
+    assert _get(http) == [5]
+    assert _get(http, "asset") == [2]
+    assert http.call("c_module", "get_with_filter", db="proj_test").json() == [6]
+    http.call("c_orm", "create", db="proj_test").json()
+    assert _get(http, "asset") == [8]
+    assert not http.request_policy.is_read_only("c_orm", "create")
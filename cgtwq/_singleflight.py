@@ -0,0 +1,57 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+    T = TypeVar("T")
+
+import threading
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None  # type: Any
+        self.error = None  # type: Optional[BaseException]
+
+
+class SingleFlight:
+    """Share one execution between concurrent calls with same key."""
+
+    def __init__(self):
+        self._calls = {}  # type: Dict[Hashable, _Call]
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        # type: (Hashable, Callable[[], T]) -> T
+        """Call `fn`, or wait for the in-flight call of same key
+        and get its result or exception.
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as ex:
+            call.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+DEFAULT_SINGLEFLIGHT = SingleFlight()
@@ -0,0 +1,115 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, List
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ._fake_transport import FakeTransport
+from ._http_client import CGTeamworkError, HTTPClient
+from ._instrumentation import add_sink, remove_sink
+from ._singleflight import SingleFlight
+
+
+def _http():
+    # type: () -> HTTPClient
+    transport = FakeTransport()
+    transport.gate = threading.Event()
+    http = HTTPClient("http://127.0.0.1:8080", transport)
+    http.response_cache = None
+    http.singleflight = SingleFlight()
+    return http
+
+
+def _concurrent(http, fn, n=4):
+    # type: (HTTPClient, Callable[[], Any], int) -> List[Any]
+    """Run `fn` in threads, release transport after all threads joined."""
+
+    def _result():
+        # type: () -> Any
+        try:
+            return fn()
+        except Exception as ex:
+            return ex
+
+    transport = http._transport  # type: Any
+    with ThreadPoolExecutor(n) as executor:
+        futures = [executor.submit(_result) for _ in range(n)]
+        time.sleep(0.1)
+        transport.gate.set()
+        return [i.result() for i in futures]
+
+
+def test_singleflight():
+    sf = SingleFlight()
+    assert sf.do("a", lambda: 1) == 1
+    assert sf.do("a", lambda: 2) == 2
+    with pytest.raises(ValueError):
+        sf.do("a", lambda: int("x"))
+    assert not sf._calls  # type: ignore
+
+
+def test_share_read():
+    http = _http()
+    results = _concurrent(
+        http, lambda: http.call("c_orm", "get_with_filter", db="proj_test").json()
+    )
+    assert results == [[1]] * 4
+    assert len(http._transport.requests) == 1  # type: ignore
+
+
+def test_share_read_own_response():
+    http = _http()
+    records = []  # type: List[Any]
+    add_sink(records.append)
+    try:
+        results = _concurrent(
+            http, lambda: http.call("c_orm", "get_with_filter", db="proj_test")
+        )
+        assert len(set(id(i) for i in results)) == 4
+        assert [i.json() for i in results] == [[1]] * 4
+    finally:
+        remove_sink(records.append)
+    assert len(records) == 1
+
+
+def test_share_error():
+    http = _http()
+    http._transport.code = "2"  # type: ignore
+    results = _concurrent(
+        http, lambda: http.call("c_orm", "get_with_filter", db="proj_test").json()
+    )
+    assert all(isinstance(i, CGTeamworkError) for i in results)
+    assert len(http._transport.requests) == 1  # type: ignore
+
+
+def test_different_payload():
+    http = _http()
+    count = [0]
+    lock = threading.Lock()
+
+    def _call():
+        # type: () -> Any
+        with lock:
+            count[0] += 1
+            limit = count[0]
+        return http.call(
+            "c_orm", "get_with_filter", db="proj_test", limit=str(limit)
+        ).json()
+
+    _concurrent(http, _call)
+    assert len(http._transport.requests) == 4  # type: ignore
+
+
+def test_mutating_not_shared():
+    http = _http()
+    _concurrent(http, lambda: http.call("c_orm", "set_in_id", db="proj_test").json())
+    assert len(http._transport.requests) == 4  # type: ignore
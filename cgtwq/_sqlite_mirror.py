@@ -0,0 +1,249 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, Sequence, Iterator, Dict, List, Tuple
+    from ._client import Client
+    from ._columns import Column
+    from ._table_view import CountableTableView
+
+import json
+import sqlite3
+import threading
+
+from ._columns import ColumnsBuilder
+from ._filter import NULL_FILTER, Filter
+from ._filter_sql import filter_to_sql, quote_identifier, register_functions
+from ._row_id import RowID
+from ._util import text_type
+
+
+def _encode_value(v):
+    # type: (Any) -> Any
+    if v is None or isinstance(v, (text_type, str, int, float)):
+        return v
+    return json.dumps(v, sort_keys=True)
+
+
+class SQLiteMirror:
+    """Mirror fields of a module into a local sqlite database.
+
+    Mirrored rows are queried with the same filter syntax as server,
+    by `table`.
+
+    Args:
+        client (Client): Client used to fetch rows.
+        database (Text): Database name.
+        module (Text): Module name.
+        module_type (Text): Module type.
+        fields (Sequence[Text]): Fields to mirror, `<module_type>.id` is always
+            included.
+        path (Text, optional): Sqlite file path, defaults to in-memory database.
+        update_time_field (Text, optional): Last update time field,
+            enables incremental refresh when given.
+
+    Non-scalar values (e.g. image, message) are stored as JSON text.
+    Existing mirror at `path` is rebuilt when mirrored fields changed.
+    """
+
+    def __init__(
+        self,
+        client,
+        database,
+        module,
+        module_type,
+        fields,
+        path=":memory:",
+        update_time_field="",
+    ):
+        # type: (Client, Text, Text, Text, Sequence[Text], Text, Text) -> None
+        self._client = client
+        self._database = database
+        self._module = module
+        self._module_type = module_type
+        self._id_field = "%s.id" % (module_type,)
+        self._update_time_field = update_time_field
+        fields = [i for i in fields if i != self._id_field]
+        if update_time_field and update_time_field not in fields:
+            fields.append(update_time_field)
+        self._fields = tuple([self._id_field] + fields)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA case_sensitive_like = ON")
+        register_functions(self._conn)
+        self._init_schema()
+
+    def _init_schema(self):
+        columns = ", ".join(
+            "%s%s" % (quote_identifier(i), " PRIMARY KEY" if index == 0 else "")
+            for index, i in enumerate(self._fields)
+        )
+        fields = json.dumps(self._fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key PRIMARY KEY, value)"
+            )
+            if self._get_meta("fields") != fields:
+                # mirrored rows miss new fields, re-fetch all.
+                self._conn.execute("DROP TABLE IF EXISTS data")
+                self._conn.execute("DELETE FROM meta")
+                self._set_meta("fields", fields)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS data (%s)" % (columns,))
+            for i in self._fields[1:]:
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS %s ON data (%s)"
+                    % (quote_identifier("index_" + i), quote_identifier(i))
+                )
+
+    def close(self):
+        # type: () -> None
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def fields(self):
+        return self._fields
+
+    def _get_meta(self, key, default=""):
+        # type: (Text, Any) -> Any
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return default
+        return row[0]
+
+    def _set_meta(self, key, value):
+        # type: (Text, Any) -> None
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def refresh(self, full=False):
+        # type: (bool) -> int
+        """Fetch changes from server.
+
+        Args:
+            full (bool, optional): Re-fetch all rows, required to drop
+                rows that deleted on server. Defaults to False, rows updated
+                after last refresh are fetched when `update_time_field` is set.
+
+        Returns:
+            int: Fetched row count.
+        """
+
+        last_update = ""
+        if self._update_time_field and not full:
+            with self._lock:
+                last_update = self._get_meta("last_update_time")
+        filter_by = NULL_FILTER
+        if last_update:
+            # include same time, row may updated after last refresh in same second.
+            filter_by = Filter(self._update_time_field, ">=", last_update)
+        rows = [
+            tuple(_encode_value(v) for v in i)
+            for i in self._client.table(
+                self._database,
+                self._module,
+                self._module_type,
+                filter_by=filter_by,
+            ).rows(*self._fields)
+        ]
+        insert = "INSERT OR REPLACE INTO data VALUES (%s)" % (
+            ", ".join("?" * len(self._fields))
+        )
+        with self._lock, self._conn:
+            if not last_update:
+                self._conn.execute("DELETE FROM data")
+            self._conn.executemany(insert, rows)
+            if self._update_time_field:
+                (latest,) = self._conn.execute(
+                    "SELECT max(%s) FROM data"
+                    % (quote_identifier(self._update_time_field),)
+                ).fetchone()
+                self._set_meta("last_update_time", latest or "")
+        return len(rows)
+
+    def table(self, filter_by=NULL_FILTER):
+        # type: (Filter) -> CountableTableView
+        return SQLiteTableView(self, filter_by)
+
+    def row_id(self, value):
+        # type: (Text) -> RowID
+        return RowID(self._database, self._module, self._module_type, value)
+
+    def column_sql(self, field):
+        # type: (Text) -> Text
+        if field not in self._fields:
+            raise ValueError("field not mirrored: %s" % (field,))
+        return quote_identifier(field)
+
+    def query(self, sql, filter_by, suffix=""):
+        # type: (Text, Filter, Text) -> List[Tuple[Any, ...]]
+        """Execute select query on mirrored data.
+
+        Args:
+            sql (Text): Select statement without where clause.
+            filter_by (Filter): Filter to apply.
+            suffix (Text, optional): SQL after where clause.
+
+        Returns:
+            List[Tuple[Any, ...]]: Result rows.
+        """
+
+        args = []  # type: List[Any]
+        if filter_by is not NULL_FILTER:
+            where, args = filter_to_sql(filter_by, self.column_sql)
+            sql += " WHERE " + where
+        if suffix:
+            sql += " " + suffix
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+
+class SQLiteTableView:
+    def __init__(self, mirror, filter_by):
+        # type: (SQLiteMirror, Filter) -> None
+        self._mirror = mirror
+        self._filter_by = filter_by
+
+    def __iter__(self):
+        for id in self.column(self._mirror.fields[0]):
+            yield self._mirror.row_id(id)
+
+    def rows(self, *fields):
+        # type: (Text) -> Iterator[Sequence[Text]]
+        sql = "SELECT %s FROM data" % (
+            ", ".join(self._mirror.column_sql(i) for i in fields),
+        )
+        return iter(self._mirror.query(sql, self._filter_by))
+
+    def column(self, field):
+        # type: (Text) -> Iterator[Text]
+        for (i,) in self.rows(field):
+            yield i
+
+    def columns(self, *fields, **kwargs):
+        # type: (Text, *Any) -> Dict[Text, Column]
+        builder = ColumnsBuilder.from_kwargs(fields, kwargs)
+        builder.extend_rows(self.rows(*fields))
+        return builder.build()
+
+    def count(self):
+        # type: () -> int
+        ((ret,),) = self._mirror.query("SELECT count(*) FROM data", self._filter_by)
+        return ret
+
+    def exists(self):
+        # type: () -> bool
+        return bool(
+            self._mirror.query("SELECT 1 FROM data", self._filter_by, "LIMIT 1")
+        )
+
+
+def _(v):
+    # type: (SQLiteTableView) -> CountableTableView
+    return v
@@ -0,0 +1,146 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List, Text, Dict
+
+import pytest
+
+from ._field_sign import FieldSign as F
+from ._filter import NULL_FILTER, Filter
+from ._row_id import RowID
+from ._sqlite_mirror import SQLiteMirror
+
+
+class _FakeTable:
+    def __init__(self, rows, filter_by):
+        # type: (List[Dict[Text, Any]], Filter) -> None
+        self._rows = rows
+        self._filter_by = filter_by
+
+    def rows(self, *fields):
+        # type: (Text) -> Any
+        rows = self._rows
+        if self._filter_by is not NULL_FILTER:
+            assert self._filter_by.op == ">="
+            rows = [i for i in rows if i[self._filter_by.left] >= self._filter_by.right]
+        return [tuple(i[j] for j in fields) for i in rows]
+
+
+class _FakeClient:
+    def __init__(self):
+        self.rows = []  # type: List[Dict[Text, Any]]
+        self.filters = []  # type: List[Filter]
+
+    def table(self, database, module, module_type, filter_by=NULL_FILTER):
+        # type: (Text, Text, Text, Filter) -> _FakeTable
+        self.filters.append(filter_by)
+        return _FakeTable(self.rows, filter_by)
+
+
+def _row(id, status, time):
+    # type: (Text, Text, Text) -> Dict[Text, Any]
+    return {
+        "task.id": id,
+        "task.status": status,
+        "task.image": {"max": id} if status == "Approve" else None,
+        "task.last_update_time": time,
+    }
+
+
+def test_refresh_and_query(tmp_path):
+    # type: (Any) -> None
+    client = _FakeClient()
+    client.rows = [
+        _row("1", "Wait", "2021-01-01 00:00:00"),
+        _row("2", "Approve", "2021-01-02 00:00:00"),
+    ]
+    mirror = SQLiteMirror(
+        client,  # type: ignore
+        "proj_test",
+        "shot",
+        "task",
+        ["task.status", "task.image"],
+        path=str(tmp_path / "mirror.db"),
+        update_time_field="task.last_update_time",
+    )
+    assert mirror.fields == (
+        "task.id",
+        "task.status",
+        "task.image",
+        "task.last_update_time",
+    )
+    assert mirror.refresh() == 2
+    assert client.filters[-1] is NULL_FILTER
+
+    client.rows[0] = _row("1", "Approve", "2021-01-03 00:00:00")
+    client.rows.append(_row("3", "Check", "2021-01-03 00:00:00"))
+    assert mirror.refresh() == 3
+    assert client.filters[-1].as_payload() == [
+        ["task.last_update_time", ">=", "2021-01-02 00:00:00"]
+    ]
+
+    approved = mirror.table(F("task.status").equal("Approve"))
+    assert approved.count() == 2
+    assert set(approved) == {
+        RowID("proj_test", "shot", "task", "1"),
+        RowID("proj_test", "shot", "task", "2"),
+    }
+    assert set(approved.column("task.image")) == {'{"max": "1"}', '{"max": "2"}'}
+    assert mirror.table().count() == 3
+    assert mirror.table(F("task.status").in_(["Wait"])).exists() is False
+    assert mirror.table(F("task.id").has("%")).columns(
+        "task.status", dictionary=["task.status"]
+    )["task.status"].values == ["Approve", "Check"]
+    with pytest.raises(ValueError):
+        mirror.table(F("task.artist").equal("")).count()
+
+    client.rows.pop()
+    assert mirror.refresh(full=True) == 2
+    assert mirror.table().count() == 2
+
+
+def test_fields_changed(tmp_path):
+    # type: (Any) -> None
+    client = _FakeClient()
+    client.rows = [_row("1", "Wait", "2021-01-01 00:00:00")]
+    path = str(tmp_path / "mirror.db")
+
+    def _mirror(fields):
+        # type: (List[Text]) -> SQLiteMirror
+        return SQLiteMirror(
+            client,  # type: ignore
+            "proj_test",
+            "shot",
+            "task",
+            fields,
+            path=path,
+            update_time_field="task.last_update_time",
+        )
+
+    mirror = _mirror(["task.status"])
+    assert mirror.refresh() == 1
+    mirror.close()
+
+    mirror = _mirror(["task.status"])
+    assert mirror.table().count() == 1
+    mirror.refresh()
+    assert client.filters[-1] is not NULL_FILTER
+    mirror.close()
+
+    mirror = _mirror(["task.status", "task.image"])
+    assert mirror.table().count() == 0
+    assert mirror.refresh() == 1
+    assert client.filters[-1] is NULL_FILTER
+    assert list(mirror.table().rows("task.image")) == [(None,)]
+    indexes = {
+        i
+        for (i,) in mirror.query(
+            "SELECT name FROM sqlite_master", NULL_FILTER, "WHERE type = 'index'"
+        )
+    }
+    assert "index_task.image" in indexes
+    mirror.close()
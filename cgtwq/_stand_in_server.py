@@ -0,0 +1,445 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""Local stand-in of CGTeamWork server, for offline tests and benchmarks.
+
+Serves tables from sqlite with `_filter_sql`, or replays a recording.
+Supported `api.php` methods:
+
+- `c_orm`: `get_with_filter`, `get_count_with_filter`, `get_in_id`, `set_in_id`
+- `info`, `task`, `etask`, `account`, `project`:
+  `get_filter`, `get_count`, `get_in_id`, `set`
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import (
+        Any,
+        Text,
+        Dict,
+        List,
+        Tuple,
+        Optional,
+        Iterable,
+        Sequence,
+        Set,
+    )
+    from ._transport import Response
+
+    _Table = Tuple[Text, Text, Text]
+
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+
+from six.moves import BaseHTTPServer, socketserver  # type: ignore
+from six.moves.urllib.parse import parse_qs  # type: ignore
+
+from ._filter import Filter
+from ._filter_sql import filter_to_sql, quote_identifier, register_functions
+from ._recording_transport import (  # type: ignore
+    Recording,
+    RecordedResponse,
+    _path,
+    _payload,
+)
+from ._util import text_type
+
+_V7_CONTROLLERS = ("info", "task", "etask", "account", "project")
+
+
+def filter_from_payload(payload):
+    # type: (Sequence[Any]) -> Filter
+    """Build filter chain from `sign_filter_array` payload."""
+
+    if payload and isinstance(payload[0], (str, text_type)):
+        payload = [payload]
+    ret = None  # type: Optional[Filter]
+    logic = "and"
+    for i in payload:
+        if isinstance(i, (str, text_type)):
+            logic = i
+            continue
+        left, op, right = i
+        node = Filter(left, op, right)
+        ret = node if ret is None else ret.chain(logic, node)
+        logic = "and"
+    if ret is None:
+        raise ValueError("empty filter")
+    return ret
+
+
+class StandInServer(object):
+    """In-process CGTeamWork stand-in.
+
+    Args:
+        latency (float, optional): Seconds to wait before each response.
+        latency_per_row (float, optional): Extra seconds per returned row.
+        max_page_size (int, optional): Cap `limit` of row queries,
+            simulate server truncating large pages, `0` for no cap.
+        server_header (Text, optional): `Server` header of `GET /`,
+            decides detected compat level.
+        recording (Recording, optional): Recorded responses,
+            served before tables.
+    """
+
+    def __init__(
+        self,
+        latency=0.0,
+        latency_per_row=0.0,
+        max_page_size=0,
+        server_header="nginx/1.19.9",
+        recording=None,
+    ):
+        # type: (float, float, int, Text, Optional[Recording]) -> None
+        self.latency = latency
+        self.latency_per_row = latency_per_row
+        self.max_page_size = max_page_size
+        self.server_header = server_header
+        self.recording = recording
+        self.request_count = 0
+        self._db = sqlite3.connect(":memory:", check_same_thread=False)
+        self._db.execute("PRAGMA case_sensitive_like = ON")
+        register_functions(self._db)
+        self._lock = threading.Lock()
+        self._tables = {}  # type: Dict[_Table, Tuple[Text, List[Text]]]
+        self._indexes = set()  # type: Set[Tuple[Text, Text]]
+        self._http_server = None  # type: Any
+
+    def add_table(self, database, module, module_type, fields, rows=()):
+        # type: (Text, Text, Text, Sequence[Text], Iterable[Sequence[Any]]) -> None
+        """Add table, id field `{module_type}.id` is added when not in `fields`."""
+
+        id_field = "%s.id" % (module_type,)
+        fields = list(fields)
+        if id_field not in fields:
+            fields.insert(0, id_field)
+            rows = ([text_type(uuid.uuid4())] + list(i) for i in rows)
+        name = quote_identifier("%s/%s/%s" % (database, module, module_type))
+        with self._lock:
+            self._db.execute(
+                "CREATE TABLE %s (%s, PRIMARY KEY (%s))"
+                % (
+                    name,
+                    ", ".join(quote_identifier(i) for i in fields),
+                    quote_identifier(id_field),
+                )
+            )
+            self._tables[(database, module, module_type)] = (name, fields)
+        self.add_rows(database, module, module_type, rows)
+
+    def add_rows(self, database, module, module_type, rows):
+        # type: (Text, Text, Text, Iterable[Sequence[Any]]) -> None
+        """Insert rows in table field order, e.g. simulate edits of other users."""
+
+        name, fields = self._table(database, module, module_type)
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO %s VALUES (%s)" % (name, ", ".join("?" * len(fields))),
+                rows,
+            )
+
+    def add_synthetic_table(
+        self,
+        database,
+        module,
+        module_type,
+        row_count,
+        fields=("entity", "pipeline", "artist", "status"),
+        seed=0,
+    ):
+        # type: (Text, Text, Text, int, Sequence[Text], int) -> None
+        """Add table of `row_count` generated rows.
+
+        Fields are prefixed with `module_type`, `status` and `pipeline`
+        have low cardinality like real data.
+        """
+
+        rnd = random.Random(seed)
+        choices = {
+            "status": ["Wait", "Work", "Check", "Approve", "Retake"],
+            "pipeline": ["Layout", "Animation", "Lighting", "Compositing"],
+            "artist": ["artist%02d" % i for i in range(30)],
+        }  # type: Dict[Text, List[Text]]
+
+        def _value(field, index):
+            # type: (Text, int) -> Text
+            if field in choices:
+                return rnd.choice(choices[field])
+            return "%s%06d" % (field, index)
+
+        self.add_table(
+            database,
+            module,
+            module_type,
+            ["%s.%s" % (module_type, i) for i in fields],
+            ([_value(field, index) for field in fields] for index in range(row_count)),
+        )
+
+    def _table(self, database, module, module_type):
+        # type: (Text, Text, Text) -> Tuple[Text, List[Text]]
+        try:
+            return self._tables[(database, module, module_type)]
+        except KeyError:
+            raise ValueError(
+                "no such table: %s.%s.%s" % (database, module, module_type)
+            )
+
+    def _where(self, module_type, fields, payload):
+        # type: (Text, Sequence[Text], Any) -> Tuple[Text, List[Any]]
+        if not payload:
+            return "1", []
+
+        def _column(sign):
+            # type: (Text) -> Text
+            if sign == "#id":
+                sign = "%s.id" % (module_type,)
+            if sign not in fields:
+                raise ValueError("unknown field: %s" % (sign,))
+            return quote_identifier(sign)
+
+        return filter_to_sql(filter_from_payload(payload), _column)
+
+    def _ensure_index(self, name, columns):
+        # type: (Text, Text) -> None
+        """Index order columns, so paging does not sort whole table,
+        like indexed real database.
+        """
+
+        key = (name, columns)
+        with self._lock:
+            if key in self._indexes:
+                return
+            self._db.execute(
+                "CREATE INDEX %s ON %s (%s)"
+                % (quote_identifier("index%d" % len(self._indexes)), name, columns)
+            )
+            self._indexes.add(key)
+
+    def _select(self, table, data, where, params):
+        # type: (_Table, Dict[Text, Any], Text, List[Any]) -> List[Sequence[Any]]
+        name, fields = self._table(*table)
+        sign_array = data.get("sign_array") or fields
+        for i in list(sign_array) + list(data.get("order_sign_array") or []):
+            if i not in fields:
+                raise ValueError("unknown field: %s" % (i,))
+        sql = "SELECT %s FROM %s WHERE %s" % (
+            ", ".join(quote_identifier(i) for i in sign_array),
+            name,
+            where,
+        )
+        order = ", ".join(
+            quote_identifier(i) for i in data.get("order_sign_array") or []
+        )
+        if order:
+            sql += " ORDER BY " + order
+            self._ensure_index(name, order)
+        limit = int(data.get("limit") or 0) or -1
+        if self.max_page_size and (limit < 0 or limit > self.max_page_size):
+            limit = self.max_page_size
+        sql += " LIMIT ? OFFSET ?"
+        params = params + [limit, int(data.get("start_num") or 0)]
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _rows(self, table, data, where, params, as_dict):
+        # type: (_Table, Dict[Text, Any], Text, List[Any], bool) -> List[Any]
+        rows = self._select(table, data, where, params)
+        if self.latency_per_row:
+            time.sleep(self.latency_per_row * len(rows))
+        sign_array = data.get("sign_array") or self._table(*table)[1]
+        if as_dict:
+            return [dict(zip(sign_array, i)) for i in rows]
+        return [list(i) for i in rows]
+
+    def _in_id(self, table, data):
+        # type: (_Table, Dict[Text, Any]) -> Tuple[Text, List[Any]]
+        ids = list(data.get("id_array") or [])
+        if not ids:
+            return "0", []
+        return (
+            "%s IN (%s)"
+            % (quote_identifier("%s.id" % (table[2],)), ", ".join("?" * len(ids))),
+            ids,
+        )
+
+    def _set(self, table, data):
+        # type: (_Table, Dict[Text, Any]) -> bool
+        name, fields = self._table(*table)
+        sign_data = data.get("sign_data_array") or {}
+        for i in sign_data:
+            if i not in fields:
+                raise ValueError("unknown field: %s" % (i,))
+        where, params = self._in_id(table, data)
+        with self._lock:
+            self._db.execute(
+                "UPDATE %s SET %s WHERE %s"
+                % (
+                    name,
+                    ", ".join("%s = ?" % quote_identifier(i) for i in sign_data),
+                    where,
+                ),
+                list(sign_data.values()) + params,
+            )
+        return True
+
+    def _count(self, table, data):
+        # type: (_Table, Dict[Text, Any]) -> Text
+        name, fields = self._table(*table)
+        where, params = self._where(table[2], fields, data.get("sign_filter_array"))
+        with self._lock:
+            (count,) = self._db.execute(
+                "SELECT COUNT(*) FROM %s WHERE %s" % (name, where), params
+            ).fetchone()
+        return "%d" % (count,)
+
+    def call(self, data):
+        # type: (Dict[Text, Any]) -> Any
+        """Handle `api.php` payload, returns `data` of response envelope."""
+
+        controller = data.get("controller")
+        method = data.get("method")
+        if controller == "c_orm":
+            table = (data.get("db"), data.get("module"), data.get("module_type"))
+            as_dict = False
+        elif controller in _V7_CONTROLLERS:
+            module_type = "task" if controller == "etask" else controller
+            if controller in ("account", "project"):
+                module_type = "info"
+            table = (
+                data.get("database") or data.get("db") or "public",
+                data.get("module") or controller,
+                module_type,
+            )
+            as_dict = True
+        else:
+            raise ValueError("unsupported controller: %s" % (controller,))
+        table = tuple(text_type(i) for i in table)  # type: ignore
+
+        if method in ("get_with_filter", "get_filter"):
+            _, fields = self._table(*table)  # type: ignore
+            where, params = self._where(
+                table[2], fields, data.get("sign_filter_array")  # type: ignore
+            )
+            return self._rows(table, data, where, params, as_dict)  # type: ignore
+        if method == "get_in_id":
+            where, params = self._in_id(table, data)  # type: ignore
+            return self._rows(table, data, where, params, as_dict)  # type: ignore
+        if method in ("get_count_with_filter", "get_count"):
+            return self._count(table, data)  # type: ignore
+        if method in ("set_in_id", "set"):
+            return self._set(table, data)  # type: ignore
+        raise ValueError("unsupported method: %s.%s" % (controller, method))
+
+    def handle(self, http_method, path, payload):
+        # type: (Text, Text, Any) -> Tuple[int, Dict[Text, Text], bytes]
+        """Handle http request, returns status, headers and body."""
+
+        self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        headers = {"Server": self.server_header}
+        if self.recording:
+            found = self.recording.find(http_method, path, payload)
+            if found:
+                status, recorded_headers, content, _ = found
+                headers.update(recorded_headers)
+                return status, headers, content
+        if http_method == "GET" and path in ("", "index.php"):
+            return 200, headers, b""
+        if http_method != "POST" or path != "api.php":
+            return 404, headers, b""
+        try:
+            body = {"code": "1", "type": "json", "data": self.call(payload)}
+        except Exception as ex:  # pylint: disable=broad-except
+            body = {"code": "2", "type": "msg", "data": text_type(ex)}
+        headers["Content-Type"] = "application/json"
+        return 200, headers, json.dumps(body).encode("utf-8")
+
+    def transport(self):
+        # type: () -> StandInTransport
+        """Transport that calls this server in process, without socket."""
+
+        return StandInTransport(self)
+
+    def serve(self, host="127.0.0.1", port=0):
+        # type: (Text, int) -> Text
+        """Serve on http in background thread, returns url."""
+
+        server = self
+
+        class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def version_string(self):
+                # type: () -> Text
+                return server.server_header
+
+            def log_message(self, *args):
+                # type: (*Any) -> None
+                pass
+
+            def _respond(self, http_method, payload):
+                # type: (Text, Any) -> None
+                status, headers, content = server.handle(
+                    http_method, self.path.split("?")[0].lstrip("/"), payload
+                )
+                self.send_response(status)
+                for k, v in headers.items():
+                    if k.lower() != "server":
+                        self.send_header(k, v)
+                self.send_header("Content-Length", "%d" % (len(content),))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                # type: () -> None
+                self._respond("GET", None)
+
+            def do_POST(self):
+                # type: () -> None
+                size = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(size).decode("utf-8"))  # type: ignore
+                payload = None
+                if "data" in form:
+                    payload = json.loads(form["data"][0])  # type: ignore
+                self._respond("POST", payload)
+
+        class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+            daemon_threads = True
+
+        self._http_server = _Server((host, port), _Handler)
+        thread = threading.Thread(target=self._http_server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return "http://%s:%d" % self._http_server.server_address[:2]
+
+    def close(self):
+        # type: () -> None
+        if self._http_server:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+
+
+class StandInTransport(object):
+    """Transport that calls `StandInServer` in process."""
+
+    def __init__(self, server):
+        # type: (StandInServer) -> None
+        self.server = server
+
+    def request(self, method, url, **kwargs):
+        # type: (Text, Text, *Any) -> Response
+        status, headers, content = self.server.handle(
+            method.upper(), _path(url), _payload(kwargs)
+        )
+        return RecordedResponse(status, headers, content)
+
+    def close(self):
+        # type: () -> None
+        pass
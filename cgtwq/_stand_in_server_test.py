@@ -0,0 +1,101 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Iterator
+
+import pytest
+
+from . import _transport_impl
+from ._client_impl import ClientImpl
+from ._field_sign import FieldSign
+from ._row_id import RowID
+from ._stand_in_server import StandInServer, filter_from_payload
+
+
+@pytest.fixture(name="server")
+def _server():
+    # type: () -> Iterator[StandInServer]
+    server = StandInServer()
+    server.add_synthetic_table("proj_test", "shot", "task", 250)
+    yield server
+    server.close()
+
+
+def _client(server, monkeypatch, url="http://stand-in.test"):
+    # type: (StandInServer, Any, str) -> ClientImpl
+    monkeypatch.setitem(
+        _transport_impl._TRANSPORTS,  # type: ignore
+        url,
+        server.transport(),
+    )
+    client = ClientImpl(url)
+    client._http.response_cache = None  # type: ignore
+    return client
+
+
+def test_filter_from_payload():
+    f = (
+        FieldSign("a")
+        .equal("1")
+        .or_(FieldSign("b").has("2").and_(FieldSign("c").in_(["3"])))
+    )
+    assert filter_from_payload(f.as_payload()).as_payload() == f.as_payload()
+    assert filter_from_payload(["a", "=", "1"]).as_payload() == [["a", "=", "1"]]
+
+
+def test_table(server, monkeypatch):
+    # type: (StandInServer, Any) -> None
+    client = _client(server, monkeypatch)
+    view = client.table("proj_test", "shot", "task")
+    view.page_size = 100
+    ids = list(view.column("task.id"))
+    assert len(ids) == 250
+    assert view.count() == 250
+    status = FieldSign("task.status")
+    approved = client.table(
+        "proj_test", "shot", "task", filter_by=status.equal("Approve")
+    )
+    # v5.2 and v6.1 rows are lists.
+    rows = [tuple(i) for i in approved.rows("task.id", "task.status")]
+    assert rows
+    assert all(i[1] == "Approve" for i in rows)
+    assert approved.count() == len(rows)
+
+    client.set([RowID("proj_test", "shot", "task", ids[0])], {"task.status": "Approve"})
+    assert approved.count() == len(rows) + (0 if (ids[0], "Approve") in rows else 1)
+
+
+def test_page_cap_and_error(server, monkeypatch):
+    # type: (StandInServer, Any) -> None
+    server.max_page_size = 30
+    client = _client(server, monkeypatch)
+    view = client.table("proj_test", "shot", "task")
+    view.page_size = 100
+    # truncated page ends scan early, like server limits.
+    assert len(list(view.column("task.id"))) == 30
+    with pytest.raises(Exception, match="unknown field"):
+        list(view.column("task.missing"))
+
+
+def test_legacy_level(monkeypatch):
+    # type: (Any) -> None
+    server = StandInServer(server_header="nginx/1.15.9")
+    server.add_synthetic_table("proj_test", "shot", "task", 10)
+    monkeypatch.setattr(ClientImpl, "default_version", "")
+    client = _client(server, monkeypatch, "http://stand-in-6-1.test")
+    assert client._compat.level == client._compat.LEVEL_6_1  # type: ignore
+    view = client.table("proj_test", "shot", "task")
+    assert len(list(view.rows("task.id", "task.entity"))) == 10
+    assert view.count() == 10
+
+
+def test_serve(server):
+    # type: (StandInServer) -> None
+    url = server.serve()
+    client = ClientImpl(url)
+    client._http.response_cache = None  # type: ignore
+    assert len(list(client.table("proj_test", "shot", "task").column("task.id"))) == 250
@@ -3,11 +3,23 @@
 
 from __future__ import annotations
 
-from typing import Iterator, Sequence, Protocol
+from typing import Iterable, Iterator, Sequence, Protocol
 
+from ._columns import Column
 from ._row_id import RowID
 
 class TableView(Protocol):
     def __iter__(self) -> Iterator[RowID]: ...
     def rows(self, *fields: str) -> Iterator[Sequence[str]]: ...
     def column(self, field: str) -> Iterator[str]: ...
+    def columns(
+        self,
+        *fields: str,
+        numeric: Iterable[str] = ...,
+        dictionary: Iterable[str] = ...,
+        numpy: bool = ...,
+    ) -> dict[str, Column]: ...
+
+class CountableTableView(TableView, Protocol):
+    def count(self) -> int: ...
+    def exists(self) -> bool: ...
@@ -0,0 +1,25 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict
+
+from __future__ import annotations
+
+from typing import Any, Iterator, Mapping, Protocol
+
+class Response(Protocol):
+    @property
+    def status_code(self) -> int: ...
+    @property
+    def headers(self) -> Mapping[str, str]: ...
+    @property
+    def content(self) -> bytes: ...
+    @property
+    def text(self) -> str: ...
+    def json(self) -> Any: ...
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]: ...
+    def close(self) -> None: ...
+
+class Transport(Protocol):
+    def request(self, method: str, url: str, **kwargs: Any) -> Response:
+        """Send request, keyword arguments follows `requests.request`."""
+        ...
+    def close(self) -> None: ...
@@ -0,0 +1,123 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""Shared HTTP transports, one per server origin.
+
+`HTTPClient` and legacy `server.http` functions send requests through
+`get_transport`, so clients of same server reuse pooled connections.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, Dict, Callable
+    from ._transport import Transport, Response
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from six.moves.urllib.parse import urlsplit  # type: ignore
+
+from ._util import env_int, parse_yes_no
+
+
+class SessionTransport:
+    """Pooled transport on `requests.Session`.
+
+    Args:
+        pool_size (int, optional): Max kept connections per host.
+        pool_block (bool, optional): Wait for free connection instead of
+            opening extra one, limits concurrent requests per host to `pool_size`.
+        keep_alive (bool, optional): Reuse connections between requests.
+        pool_hosts (int, optional): Max cached host pools.
+    """
+
+    def __init__(
+        self,
+        pool_size=env_int("CGTEAMWORK_HTTP_POOL_SIZE", 32),
+        pool_block=parse_yes_no(os.getenv("CGTEAMWORK_HTTP_POOL_BLOCK") or "no"),
+        keep_alive=parse_yes_no(os.getenv("CGTEAMWORK_HTTP_KEEP_ALIVE") or "yes"),
+        pool_hosts=10,
+    ):
+        # type: (int, bool, bool, int) -> None
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_hosts,
+            pool_maxsize=pool_size,
+            pool_block=pool_block,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def request(self, method, url, **kwargs):
+        # type: (Text, Text, *Any) -> Response
+        return self.session.request(method, url, **kwargs)  # type: ignore
+
+    def close(self):
+        # type: () -> None
+        self.session.close()
+
+
+def _new_session_transport(origin):
+    # type: (Text) -> Transport
+    return SessionTransport()
+
+
+_FACTORY = _new_session_transport  # type: Callable[[Text], Transport]
+_TRANSPORTS = {}  # type: Dict[Text, Transport]
+_LOCK = threading.Lock()
+
+
+def _origin(url):
+    # type: (Text) -> Text
+    parts = urlsplit(url)  # type: ignore
+    return "%s://%s" % (parts.scheme.lower(), parts.netloc.lower())  # type: ignore
+
+
+def get_transport(url):
+    # type: (Text) -> Transport
+    """Get shared transport for the server origin of url."""
+
+    key = _origin(url)
+    with _LOCK:
+        ret = _TRANSPORTS.get(key)
+        if ret is None:
+            ret = _TRANSPORTS[key] = _FACTORY(key)
+        return ret
+
+
+def set_transport(url, transport):
+    # type: (Text, Transport) -> None
+    """Use transport for the server origin of url,
+    replaced transport is closed.
+    """
+
+    key = _origin(url)
+    with _LOCK:
+        old = _TRANSPORTS.get(key)
+        _TRANSPORTS[key] = transport
+    if old is not None and old is not transport:
+        old.close()
+
+
+def set_transport_factory(factory):
+    # type: (Callable[[Text], Transport]) -> None
+    """Create transport for new server origin with factory,
+    e.g. to use alternative backend. Existing transports are closed.
+
+    Args:
+        factory (Callable[[Text], Transport]): Called with origin url
+            like `http://192.168.55.11`.
+    """
+
+    global _FACTORY
+    with _LOCK:
+        _FACTORY = factory
+        old = list(_TRANSPORTS.values())
+        _TRANSPORTS.clear()
+    for i in old:
+        i.close()
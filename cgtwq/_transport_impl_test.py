@@ -0,0 +1,79 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Text
+
+import pytest
+
+from . import _transport_impl
+from ._fake_transport import FakeTransport
+from ._http_client import HTTPClient
+from ._transport_impl import (
+    SessionTransport,
+    get_transport,
+    set_transport,
+    set_transport_factory,
+)
+
+
+def _fake_transport():
+    # type: () -> FakeTransport
+    return FakeTransport(
+        lambda _: {"code": "1", "data": "ok"}, headers={"Server": "nginx/1.19.9"}
+    )
+
+
+@pytest.fixture(autouse=True)
+def _restore():  # type: ignore
+    factory = _transport_impl._FACTORY  # type: ignore
+    yield
+    set_transport_factory(factory)
+
+
+def test_shared_by_origin():
+    a = get_transport("http://127.0.0.1:8080")
+    assert isinstance(a, SessionTransport)
+    assert a.session.get_adapter("http://127.0.0.1:8080")._pool_maxsize == 32  # type: ignore
+    assert get_transport("HTTP://127.0.0.1:8080/api.php") is a
+    assert get_transport("http://127.0.0.1:8081") is not a
+    assert HTTPClient("http://127.0.0.1:8080")._transport is a  # type: ignore
+
+
+def test_session_transport_pool():
+    t = SessionTransport(pool_size=4, pool_block=True, keep_alive=False)
+    adapter = t.session.get_adapter("http://127.0.0.1")
+    assert adapter._pool_maxsize == 4  # type: ignore
+    assert adapter._pool_block  # type: ignore
+    assert t.session.headers["Connection"] == "close"
+    t.close()
+
+
+def test_factory():
+    old = get_transport("http://127.0.0.1:8080")
+    origins = []  # type: List[Text]
+
+    def _factory(origin):
+        # type: (Text) -> FakeTransport
+        origins.append(origin)
+        return _fake_transport()
+
+    set_transport_factory(_factory)
+    assert get_transport("http://127.0.0.1:8080") is not old
+    t = get_transport("http://127.0.0.1:8080/")
+    assert isinstance(t, FakeTransport)
+    assert origins == ["http://127.0.0.1:8080"]
+    assert HTTPClient("http://127.0.0.1:8080").call("c", "m").json() == "ok"
+    assert t.calls[0][:2] == ("POST", "http://127.0.0.1:8080/api.php")
+
+
+def test_set_transport():
+    old = _fake_transport()
+    set_transport("http://127.0.0.1:8080", old)
+    new = _fake_transport()
+    set_transport("http://127.0.0.1:8080", new)
+    assert old.closed
+    assert get_transport("http://127.0.0.1:8080") is new
@@ -9,4 +9,5 @@ from ._is_uuid import is_uuid
 from ._cast_binary import cast_binary
 from ._iteritems import iteritems
 from ._parse_yes_no import parse_yes_no
+from ._env import env_float, env_int
 from ._timezone import TZ_CHINA, TZ_UTC, FixedTimezone
@@ -0,0 +1,22 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+
+
+def env_int(name, default):
+    # type: (str, int) -> int
+    try:
+        return int(os.getenv(name) or "")
+    except ValueError:
+        return default
+
+
+def env_float(name, default):
+    # type: (str, float) -> float
+    try:
+        return float(os.getenv(name) or "")
+    except ValueError:
+        return default
@@ -0,0 +1,27 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+"""asyncio client, requires `aiohttp`.  """
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+
+from ._client_impl import new_client
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ._client import Client
+    from ._table_view import TableView
+    from ._flow_service import FlowService
+    from ._file_box_service import FileBoxService
+    from ._image_service import ImageService
+    from ._pipeline_service import PipelineService
+
+    __all__ = [
+        "new_client",
+        "Client",
+        "TableView",
+        "FlowService",
+        "FileBoxService",
+        "ImageService",
+        "PipelineService",
+    ]
@@ -0,0 +1,44 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict
+
+from __future__ import annotations
+from typing import Protocol, Any, Sequence
+from .._filter import Filter
+from .._user_token import UserToken
+from .._row_id import RowID
+from ._table_view import TableView
+from ._pipeline_service import PipelineService
+from ._flow_service import FlowService
+from ._file_box_service import FileBoxService
+from ._image_service import ImageService
+
+class Client(Protocol):
+    pipeline: PipelineService
+    flow: FlowService
+    file_box: FileBoxService
+    image: ImageService
+
+    async def __aenter__(self) -> Client: ...
+    async def __aexit__(self, *_: Any) -> None: ...
+    async def close(self) -> None: ...
+    @property
+    def http_url(self) -> str: ...
+    @property
+    def token(self) -> UserToken: ...
+    @token.setter
+    def token(self, v: UserToken) -> None: ...
+    def table(
+        self,
+        database: str,
+        module: str,
+        module_type: str,
+        /,
+        *,
+        filter_by: Filter = ...,
+    ) -> TableView: ...
+    async def set(
+        self,
+        id: Sequence[RowID],
+        data: dict[str, Any],
+        /,
+    ) -> None: ...
@@ -0,0 +1,130 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Text, Any, Sequence
+    from ._table_view import TableView
+    from ._client import Client
+
+from .._client_impl import ClientImpl as SyncClientImpl
+from .._compat_service import CompatService
+from .._filter import NULL_FILTER, Filter
+from .._row_id import RowID
+from .._user_token import UserToken
+from .._util import iteritems
+from ._file_box_service_impl import new_file_box_service
+from ._flow_service_impl import new_flow_service
+from ._http_client import HTTPClient
+from ._image_service_impl import new_image_service
+from ._orm_table_view import ORMTableView
+from ._pipeline_service_impl import new_pipeline_service
+
+
+class ClientImpl(object):
+    def __init__(self, http, compat):
+        # type: (HTTPClient, CompatService) -> None
+        self._http = http
+        self._compat = compat
+        self.file_box = new_file_box_service(http, compat)
+        self.pipeline = new_pipeline_service(http, compat)
+        self.flow = new_flow_service(http, compat)
+        self.image = new_image_service(http, compat)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        # type: (Any) -> None
+        await self.close()
+
+    async def close(self):
+        # type: () -> None
+        await self._http.close()
+
+    @property
+    def http_url(self):
+        return self._http.url
+
+    @property
+    def token(self):
+        return self._http.token
+
+    @token.setter
+    def token(self, v):
+        # type: (UserToken) -> None
+        self._http.token = v
+
+    def table(self, database, module, module_type, filter_by=NULL_FILTER):
+        # type: (Text, Text, Text, Filter) -> TableView
+        return ORMTableView(
+            self._http,
+            self._compat,
+            database,
+            module,
+            module_type,
+            filter_by,
+        )
+
+    async def set(self, id, data):
+        # type: (Sequence[RowID], dict[str, Any]) -> None
+
+        if not id or not data:
+            return
+        data = {self._compat.transform_field(k): v for k, v in data.items()}
+
+        groups = {}  # type: dict[tuple[Text, Text,Text], list[Text]]
+        for i in id:
+            groups.setdefault((i.database, i.module, i.module_type), []).append(i.value)
+
+        for key, id_list in iteritems(groups):
+            database, module, module_type = key
+            if self._compat.level < self._compat.LEVEL_7_0:
+                resp = await self._http.call(
+                    "c_orm",
+                    "set_in_id",
+                    db=database,
+                    module=module,
+                    module_type=module_type,
+                    id_array=id_list,
+                    sign_data_array=data,
+                )
+            else:
+                resp = await self._http.call(
+                    module_type,
+                    "set",
+                    db=database,
+                    module=module,
+                    module_type=module_type,
+                    id_array=id_list,
+                    sign_data_array=data,
+                    exec_event_filter=True,
+                )
+            resp.json()
+
+
+async def new_client(http_url="", version="", limit=100):
+    # type: (Text, Text, int) -> Client
+    """Create asyncio client.
+
+    Args:
+        http_url (str, optional): Server url, defaults to `CGTEAMWORK_URL`.
+        version (str, optional): Server version, detected from server when empty.
+        limit (int, optional): Max connection count of the shared connection pool.
+
+    Returns:
+        Client: asyncio client, use `async with` or `close` to release connections.
+    """
+
+    http = HTTPClient(http_url or SyncClientImpl.default_http_url, limit)
+    level = CompatService.level_from_version(version or SyncClientImpl.default_version)
+    if not level:
+        try:
+            resp = await http.get("")
+        except BaseException:
+            await http.close()
+            raise
+        level = CompatService.level_from_server_header(resp.headers.get("Server", ""))
+    return ClientImpl(http, CompatService(level))
@@ -0,0 +1,75 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List
+
+import asyncio
+import json
+
+import pytest
+
+from .. import F, RowID
+
+web = pytest.importorskip("aiohttp.web")
+
+
+def _run(coro):
+    # type: (Any) -> Any
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def _serve(rows, calls):
+    # type: (List[Any], List[Any]) -> Any
+    async def api(request):
+        # type: (Any) -> Any
+        data = json.loads((await request.post())["data"])
+        calls.append(data)
+        if data["method"] == "get_filter":
+            start, limit = int(data["start_num"]), int(data["limit"])
+            return web.json_response(
+                {"code": "1", "type": "json", "data": rows[start : start + limit]}
+            )
+        return web.json_response({"code": "1", "type": "json", "data": True})
+
+    app = web.Application()
+    app.router.add_post("/api.php", api)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore
+    return runner, "http://127.0.0.1:%d" % port
+
+
+def test_rows_and_set():
+    from . import new_client
+
+    rows = [{"task.id": "%04d" % i, "task.entity": "sc%04d" % i} for i in range(25)]
+    calls = []  # type: List[Any]
+
+    async def main():
+        runner, url = await _serve(rows, calls)
+        try:
+            async with await new_client(url, "7.0") as client:
+                view = client.table("proj_test", "shot", "task", F("task.id").has("%"))
+                view.page_size = 10  # type: ignore
+                result = [i async for i in view.rows("task.id", "task.entity")]
+                ids = [i async for i in view]
+                await client.set(ids[:2], {"task.entity": "changed"})
+            return result, ids
+        finally:
+            await runner.cleanup()
+
+    result, ids = _run(main())
+    assert result == [(i["task.id"], i["task.entity"]) for i in rows]
+    assert ids[0] == RowID("proj_test", "shot", "task", "0000")
+    assert calls[-1]["method"] == "set"
+    assert calls[-1]["id_array"] == ["0000", "0001"]
@@ -0,0 +1,22 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict
+
+from __future__ import annotations
+
+from typing import Protocol, Text, AsyncIterator
+
+from .._row_id import RowID
+from .._file_box import FileBox
+
+class FileBoxService(Protocol):
+    async def get_by_sign(
+        self,
+        id: RowID,
+        sign: Text,
+        /,
+    ) -> FileBox: ...
+    def all_submit(
+        self,
+        id: RowID,
+        /,
+    ) -> AsyncIterator[FileBox]: ...
@@ -0,0 +1,26 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict
+
+from __future__ import annotations
+
+from typing import Protocol, Sequence
+
+from .._message import MessageInput
+from .._row_id import RowID
+
+class FlowService(Protocol):
+    async def update(
+        self,
+        id: RowID,
+        field: str,
+        status: str,
+        msg: MessageInput = ...,
+        /,
+    ) -> None: ...
+    async def submit(
+        self,
+        id: RowID,
+        filenames: Sequence[str],
+        msg: MessageInput = ...,
+        /,
+    ) -> None: ...
@@ -0,0 +1,280 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Text, Sequence, Tuple
+    from ._flow_service import FlowService
+    from .._compat_service import CompatService
+    from ._http_client import HTTPClient
+    from .._row_id import RowID
+
+import asyncio
+import os
+from uuid import uuid4
+
+from .. import constants, exceptions
+from .._file_box import FileBox
+from .._flow_service_impl import _copy_to_dir, _listdir  # type: ignore
+from .._http_client import CGTeamworkError
+from .._message import Message, MessageInput
+
+
+def _prepare_files(filenames, dir):
+    # type: (Sequence[Text], Text) -> Tuple[Text, ...]
+    return tuple(_copy_to_dir(filenames, dir) or _listdir(dir))
+
+
+class FlowServiceImpl:
+    def __init__(self, http, compat):
+        # type: (HTTPClient, CompatService) -> None
+        self._http = http
+        self._compat = compat
+
+    async def update(
+        self,
+        id,
+        field,
+        status,
+        msg="",
+    ):
+        # type: (RowID, Text, Text, MessageInput) -> None
+        message = Message.from_input(msg)
+        param = dict(
+            db=id.database,
+            module=id.module,
+            module_type=id.module_type,
+            task_id=id.value,
+            field_sign=field,
+            status=status,
+        )
+        if self._compat.level == self._compat.LEVEL_5_2:
+            param["text"] = message.as_payload_v5_2()
+        else:
+            param["dom_text_array"] = message.as_payload_v6_1()
+        try:
+            (await self._http.call("c_work_flow", "python_update_flow", **param)).json()
+        except CGTeamworkError as ex:
+            if ex.args and ex.args[0] == (
+                "work_flow::python_update_flow, " "no permission to qc"
+            ):
+                raise exceptions.PermissionError
+            raise
+
+    async def submit(
+        self,
+        id,
+        filenames,
+        msg="",
+    ):
+        # type: (RowID, Sequence[Text], MessageInput) -> None
+        if self._compat.level == self._compat.LEVEL_5_2:
+            return await self._submit_v5_2(id, filenames, msg)
+        if self._compat.level < self._compat.LEVEL_7_0:
+            return await self._submit_v6_1(id, filenames, msg)
+        return await self._submit_v7_0(id, filenames, msg)
+
+    async def _get_submit_file_box_v6_1(self, id, sign):
+        # type: (RowID,Text) -> FileBox
+        resp = await self._http.call(
+            "c_filebox",
+            "filebox_get_submit_data",
+            db=id.database,
+            module=id.module,
+            task_id=id.value,
+            os=constants.OS,
+            sign=sign,
+        )
+        return FileBox(resp.json())
+
+    async def _get_first_submit_file_box_v7_0(self, id):
+        # type: (RowID) -> FileBox
+        # spell-checker: word filebox etask
+        controller = "task"
+        if id.module == "etask":
+            controller = "etask"
+        sign_list = (
+            await self._http.call(
+                controller,
+                "get_submit_filebox_sign",
+                db=id.database,
+                module=id.module,
+                id=id.value,
+            )
+        ).json()  # type: list[str]
+        if not sign_list:
+            raise ValueError("submission file box not found")
+        resp = await self._http.call(
+            controller,
+            "get_sign_filebox",
+            db=id.database,
+            module=id.module,
+            id=id.value,
+            os=constants.OS,
+            filebox_sign=sign_list[0],
+        )
+        return FileBox(resp.json())
+
+    async def _copy_to_file_box(self, filenames, file_box):
+        # type: (Sequence[Text], FileBox) -> Tuple[Text, ...]
+        # file copy is blocking, keep it off the event loop.
+        filenames = await asyncio.get_event_loop().run_in_executor(
+            None, _prepare_files, filenames, file_box.path
+        )
+        if not filenames:
+            raise ValueError("no file to submit")
+        return filenames
+
+    async def _create_version_v5_2(
+        self,
+        id,
+        filenames,
+        sign,
+    ):
+        # type: (RowID, Sequence[Text], Text) -> Text
+        version_id = uuid4().hex
+        await self._http.call(
+            "c_version",
+            "create",
+            field_data_array={
+                "#link_id": id.value,
+                "version": "",
+                "filename": [os.path.basename(i) for i in filenames],
+                "local_path": filenames,
+                "web_path": [],
+                "sign": sign,
+                "image": "",
+                "from_version": "",
+                "is_upload_web": "N",
+                "#id": version_id,
+            },
+        )
+        return version_id
+
+    async def _create_version_v6_1(self, id, filenames, sign):
+        # type: (RowID,Sequence[Text], Text) -> Text
+        file_box = await self._get_submit_file_box_v6_1(id, sign)
+        filenames = await self._copy_to_file_box(filenames, file_box)
+        version_id = (
+            await self._http.call(
+                "c_version",
+                "client_create",
+                link_id=id.value,
+                sign=sign,
+                submit_dir=file_box.path,
+                submit_path_array=filenames,
+                submit_file_path_array=filenames,
+                server_id=file_box.server_id,
+                os=constants.OS,
+            )
+        ).json()
+        await self._http.call(
+            "c_file",
+            "create",
+            link_id=id.value,
+            sign=sign,
+            version_id=version_id,
+            path_array=filenames,
+            os=constants.OS,
+            server_id=file_box.server_id,
+        )
+        return version_id
+
+    async def _create_version_v7_0(self, id, filenames):
+        # type: (RowID,Sequence[Text]) -> Text
+        file_box = await self._get_first_submit_file_box_v7_0(id)
+        filenames = await self._copy_to_file_box(filenames, file_box)
+        version_id = (
+            await self._http.call(
+                "version",
+                "client_create",
+                link_id=id.value,
+                sign=file_box.sign,
+                submit_dir=file_box.path,
+                submit_path_array=filenames,
+                submit_file_path_array=filenames,
+                server_id=file_box.server_id,
+                os=constants.OS,
+            )
+        ).json()
+        await self._http.call(
+            "file",
+            "create",
+            link_id=id.value,
+            sign=file_box.sign,
+            version_id=version_id,
+            path_array=filenames,
+            os=constants.OS,
+            server_id=file_box.server_id,
+        )
+        return version_id
+
+    async def _submit_v5_2(
+        self,
+        id,
+        filenames,
+        msg="",
+    ):
+        # type: (RowID, Sequence[Text], MessageInput) -> None
+        msg = Message.from_input(msg)
+        path_data = {"path": filenames, "file_path": filenames}
+        await self._http.call(
+            "c_work_flow",
+            "submit",
+            db=id.database,
+            module=id.module,
+            module_type=id.module_type,
+            task_id=id.value,
+            account_id=self._http.token.user_id,
+            version_id=await self._create_version_v5_2(id, filenames, "Api Submit"),
+            submit_file_path_array=path_data,
+            text=msg.as_payload_v5_2(),
+        )
+
+    async def _submit_v6_1(
+        self,
+        id,
+        filenames,
+        msg="",
+    ):
+        # type: (RowID, Sequence[Text], MessageInput) -> None
+        msg = Message.from_input(msg)
+        version_id = await self._create_version_v6_1(id, filenames, "review")
+        await self._http.call(
+            "c_work_flow",
+            "submit",
+            db=id.database,
+            module=id.module,
+            module_type=id.module_type,
+            task_id=id.value,
+            submit_type="review",
+            dom_text_array=msg.as_payload_v6_1(),
+            version_id=version_id,
+        )
+
+    async def _submit_v7_0(
+        self,
+        id,
+        filenames,
+        msg="",
+    ):
+        # type: (RowID, Sequence[Text], MessageInput) -> None
+        msg = Message.from_input(msg)
+        version_id = await self._create_version_v7_0(id, filenames)
+        await self._http.call(
+            "work_flow",
+            "submit",
+            db=id.database,
+            module=id.module,
+            module_type=id.module_type,
+            task_id=id.value,
+            dom_text_array=msg.as_payload_v6_1(),
+            version_id=version_id,
+        )
+
+
+def new_flow_service(http, compat):
+    # type: (HTTPClient, CompatService) -> FlowService
+    return FlowServiceImpl(http, compat)
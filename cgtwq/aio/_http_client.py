@@ -0,0 +1,107 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Text, Dict, Optional, Mapping
+
+import logging
+
+import aiohttp
+
+from .._http_client import _raise_error  # type: ignore
+from .._json_codec import DEFAULT_JSON_CODEC
+from .._user_token import UserToken
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HTTPResponse:
+    def __init__(self, status, headers, body):
+        # type: (int, Mapping[Text, Text], bytes) -> None
+        if status != 200:
+            raise RuntimeError("cgteamwork response status %d" % status)
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        # type: () -> Any
+        data = DEFAULT_JSON_CODEC.decode(self.body)
+        _raise_error(data)
+        if not isinstance(data, dict):
+            return data
+        return data.get("data", data)  # type: ignore
+
+
+class HTTPClient:
+    """asyncio counterpart of `cgtwq._http_client.HTTPClient`.
+
+    All requests share one `aiohttp.ClientSession`, it is created on first
+    request so the client can be constructed outside a running event loop.
+    """
+
+    def __init__(self, url, limit=100):
+        # type: (Text, int) -> None
+        self._url = url
+        self._limit = limit
+        self._session = None  # type: Optional[aiohttp.ClientSession]
+        self.token = UserToken("", "")
+        self.json_codec = DEFAULT_JSON_CODEC
+
+    def _build_url(self, pathname):
+        # type: (Text) -> Text
+        return "{}/{}".format(self._url, pathname.lstrip("\\/"))
+
+    @property
+    def url(self):
+        return self._url
+
+    def _get_session(self):
+        # type: () -> aiohttp.ClientSession
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._limit, ssl=False),
+            )
+        return self._session
+
+    async def close(self):
+        # type: () -> None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(self, method, url, **kwargs):
+        # type: (Text, Text, *Any) -> HTTPResponse
+        async with self._get_session().request(
+            method, url, cookies={"token": self.token.raw}, **kwargs
+        ) as resp:
+            return HTTPResponse(resp.status, resp.headers, await resp.read())
+
+    async def post(self, pathname, data, files=None, **kwargs):
+        # type: (Text, Optional[Dict[Text, Any]], Optional[Dict[Text, Any]], *Any) -> HTTPResponse
+        assert "data" not in kwargs
+        url = self._build_url(pathname)
+        _LOGGER.debug("will request: POST %s: %s", url, data)
+        form = aiohttp.FormData()
+        if data is not None:
+            form.add_field("data", self.json_codec.encode(data))
+        for name, (filename, value, content_type) in (files or {}).items():
+            form.add_field(name, value, filename=filename, content_type=content_type)
+        return await self._request("POST", url, data=form, **kwargs)
+
+    async def get(self, pathname, **kwargs):
+        # type: (Text, *Any) -> HTTPResponse
+        return await self._request("GET", self._build_url(pathname), **kwargs)
+
+    async def call(self, controller, method, **data):
+        # type: (Text, Text, *Any) -> HTTPResponse
+        """Call controller method ."""
+
+        data.setdefault("app", "api")
+        data["controller"] = controller
+        data["method"] = method
+
+        return await self.post("api.php", data)
@@ -0,0 +1,16 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict
+
+from __future__ import annotations
+
+from typing import Protocol, Text
+
+from .._image import Image
+
+class ImageService(Protocol):
+    async def upload(
+        self,
+        database: Text,
+        filename: Text,
+        /,
+    ) -> Image: ...
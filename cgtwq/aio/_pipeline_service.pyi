@@ -0,0 +1,21 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict
+
+from __future__ import annotations
+
+from typing import Protocol
+
+from .._filter import Filter
+from .._pipeline_service_impl import NeighborTaskResult
+from .._row_id import RowID
+from ._table_view import TableView
+
+class PipelineService(Protocol):
+    def table(
+        self,
+        database: str,
+        /,
+        *,
+        filter_by: Filter = ...,
+    ) -> TableView: ...
+    async def neighbor_task(self, id: RowID) -> NeighborTaskResult: ...
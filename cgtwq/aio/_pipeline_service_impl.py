@@ -0,0 +1,54 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Text
+    from ._pipeline_service import PipelineService
+    from .._compat_service import CompatService
+    from ._http_client import HTTPClient
+    from ._table_view import TableView
+
+from .._filter import NULL_FILTER, Filter
+from .._pipeline_service_impl import NeighborTaskResult
+from .._row_id import RowID
+from ._pipeline_table_view import PipelineTableView
+
+
+class PipelineServiceImpl:
+    def __init__(self, http, compat):
+        # type: (HTTPClient, CompatService) -> None
+        self._http = http
+        self._compat = compat
+
+    def table(self, database, filter_by=NULL_FILTER):
+        # type: (Text, Filter) -> TableView
+        return PipelineTableView(
+            self._http,
+            self._compat,
+            database,
+            filter_by,
+        )
+
+    async def neighbor_task(self, id):
+        # type: (RowID) -> NeighborTaskResult
+        resp = await self._http.call(
+            "c_pipeline_template",
+            "get_next_and_previous_task",
+            db=id.database,
+            module=id.module,
+            task_id=id.value,
+        )
+        return NeighborTaskResult(id.database, id.module, resp.json())
+
+
+def _(v):
+    # type: (PipelineServiceImpl) -> PipelineService
+    return v
+
+
+def new_pipeline_service(http, compat):
+    # type: (HTTPClient, CompatService) -> PipelineService
+    return PipelineServiceImpl(http, compat)
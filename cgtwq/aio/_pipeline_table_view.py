@@ -0,0 +1,63 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Text, AsyncIterator, Sequence
+    from .._compat_service import CompatService
+    from ._http_client import HTTPClient
+    from ._table_view import TableView
+
+from .._row_id import RowID
+
+from .._filter import Filter
+
+
+class PipelineTableView:
+    def __init__(
+        self,
+        http,
+        compat,
+        database,
+        filter_by,
+    ):
+        # type: (HTTPClient, CompatService,  Text, Filter) -> None
+        self._http = http
+        self._compat = compat
+        self._database = database
+        self._filter_by = filter_by
+
+    async def __aiter__(self):
+        # type: () -> AsyncIterator[RowID]
+        async for id, module, module_type in self.rows("#id", "module", "module_type"):
+            yield RowID(self._database, module, module_type, id)
+
+    async def rows(self, *fields):
+        # type: (Text) -> AsyncIterator[Sequence[Text]]
+        if self._compat.level < self._compat.LEVEL_7_0:
+            controller = "c_pipeline"
+            method = "get_with_filter"
+        else:
+            controller = "pipeline"
+            method = "get_filter"
+        resp = await self._http.call(
+            controller,
+            method,
+            db=self._database,
+            field_array=self._compat.transform_fields(fields),
+            filter_array=self._compat.filter_payload(self._filter_by),
+        )
+        for i in resp.json():
+            yield i
+
+    async def column(self, field):
+        # type: (Text) -> AsyncIterator[Text]
+        async for (i,) in self.rows(field):
+            yield i
+
+
+def _(v):
+    # type: (PipelineTableView) -> TableView
+    return v
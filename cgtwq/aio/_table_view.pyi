@@ -0,0 +1,13 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict
+
+from __future__ import annotations
+
+from typing import AsyncIterator, Sequence, Protocol
+
+from .._row_id import RowID
+
+class TableView(Protocol):
+    def __aiter__(self) -> AsyncIterator[RowID]: ...
+    def rows(self, *fields: str) -> AsyncIterator[Sequence[str]]: ...
+    def column(self, field: str) -> AsyncIterator[str]: ...
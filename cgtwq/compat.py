@@ -7,21 +7,35 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import six
 
 from . import core, filter
+from ._compat_translation import IDENTITY, LEVEL_5_2, Translation
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from typing import Dict, Sequence, Text, Union
+    from typing import Dict, List, Optional, Sequence, Text, Tuple, Union
 
 API_LEVEL_5_2 = 0
 API_LEVEL_6_1 = 1
 
 
 _API_LEVEL_CACHE = {}  # type: Dict[Text, int]
+# api level by (API_VERSION, URL) config.
+_CONFIG_API_LEVEL = {}  # type: Dict[Tuple[Text, Text], int]
 
 
 def api_level():
     # type: () -> int
 
+    key = (core.CONFIG["API_VERSION"], core.CONFIG["URL"])
+    ret = _CONFIG_API_LEVEL.get(key)
+    if ret is None:
+        ret = _api_level()
+        _CONFIG_API_LEVEL[key] = ret
+    return ret
+
+
+def _api_level():
+    # type: () -> int
+
     versionText = core.CONFIG["API_VERSION"]
     if "5.0" <= versionText < "6.0":
         return API_LEVEL_5_2
@@ -30,50 +44,65 @@ def api_level():
 
     _cache_key = core.CONFIG["URL"]
     if _cache_key not in _API_LEVEL_CACHE:
-        from . import server
+        from ._compat_cache import server_header
 
-        resp = server.http.SESSION.get(core.CONFIG["URL"])
         _API_LEVEL_CACHE[_cache_key] = {
             "nginx/1.9.15": API_LEVEL_5_2,
             "nginx/1.15.9": API_LEVEL_6_1,
         }.get(
-            resp.headers.get("Server", ""),
+            server_header(core.CONFIG["URL"]),
             API_LEVEL_6_1,
         )
     return _API_LEVEL_CACHE[_cache_key]
 
 
+def detected_api_level(url=None):
+    # type: (Optional[Text]) -> Optional[int]
+    """Api level detected from server header, without detecting.
+
+    Args:
+        url (Text, optional): Server url. Defaults to `core.CONFIG["URL"]`.
+
+    Returns:
+        Optional[int]: `None` when not detected yet.
+    """
+
+    return _API_LEVEL_CACHE.get(url or core.CONFIG["URL"])
+
+
+def _translation():
+    # type: () -> Translation
+    if api_level() == API_LEVEL_5_2:
+        return LEVEL_5_2
+    return IDENTITY
+
+
 def adapt_field_sign(s):
     # type: (Text) -> Text
-    if api_level() == API_LEVEL_5_2:
-        return {
-            "task.entity": "task.task_name",
-            "shot.entity": "shot.shot",
-            "eps.entity": "eps.eps_name",
-            "shot.link_eps": "shot.eps_name",
-            "asset.entity": "asset.asset_name",
-            "project.entity": "project.code",
-            "account.entity": "account.account",
-            "asset_type.entity": "asset.type_name",
-            "entity": "entity_name",
-        }.get(s, s)
-    return s
-
-
-def adapt_filter(f):
-    # type: (Sequence[Text]) -> filter.Filter
+    return _translation().field(s)
+
+
+def adapt_field_signs(signs):
+    # type: (Sequence[Text]) -> List[Text]
+    """Adapted sign array, result is shared and should not be modified."""
+    return _translation().fields(signs)
+
+
+def adapt_filter(f, translation=None):
+    # type: (Sequence[Text], Optional[Translation]) -> filter.Filter
     left, operator, right = f
-    return filter.Filter(adapt_field_sign(left), right, operator)
+    return filter.Filter((translation or _translation()).field(left), right, operator)
 
 
 def adapt_filters(filter_list):
     # type: (Sequence[Union[Text, Sequence[Text]]]) -> filter.FilterList
 
+    translation = _translation()
     ret = []  # type: Sequence[Union[Text,Sequence[Text]]]
     for i in filter_list:
         if isinstance(i, (str, six.text_type)):
             ret.append(i)
         else:
-            ret.append(adapt_filter(i))
+            ret.append(adapt_filter(i, translation))
 
     return filter.FilterList(ret)
@@ -71,7 +71,7 @@ class ControllerGetterMixin(object):
         resp = self.call(  # type: ignore
             controller,
             method,
-            field_array=[compat.adapt_field_sign(i) for i in fields],
+            field_array=compat.adapt_field_signs(fields),
             filter_array=compat.adapt_filters(filters),
         )
         return tuple(model(*i) for i in resp)
@@ -12,7 +12,13 @@ from ._view_service import ViewService
 class Client(BaseClient, Protocol):
     plugin: PluginService
     view: ViewService
-    def __init__(self, *, exe_path: str = ..., socket_url: str = ...) -> None: ...
+    def __init__(
+        self,
+        *,
+        exe_path: str = ...,
+        socket_url: str = ...,
+        lazy: bool | None = ...
+    ) -> None: ...
     @property
     def exe_path(self) -> str: ...
     @property
@@ -5,7 +5,7 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from typing import Text, Optional, Any
+    from typing import Text, Optional, Any, Iterable
     from ._client import Client
 
 import os
@@ -14,6 +14,8 @@ import sys
 from six.moves import configparser
 
 from .._client_impl import ClientImpl as BaseClientImpl
+from .._http_client import HTTPClient
+from .._lazy import Lazy
 from .._user_token import UserToken
 from .._util import cast_text
 from ._plugin_service_impl import new_plugin_service
@@ -94,16 +96,32 @@ class _ConfigFile:
 
 
 class ClientImpl(BaseClientImpl):
-    def __init__(self, exe_path="", socket_url=""):
-        # type: (Text, Text) -> None
-        self._exe_path = exe_path or _default_exe_path()
-        cfg = _ConfigFile(self._exe_path)
-        self._socket_url = socket_url or cfg.socket_url()
+    def __init__(self, exe_path="", socket_url="", lazy=None):
+        # type: (Text, Text, Optional[bool]) -> None
+        """
+        Args:
+            exe_path (Text, optional): Desktop client executable path.
+            socket_url (Text, optional): Desktop client websocket url.
+            lazy (Optional[bool], optional): Read config, server url, version
+                and token on first use instead of in constructor,
+                defaults to `CGTEAMWORK_LAZY_CLIENT`.
+        """
+        if lazy is None:
+            lazy = self.default_lazy
+        self._exe_path = Lazy(lambda: exe_path or _default_exe_path())
+        self._cfg = Lazy(lambda: _ConfigFile(self.exe_path))
+        self._socket_url = Lazy(lambda: socket_url or self._cfg.get().socket_url())
         self._ws = WSClient(self._socket_url)
-
-        super(ClientImpl, self).__init__(
-            http_url=cfg.http_url() or self._http_url_by_ws()
+        self._http_url = self._probe(
+            lambda: self._cfg.get().http_url() or self._http_url_by_ws()
         )
+        # requested with server version detection, used when version >= 7.0.
+        self._login_data = self._probe(
+            lambda: self._ws.call_main_widget("get_login_data")
+        )  # type: Lazy
+        self._token = self._probe(self._get_token)
+
+        super(ClientImpl, self).__init__(http_url=self._http_url, lazy=lazy)
         plugin = new_plugin_service(
             self._http,
             self._compat,
@@ -116,15 +134,23 @@ class ClientImpl(BaseClientImpl):
 
         self.plugin = plugin
         self.view = view
-        self.token = self._get_token()
+        self._http.lazy_token = self._token
+        if not lazy:
+            self.token = self._token.get()
+
+    def _probes(self):
+        # type: () -> Iterable[Lazy]
+        return (self._http_url, self._level, self._login_data, self._token)
 
     @property
     def exe_path(self):
-        return self._exe_path
+        # type: () -> Text
+        return self._exe_path.get()
 
     @property
     def socket_url(self):
-        return self._socket_url
+        # type: () -> Text
+        return self._socket_url.get()
 
     def _http_url_by_ws(self):
         host = self._ws.call_main_widget("get_server_ip")
@@ -139,28 +165,29 @@ class ClientImpl(BaseClientImpl):
         raw = self._ws.call_main_widget("get_token")
         if raw is True:
             return UserToken("", "")
-        user_id = cast_text(
-            self._http.call("c_token", "get_account_id", token=self.token)
-        )
+        # separate client, `self._http` token is not resolved yet.
+        http = HTTPClient(self._http.url)
+        http.token = UserToken("", raw)
+        user_id = cast_text(http.call("c_token", "get_account_id", token=raw).json())
         return UserToken(user_id, raw)
 
     def _get_token_7_0(self):
-        data = self._ws.call_main_widget("get_login_data")  # type: dict[str, Any]
+        data = self._login_data.get()  # type: dict[str, Any]
         return UserToken(
             cast_text(data.get("account_id", "")),
             cast_text(data.get("token", "")),
         )
 
 
-def new_client(exe_path="", socket_url=""):
-    # type: (Text, Text) -> Client
-    return ClientImpl(exe_path, socket_url)
+def new_client(exe_path="", socket_url="", lazy=None):
+    # type: (Text, Text, Optional[bool]) -> Client
+    return ClientImpl(exe_path, socket_url, lazy)
 
 
 def current_client():
     # type: () -> Optional[Client]
     try:
-        return new_client()
+        return new_client(lazy=False)
     except (IOError, websocket.WebSocketException):
         pass
 
@@ -0,0 +1,98 @@
+# -*- coding=UTF-8 -*-
+# pyright: strict, reportTypeCommentUsage=none
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List, Text
+
+import threading
+
+import pytest
+
+from .. import _transport_impl
+from .._client_impl import ClientImpl as BaseClientImpl
+from .._stand_in_server import StandInServer
+from ._client_impl import ClientImpl
+from ._ws_client import WSClient
+
+
+@pytest.fixture(name="host")
+def _host(request):
+    # type: (Any) -> Text
+    # compat level is cached by url.
+    return "%s.desktop.stand-in" % request.node.name.replace("_", "-")
+
+
+@pytest.fixture(name="server")
+def _server(host, monkeypatch):
+    # type: (Text, Any) -> StandInServer
+    server = StandInServer()
+    server.add_synthetic_table("proj_test", "shot", "task", 10)
+    monkeypatch.setitem(
+        _transport_impl._TRANSPORTS,  # type: ignore
+        "http://" + host,
+        server.transport(),
+    )
+    monkeypatch.setattr(BaseClientImpl, "default_version", "")
+    return server
+
+
+@pytest.fixture(name="exe_path")
+def _exe_path(host, tmpdir):
+    # type: (Text, Any) -> Text
+    tmpdir.join("config.ini").write(
+        "[General]\n"
+        "server = %s\n"
+        "https_port =\n"
+        "socket_server_port = 64999\n" % host
+    )
+    return str(tmpdir.join("CgTeamWork.exe"))
+
+
+def test_lazy(server, host, exe_path, monkeypatch):
+    # type: (StandInServer, Text, Text, Any) -> None
+    ws_calls = []  # type: List[Text]
+    ws_started = threading.Event()
+    overlapped = []  # type: List[bool]
+
+    def _call(self, controller, method, **kwargs):
+        # type: (Any, Text, Text, *Any) -> Any
+        ws_calls.append(method)
+        ws_started.set()
+        return {"account_id": "account-1", "token": "token-1"}
+
+    handle = server.handle
+
+    def _handle(http_method, path, payload):
+        # type: (Text, Text, Any) -> Any
+        if http_method == "GET":
+            # token probe runs while detecting server version.
+            overlapped.append(ws_started.wait(5))
+        return handle(http_method, path, payload)
+
+    monkeypatch.setattr(WSClient, "call", _call)
+    monkeypatch.setattr(server, "handle", _handle)
+
+    client = ClientImpl(exe_path, lazy=True)
+    assert not ws_calls
+    assert server.request_count == 0
+    assert client.table("proj_test", "shot", "task").count() == 10
+    assert overlapped == [True]
+    assert ws_calls == ["get_login_data"]
+    assert client.token.raw == "token-1"
+    assert client.http_url == "http://" + host
+    assert client.socket_url == "ws://127.0.0.1:64999"
+
+
+def test_eager(server, exe_path, monkeypatch):
+    # type: (StandInServer, Text, Any) -> None
+    def _call(self, controller, method, **kwargs):
+        # type: (Any, Text, Text, *Any) -> Any
+        return {"account_id": "account-1", "token": "token-1"}
+
+    monkeypatch.setattr(WSClient, "call", _call)
+    client = ClientImpl(exe_path, lazy=False)
+    assert server.request_count == 1
+    assert client.token.user_id == "account-1"
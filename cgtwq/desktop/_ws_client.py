@@ -5,7 +5,8 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from typing import Any, Text
+    from typing import Any, Text, Union
+    from .._lazy import Lazy
 
 import websocket
 import json
@@ -14,6 +15,7 @@ import socket
 
 from contextlib import closing
 from .._http_client import JSONEncoder
+from .._lazy import resolve
 
 
 def _handle_error_10042(exception):
@@ -32,7 +34,7 @@ class WSClient:
     timeout = 1.0
 
     def __init__(self, url):
-        # type: (Text) -> None
+        # type: (Union[Text, Lazy]) -> None
         self._url = url
         self._encoder = JSONEncoder()
 
@@ -41,7 +43,8 @@ class WSClient:
         payload = dict(sign=controller, method=method, **kwargs)
         payload.setdefault("type", "get")
         # XXX: can not reuse connection, second call will not work.
-        with closing(websocket.create_connection(self._url, self.timeout)) as conn:  # type: ignore
+        url = resolve(self._url)  # type: Text
+        with closing(websocket.create_connection(url, self.timeout)) as conn:  # type: ignore
             try:
                 conn.send(self._encoder.encode(payload))  # type: ignore
                 recv = json.loads(conn.recv())  # type: ignore
@@ -4,7 +4,6 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import six
-from six.moves import reduce
 
 # six.moves.collections_abc is not added at six<1.13.0
 # https://github.com/benjaminp/six/blob/42636b15dd1a5b85de56eac98e47954d4c776576/CHANGES#L35
@@ -76,17 +75,87 @@ class FilterList(list):
         # type: (Union[Filter, Iterable[Any]]) -> None
         if isinstance(list_, Filter):
             list_ = [list_]
+        elif isinstance(list_, FilterList):
+            # already validated.
+            pass
         elif isinstance(list_, Iterable):
             list_ = list(list_)
             if not all(isinstance(i, (Filter, str, six.text_type)) for i in list_):
                 raise ValueError("Malformed list", list_)
         super(FilterList, self).__init__(list_)
 
+    @staticmethod
+    def _items(v):
+        # type: (Union[FilterList, Filter]) -> List[Any]
+        if isinstance(v, FilterList):
+            return v
+        if isinstance(v, Filter):
+            return [v]
+        return FilterList(v)
+
     def _combine(self, other, operator):
         # type: (Union[FilterList, Filter], Text) -> FilterList
         ret = FilterList(self)
         ret.append(operator)
-        ret += FilterList(other)
+        ret.extend(self._items(other))
+        return ret
+
+    def _extend(self, other, operator):
+        # type: (Union[FilterList, Filter], Text) -> FilterList
+        items = self._items(other)
+        if not items:
+            return self
+        if self:
+            self.append(operator)
+        self.extend(items)
+        return self
+
+    def extend_and(self, other):
+        # type: (Union[FilterList, Filter]) -> FilterList
+        """Append `other` with `and` in place, operator is omitted when empty.
+
+        Returns:
+            FilterList: This instance.
+        """
+
+        return self._extend(other, "and")
+
+    def extend_or(self, other):
+        # type: (Union[FilterList, Filter]) -> FilterList
+        """Append `other` with `or` in place, operator is omitted when empty.
+
+        Returns:
+            FilterList: This instance.
+        """
+
+        return self._extend(other, "or")
+
+    @classmethod
+    def all_of(cls, filters):
+        # type: (Iterable[Union[FilterList, Filter]]) -> FilterList
+        """Combine filters with `and`, in linear time.
+
+        Returns:
+            FilterList
+        """
+
+        ret = cls([])
+        for i in filters:
+            ret.extend_and(i)
+        return ret
+
+    @classmethod
+    def any_of(cls, filters):
+        # type: (Iterable[Union[FilterList, Filter]]) -> FilterList
+        """Combine filters with `or`, in linear time.
+
+        Returns:
+            FilterList
+        """
+
+        ret = cls([])
+        for i in filters:
+            ret.extend_or(i)
         return ret
 
     def __and__(self, other):
@@ -121,13 +190,10 @@ class FilterList(list):
             FilterList
         """
 
-        ret = [
+        return cls.all_of(
             i if isinstance(i, (Filter, FilterList)) else Filter.from_list(i)
             for i in filters
-        ]
-        if ret:
-            ret = reduce(lambda a, b: a & b, ret)  # type: ignore
-        return cls(ret)
+        )
 
 
 class Field(six.text_type):
@@ -3,6 +3,7 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from deprecated import deprecated
 import six
@@ -14,12 +15,13 @@ from ..selection import Selection
 from .field import ModuleField
 from .history import ModuleHistory
 from .. import compat
+from .._filter_optimizer import MAX_IN_SIZE, optimize_list, shard_list
 
 LOGGER = logging.getLogger(__name__)
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from typing import Any, Text, Union, Tuple, Dict
+    from typing import Any, Text, Union, Tuple, Dict, List, Callable
     import cgtwq
     import cgtwq.model
 
@@ -29,6 +31,11 @@ class Module(ControllerGetterMixin):
     """Module(Database table) in database."""
 
     default_field_namespace = "task"
+    # optimize filters and split `in` list longer than this into requests,
+    # 0 to disable. selected ids of different shards are not ordered.
+    max_in_size = MAX_IN_SIZE
+    # max concurrent requests for filter with oversized `in` list.
+    shard_workers = 4
 
     def __init__(self, name, database, module_type="task"):
         # type: (Text, cgtwq.Database, Text) -> None
@@ -115,23 +122,49 @@ class Module(ControllerGetterMixin):
 
         namespace = kwargs.pop("namespace", self.default_field_namespace)
         filters = FilterList.from_arbitrary_args(*args).in_namespace(namespace)
-        filters = compat.adapt_filters(filters)
+        id_field = self._id_field()
+        filters = self._optimize(compat.adapt_filters(filters))
+
+        def _ids(filters):
+            # type: (FilterList) -> List[Text]
+            resp = self.call(
+                "c_orm",
+                "get_with_filter",
+                sign_array=(id_field,),
+                sign_filter_array=filters,
+            )
+            if resp:
+                return [i[0] for i in resp]
+            return []
+
+        id_list = []  # type: List[Text]
+        for i in self._map_shards(_ids, filters):
+            id_list.extend(i)
+        return Selection(self, *id_list)
 
-        resp = self.call(
-            "c_orm",
-            "get_with_filter",
-            sign_array=(
-                Field("id").in_namespace(
-                    self.name if self.module_type == "info" else self.module_type
-                ),
-            ),
-            sign_filter_array=filters,
+    def _id_field(self):
+        # type: () -> Text
+        return Field("id").in_namespace(
+            self.name if self.module_type == "info" else self.module_type
         )
-        if resp:
-            id_list = [i[0] for i in resp]
-        else:
-            id_list = []
-        return Selection(self, *id_list)
+
+    def _optimize(self, filters):
+        # type: (FilterList) -> FilterList
+        if self.max_in_size <= 0:
+            return filters
+        return optimize_list(filters, self._id_field())
+
+    def _map_shards(self, fn, filters):
+        # type: (Callable[[FilterList], Any], FilterList) -> List[Any]
+        """Call `fn` for each shard of filters concurrently."""
+
+        if self.max_in_size <= 0:
+            return [fn(filters)]
+        shards = shard_list(filters, self.max_in_size)
+        if len(shards) == 1:
+            return [fn(shards[0])]
+        with ThreadPoolExecutor(max_workers=self.shard_workers) as executor:
+            return list(executor.map(fn, shards))
 
     def distinct(self, *args, **kwargs):
         # type: (Union[cgtwq.FilterList, cgtwq.Filter], *Any) -> Tuple[Any, ...]
@@ -198,10 +231,18 @@ class Module(ControllerGetterMixin):
 
         namespace = kwargs.pop("namespace", self.default_field_namespace)
         filters = FilterList.from_arbitrary_args(*args).in_namespace(namespace)
-        filters = compat.adapt_filters(filters)
-
-        resp = self.call("c_orm", "get_count_with_filter", sign_filter_array=filters)
-        return int(resp)
+        filters = self._optimize(compat.adapt_filters(filters))
+
+        return sum(
+            self._map_shards(
+                lambda filters: int(
+                    self.call(
+                        "c_orm", "get_count_with_filter", sign_filter_array=filters
+                    )
+                ),
+                filters,
+            )
+        )
 
     def pipelines(self):
         """All pipeline in this module.
@@ -47,11 +47,7 @@ class SelectionNotify(SelectionAttachment):
             "create_by",
             "module",
         )
-        ids = list(select)
-        fl = filter.FilterList(filter.Field("#link_id").has(ids[0]))
-        for i in ids[1:]:
-            fl.append("or")
-            fl.append(filter.Field("#link_id").has(i))
+        fl = filter.FilterList.any_of(filter.Field("#link_id").has(i) for i in select)
 
         resp = select.call(
             "c_note",
@@ -175,7 +175,7 @@ class Selection(tuple):
         namespace = kwargs.pop("namespace", self.module.default_field_namespace)
 
         server_fields = [Field(i).in_namespace(namespace) for i in fields]
-        adapted_fields = [compat.adapt_field_sign(i) for i in server_fields]
+        adapted_fields = compat.adapt_field_signs(server_fields)
         resp = self.call(
             "c_orm",
             "get_in_id",
@@ -6,19 +6,23 @@ import json
 import logging
 from collections import OrderedDict
 
-import requests
 import cast_unknown as cast
 
 from .. import core, exceptions
+from .. import _instrumentation
+from .._compat_service import CompatService
+from .._instrumentation import CallRecord
+from .._json_codec import DEFAULT_JSON_CODEC
+from .._rate_limiter import DEFAULT_RATE_LIMITER
+from .._transport_impl import get_transport
 import six
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from typing import Any, Text, Dict
+    from typing import Any, Text, Dict, Optional
 
 
 LOGGER = logging.getLogger(__name__)
-SESSION = requests.Session()
 
 
 def _json_default(self, obj):
@@ -54,6 +58,37 @@ def _raise_error(result):
     raise ValueError(msg)
 
 
+def _compat_level():
+    # type: () -> int
+    from .. import compat
+
+    ret = CompatService.level_from_version(core.CONFIG["API_VERSION"])
+    if ret:
+        return ret
+    api_level = compat.detected_api_level()
+    if api_level == compat.API_LEVEL_5_2:
+        return CompatService.LEVEL_5_2
+    if api_level == compat.API_LEVEL_6_1:
+        return CompatService.LEVEL_6_1
+    return CompatService.LEVEL_UNKNOWN
+
+
+def _result(resp, record):
+    # type: (Any, Optional[CallRecord]) -> Any
+    try:
+        json_ = DEFAULT_JSON_CODEC.decode(resp.content)
+        _raise_error(json_)
+    except Exception as ex:
+        if record:
+            record.finish(len(resp.content), error=ex)
+        raise
+    if isinstance(json_, dict):
+        json_ = json_.get("data", json_)
+    if record:
+        record.finish(len(resp.content), len(json_) if isinstance(json_, list) else -1)
+    return json_
+
+
 def _cgteamwork_url(pathname):
     # type: (Text) -> Text
     return "{}/{}".format(core.CONFIG["URL"], pathname.lstrip("\\/"))
@@ -97,17 +132,34 @@ def post(pathname, data, token, **kwargs):
     assert "data" not in kwargs
 
     LOGGER.debug("POST: %s: %s", pathname, data)
+    controller, method = pathname, ""
     if data is not None:
+        controller = data.get("controller") or pathname
+        method = data.get("method") or ""
         data = {"data": json.JSONEncoder(default=_json_default).encode(data)}
-    resp = SESSION.post(
-        _cgteamwork_url(pathname), data=data, cookies={"token": token}, **kwargs
-    )
+    url = _cgteamwork_url(pathname)
+    record = None
+    if _instrumentation.is_enabled():
+        record = CallRecord(
+            url,
+            controller,
+            method,
+            _compat_level(),
+            len(data["data"].encode("utf-8")) if data else 0,
+        )
+    try:
+        with DEFAULT_RATE_LIMITER.acquire(controller):
+            resp = get_transport(core.CONFIG["URL"]).request(
+                "POST", url, data=data, cookies={"token": token}, **kwargs
+            )
+    except Exception as ex:
+        if record:
+            record.finish(error=ex)
+        raise
+    if record:
+        record.status = resp.status_code
     LOGGER.debug("RECV: %s", resp.text.strip())
-    json_ = resp.json()
-    _raise_error(json_)
-    if not isinstance(json_, dict):
-        return json_
-    return json_.get("data", json_)
+    return _result(resp, record)
 
 
 def get(pathname, token, **kwargs):
@@ -127,10 +179,19 @@ def get(pathname, token, **kwargs):
     assert "cookies" not in kwargs
 
     LOGGER.debug("GET: kwargs: %s", kwargs)
-    resp = SESSION.get(_cgteamwork_url(pathname), cookies={"token": token}, **kwargs)
+    url = _cgteamwork_url(pathname)
+    record = None
+    if _instrumentation.is_enabled():
+        record = CallRecord(url, pathname, "", _compat_level(), 0)
+    try:
+        resp = get_transport(core.CONFIG["URL"]).request(
+            "GET", url, cookies={"token": token}, **kwargs
+        )
+    except Exception as ex:
+        if record:
+            record.finish(error=ex)
+        raise
+    if record:
+        record.status = resp.status_code
     LOGGER.debug("GET: %s", resp.text.strip())
-    json_ = resp.json()
-    _raise_error(json_)
-    if not isinstance(json_, dict):
-        return json_
-    return json_.get("data", json_)
+    return _result(resp, record)
@@ -4,12 +4,19 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import os
+import sys
 
 import pytest
 
+# keep detected server compat level in memory only.
+os.environ.setdefault("CGTEAMWORK_COMPAT_CACHE_PATH", "")
+
 import cgtwq
 import cgtwq.core
 
+if sys.version_info < (3, 6):
+    collect_ignore_glob = ["cgtwq/aio/*"]
+
 
 @pytest.fixture(autouse=True, scope="session")
 def _connect_desktop_client():
@@ -37,6 +37,10 @@ setup(
         "cast-unknown>=0.1.4, <0.2.0",
         "six>=1.11.0, <2.0.0",
         "psutil>=2.0.0",
+        "futures>=3.0.0, <4.0.0; python_version<'3'",
     ],
+    extras_require={
+        "aio": ["aiohttp>=3.7, <4.0"],
+    },
     include_package_data=True,
 )
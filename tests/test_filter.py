@@ -103,5 +103,29 @@ def test_from_arbitrary_args():
     assert result == []
 
 
+def test_all_of_any_of():
+    a, b, c = (cgtwq.Field(i) == "v" for i in ("a", "b", "c"))
+    result = FilterList.any_of([a, b & c])
+    assert isinstance(result, FilterList), type(result)
+    assert result == a | b & c
+    assert FilterList.all_of([a, FilterList([]), b]) == a & b
+    assert FilterList.any_of([]) == []
+
+
+def test_extend():
+    a, b, c = (cgtwq.Field(i) == "v" for i in ("a", "b", "c"))
+    result = FilterList([])
+    assert result.extend_and(a) is result
+    result.extend_or(b).extend_and(c)
+    assert result == a | b & c
+    origin = FilterList(a)
+    result = origin & b
+    assert origin == [a]
+
+    ids = ["%d" % i for i in range(10000)]
+    result = FilterList.any_of(cgtwq.Field("#id") == i for i in ids)
+    assert len(result) == len(ids) * 2 - 1
+
+
 if __name__ == "__main__":
     main()